@@ -0,0 +1,111 @@
+"""Startup benchmark for the Marketing Analytics Suite.
+
+Measures, each in a fresh interpreter so nothing is already imported:
+
+* import time of ``marketing_suite.app`` as reported by ``python -X importtime``
+  (total, and self time summed per package), and
+* time-to-first-render: loading and running the app script once through
+  Streamlit's ``AppTest``, which is what a new session or cold container pays.
+
+Usage::
+
+    python benchmarks/startup.py [--runs 5] [--max-render-ms 3000] [--json]
+
+Exits non-zero when the median time-to-first-render exceeds ``--max-render-ms``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(ROOT, "marketing_analytics.py")
+
+RENDER_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=120).run()
+elapsed = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(str(at.exception[0].value))
+print(elapsed)
+"""
+
+
+def import_profile():
+    """Import time of the app package and self-time per top-level package (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import marketing_suite.app"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    packages = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|")
+        self_us = int(head.split(":")[1])
+        name = name.strip()
+        # Self times summed per distribution show where startup goes, e.g.
+        # whether tweepy or sklearn has crept back into the import graph
+        packages[name.split(".")[0]] += self_us / 1000
+        if name == "marketing_suite.app":
+            total = int(cumulative_us) / 1000
+    return total, dict(packages)
+
+
+def first_render_seconds():
+    result = subprocess.run(
+        [sys.executable, "-c", RENDER_SNIPPET.format(script=APP_SCRIPT)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App failed to render: {result.stderr.strip() or result.stdout.strip()}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold runs to take the median of")
+    parser.add_argument("--max-render-ms", type=float, default=None,
+                        help="fail if median time-to-first-render exceeds this")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    import_totals = []
+    render_times = []
+    packages = {}
+    for _ in range(args.runs):
+        total, packages = import_profile()
+        import_totals.append(total)
+        render_times.append(first_render_seconds() * 1000)
+
+    report = {
+        "import_ms": round(statistics.median(import_totals), 1),
+        "first_render_ms": round(statistics.median(render_times), 1),
+        "runs": args.runs,
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in
+                               sorted(packages.items(), key=lambda item: -item[1])[:10]},
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import marketing_suite.app: {report['import_ms']:.1f} ms (median of {args.runs})")
+        print(f"time to first render:      {report['first_render_ms']:.1f} ms (median of {args.runs})")
+        print("slowest packages (self time):")
+        for name, ms in report["slowest_imports_ms"].items():
+            print(f"  {name:<24} {ms:8.1f} ms")
+
+    if args.max_render_ms is not None and report["first_render_ms"] > args.max_render_ms:
+        print(f"FAIL: first render {report['first_render_ms']:.1f} ms > {args.max_render_ms:.1f} ms",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
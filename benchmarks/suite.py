@@ -0,0 +1,268 @@
+"""Benchmark suite for the Marketing Analytics Suite.
+
+Times, on seeded synthetic data (``marketing_suite.synthetic``) at each size:
+
+* ``ingest``: parsing an ad CSV export into the Parquet cache, and
+  ``ingest-cached``: loading it again from the cache;
+* ``keywords``: keyword and phrase density of documents totalling that many words;
+* ``chart``: building (downsampling and plotting) a line chart of that many posts;
+* ``engagement``: engagement metrics and anomaly flags over that many posts;
+* ``rollup``: weekly campaign rollups of an ad export;
+* ``seo-summary``: the SEO summary and page table of a crawl of that many pages;
+* ``tab-seo``, ``tab-social`` and ``tab-ads``: a rerun of each tab through
+  Streamlit's ``AppTest``, after a first run that loaded the data.
+
+Usage::
+
+    python benchmarks/suite.py [--sizes 10,1000,100000] [--cases ingest,tab-ads] [--repeat 3] [--json]
+    python benchmarks/suite.py --sizes 10,1000,100000,10000000 --update-baselines
+
+Each case reports the median of ``--repeat`` runs after an untimed warm-up run.  Results are compared
+with ``benchmarks/baselines.json``; the exit status is 1 when any case is
+slower than its baseline by more than ``--tolerance`` (and by more than
+``--min-ms``, so that scheduling noise never fails a run).  Baselines are
+only meaningful on the machine that recorded them: after moving to a new
+one, run with ``--update-baselines`` to store its results instead.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from marketing_suite import synthetic  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = [10, 1000, 100_000]
+WORDS_PER_DOCUMENT = 500
+# Cases whose work grows with per-row Python objects are capped below 10 million rows
+MAX_ROWS = {"keywords": 1_000_000, "seo-summary": 100_000, "tab-seo": 100_000}
+
+# Tab scripts for AppTest: the first run loads synthetic data into the
+# session, the timed reruns render the tab as a user interaction would
+TAB_SCRIPTS = {
+    "tab-seo": """
+import streamlit as st
+from marketing_suite import synthetic
+from marketing_suite.app import init_state
+from marketing_suite.seo_crawler import page_table, summarize
+from marketing_suite.tabs import seo
+
+init_state()
+if st.session_state.seo_data is None:
+    pages = synthetic.site({rows}, seed={seed})
+    st.session_state.seo_data, st.session_state.seo_pages = summarize(pages), page_table(pages)
+seo.render()
+""",
+    "tab-social": """
+import streamlit as st
+from marketing_suite import synthetic
+from marketing_suite.tabs import social
+
+if "social_frames" not in st.session_state:
+    social.session_frames().put("Twitter", "synthetic", synthetic.posts("Twitter", {rows}, seed={seed}))
+social.render()
+""",
+    "tab-ads": """
+import io
+import streamlit as st
+from marketing_suite import synthetic
+from marketing_suite.app import init_state
+from marketing_suite.tabs import ads
+
+
+class Upload(io.BytesIO):
+    file_id = "synthetic-{rows}-{seed}"
+    name = "synthetic.csv"
+
+
+@st.cache_resource
+def export():
+    return synthetic.ad_export({rows}, seed={seed}).to_csv(index=False).encode()
+
+
+init_state()
+# AppTest can't upload files, so the tab is handed a synthetic export
+file_uploader = st.file_uploader
+st.file_uploader = lambda *args, **kwargs: Upload(export())
+try:
+    ads.render()
+finally:
+    st.file_uploader = file_uploader
+""",
+}
+
+
+def _timed(fn, repeat, setup=None):
+    """Median wall time of ``fn(setup())`` in ms (``fn()`` without ``setup``).
+
+    A first, untimed run warms imports, caches and the allocator, so that
+    even ``--repeat 1`` measures a steady-state run.
+    """
+    times = []
+    for run in range(repeat + 1):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        fn(argument) if setup else fn()
+        if run:
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def bench_ingest(rows, repeat, seed):
+    from marketing_suite.ingestion import load_ad_csv
+
+    data = synthetic.ad_export(rows, seed=seed).to_csv(index=False).encode()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def fresh():
+            # A new cache directory per run, so every run parses the CSV
+            return tempfile.mkdtemp(dir=cache_dir)
+        parse = _timed(lambda directory: load_ad_csv(io.BytesIO(data), cache_dir=directory), repeat, fresh)
+        load_ad_csv(io.BytesIO(data), cache_dir=cache_dir)
+        cached = _timed(lambda: load_ad_csv(io.BytesIO(data), cache_dir=cache_dir), repeat)
+    return {"ingest": parse, "ingest-cached": cached}
+
+
+def bench_keywords(rows, repeat, seed):
+    from marketing_suite.keywords import analyze_documents
+
+    count = max(1, rows // WORDS_PER_DOCUMENT)
+    documents = synthetic.documents(count, words=min(rows, WORDS_PER_DOCUMENT), seed=seed)
+    return {"keywords": _timed(lambda: analyze_documents(documents), repeat)}
+
+
+def bench_chart(rows, repeat, seed):
+    from marketing_suite.charts import MAX_POINTS, _build
+
+    df = synthetic.unified(rows, seed=seed)
+    kwargs = {"x": "timestamp", "y": "likes", "color": "platform"}
+    return {"chart": _timed(lambda: _build("line", df, MAX_POINTS, kwargs), repeat)}
+
+
+def bench_engagement(rows, repeat, seed):
+    from marketing_suite.engagement import engagement_metrics
+
+    df = synthetic.unified(rows, seed=seed, accounts=5)
+    return {"engagement": _timed(lambda: engagement_metrics(df), repeat)}
+
+
+def bench_rollup(rows, repeat, seed):
+    from marketing_suite.roi import PERIODS, rollup
+
+    df = synthetic.ad_export(rows, seed=seed)
+    return {"rollup": _timed(lambda: rollup(df, campaign=True, period=PERIODS["Week"]), repeat)}
+
+
+def bench_seo_summary(rows, repeat, seed):
+    from marketing_suite.seo_crawler import page_table, summarize
+
+    pages = synthetic.site(rows, seed=seed)
+    return {"seo-summary": _timed(lambda: (summarize(pages), page_table(pages)), repeat)}
+
+
+def bench_tab(case):
+    def run(rows, repeat, seed):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_string(TAB_SCRIPTS[case].format(rows=rows, seed=seed), default_timeout=600).run()
+        if at.exception:
+            raise RuntimeError(f"{case} failed: {at.exception[0].value}")
+        return {case: _timed(at.run, repeat)}
+    return run
+
+
+CASES = {
+    "ingest": bench_ingest,
+    "keywords": bench_keywords,
+    "chart": bench_chart,
+    "engagement": bench_engagement,
+    "rollup": bench_rollup,
+    "seo-summary": bench_seo_summary,
+    "tab-seo": bench_tab("tab-seo"),
+    "tab-social": bench_tab("tab-social"),
+    "tab-ads": bench_tab("tab-ads"),
+}
+
+
+def result_key(case, rows):
+    return f"{case}[{rows}]"
+
+
+def load_baselines(path=BASELINES):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def regressions(results, baselines, tolerance, min_ms):
+    """``(key, ms, baseline)`` of every result slower than its baseline beyond the margins."""
+    slower = []
+    for key, ms in results.items():
+        baseline = baselines.get(key)
+        if baseline is not None and ms > baseline * (1 + tolerance) and ms - baseline > min_ms:
+            slower.append((key, ms, baseline))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts, e.g. 10,1e3,1e5,1e7")
+    parser.add_argument("--cases", help=f"comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the median of")
+    parser.add_argument("--seed", type=int, default=0)
+    # Wide margins by default: reruns on a shared machine easily vary by half
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="allowed slowdown over the baseline, as a fraction (default: 1.0)")
+    parser.add_argument("--min-ms", type=float, default=25.0,
+                        help="slowdowns smaller than this many ms never fail (default: 25)")
+    parser.add_argument("--baselines", default=BASELINES, help="baseline file (default: benchmarks/baselines.json)")
+    parser.add_argument("--update-baselines", action="store_true", help="store the results as baselines")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in names:
+        for rows in sizes:
+            if rows > MAX_ROWS.get(name, rows):
+                continue
+            for case, ms in CASES[name](rows, args.repeat, args.seed).items():
+                results[result_key(case, rows)] = round(ms, 2)
+                if not args.json:
+                    print(f"{result_key(case, rows):<28} {ms:10.1f} ms", flush=True)
+
+    baselines = load_baselines(args.baselines)
+    if args.update_baselines:
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"{len(results)} baseline(s) written to {args.baselines}", file=sys.stderr)
+        return 0
+
+    slower = regressions(results, baselines, args.tolerance, args.min_ms)
+    if args.json:
+        print(json.dumps({"results": results, "regressions": [key for key, _, _ in slower]}, indent=2))
+    missing = [key for key in results if key not in baselines]
+    if missing:
+        print(f"no baseline for: {', '.join(missing)}", file=sys.stderr)
+    for key, ms, baseline in slower:
+        print(f"FAIL: {key} {ms:.1f} ms > baseline {baseline:.1f} ms (+{args.tolerance:.0%})", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
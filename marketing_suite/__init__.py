@@ -0,0 +1 @@
+"""Marketing Analytics Suite: a Streamlit app for SEO, social and ad analytics."""
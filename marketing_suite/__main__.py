@@ -0,0 +1,4 @@
+"""``python -m marketing_suite``: the batch command line (see ``marketing_suite.cli``)."""
+from marketing_suite.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,55 @@
+import streamlit as st
+from dotenv import load_dotenv
+
+from marketing_suite import debug
+from marketing_suite.tabs import ads, seo, social
+from marketing_suite.timing import profiling, recording, span
+
+
+def init_state():
+    defaults = {
+        "seo_data": None,
+        "seo_pages": None,
+        "seo_unchanged": 0,
+        "ad_data": None,
+        "ad_data_key": None,
+        "ad_data_hash": None,
+    }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+
+def main():
+    # Load environment variables
+    load_dotenv()
+    
+    # Page config
+    st.set_page_config(page_title="Marketing Analytics Suite", layout="wide")
+    
+    # App title
+    st.title("Marketing Analytics Suite")
+    
+    # Initialize session state
+    init_state()
+    
+    # Every rerun is timed; the breakdown is only shown in debug mode
+    show_debug = debug.enabled()
+    profiler = debug.requested_profiler() if show_debug else None
+    with recording() as recorder, profiling(profiler) as profile:
+        # Tab layout
+        tab1, tab2, tab3 = st.tabs(["SEO Analyzer", "Social Media Dashboard", "Ad Performance"])
+        
+        with tab1, span("tab", tab="seo"):
+            seo.render()
+        with tab2, span("tab", tab="social"):
+            social.render()
+        with tab3, span("tab", tab="ads"):
+            ads.render()
+    if show_debug:
+        debug.render_sidebar(recorder, profile)
+    
+    # Footer
+    st.markdown("---")
+    st.markdown("### Marketing Analytics Suite v2.0")
+    st.markdown("Now with enhanced social media analytics for Twitter, Instagram, Facebook, LinkedIn, TikTok, and YouTube")
@@ -0,0 +1,212 @@
+"""Plotly chart helpers shared by the dashboard tabs.
+
+``plot`` keeps what reaches the browser bounded on large frames:
+
+* line charts above ``MAX_POINTS`` points per series are reduced with
+  Largest-Triangle-Three-Buckets, which keeps the visual shape of the curve;
+* bar charts are reduced to the minimum and maximum of each x bucket, so
+  spikes survive;
+* scatters above ``WEBGL_POINTS`` points are a seeded random sample of that
+  many rows;
+* large scatters (and downsampled lines) switch to WebGL traces.
+
+Built figures are cached per data hash and chart parameters, so a rerun that
+doesn't change the data skips both the downsampling and ``plotly.express``.
+``plotly.express`` itself is slow to import and is loaded with the first
+chart rather than at startup.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from marketing_suite.timing import span
+
+MAX_POINTS = 2000
+WEBGL_POINTS = 5000
+FIGURE_CACHE_SIZE = 64
+
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+
+def lttb(x, y, n_out):
+    """Indices of the ``n_out`` points Largest-Triangle-Three-Buckets keeps.
+
+    ``x`` must be sorted and numeric.  The first and last points are always
+    kept; from every bucket in between, the point forming the largest
+    triangle with the previously kept point and the next bucket's mean wins.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    # Mean of every bucket, and of the last point as the final "next bucket"
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        area = np.abs((ax - mean_x[bucket + 1]) * (y[start:stop] - ay)
+                      - (ax - x[start:stop]) * (mean_y[bucket + 1] - ay))
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax(x, y, n_out):
+    """Indices of the minimum and maximum ``y`` in ``n_out // 2`` equal-width x buckets.
+
+    ``x`` must be sorted and numeric, so every bucket is a contiguous run.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_buckets = max(n_out // 2, 1)
+    width = (x[-1] - x[0]) / n_buckets
+    buckets = np.zeros(n, dtype=np.intp) if width == 0 else np.minimum(
+        ((x - x[0]) / width).astype(np.intp), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    keep = []
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        hits = np.flatnonzero(y == extreme[segment])
+        # First hit in each bucket
+        keep.append(hits[np.r_[True, segment[hits][1:] != segment[hits][:-1]]])
+    return np.unique(np.concatenate(keep))
+
+
+def _numeric_x(values):
+    """``values`` as a float64 array when they are numeric or datetimes, else ``None``."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return np.where(values.isna(), np.nan, values.astype("int64").astype(np.float64))
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(np.float64, na_value=np.nan)
+    return None
+
+
+def downsample(df, x, y, color=None, max_points=MAX_POINTS, method="lttb"):
+    """Reduce every series of a chart frame to at most ``max_points`` points.
+
+    Series are the ``color`` groups times the ``y`` columns.  Rows are kept if
+    any of their y columns selects them, so wide-form charts stay aligned.
+    Frames with a non-numeric x (categories, titles) are returned unchanged.
+    """
+    y_columns = [y] if isinstance(y, str) else list(y)
+    if len(df) <= max_points or x not in df.columns:
+        return df
+    x_values = _numeric_x(df[x])
+    if x_values is None:
+        return df
+    select = lttb if method == "lttb" else minmax
+    order = np.argsort(x_values, kind="stable")
+    ordered = df.iloc[order]
+    x_sorted = x_values[order]
+    groups = [np.arange(len(ordered))] if color is None else \
+        list(ordered.groupby(color, observed=True, sort=False).indices.values())
+
+    keep = []
+    for rows in groups:
+        for column in y_columns:
+            values = pd.to_numeric(ordered[column].iloc[rows], errors="coerce").to_numpy(np.float64,
+                                                                                        na_value=np.nan)
+            finite = np.isfinite(values) & np.isfinite(x_sorted[rows])
+            picked = select(x_sorted[rows[finite]], values[finite], max_points)
+            keep.append(rows[finite][picked])
+    if not keep:
+        return df
+    sampled = ordered.iloc[np.unique(np.concatenate(keep))]
+    if color is not None and isinstance(sampled[color].dtype, pd.CategoricalDtype):
+        # Plotly looks up a group for every category; series with no finite y left have none
+        sampled = sampled.assign(**{color: sampled[color].cat.remove_unused_categories()})
+    return sampled
+
+
+def data_hash(df):
+    """Content hash of a frame, including its column names and dtypes.
+
+    Returns ``None`` for frames holding unhashable cells (lists, dicts).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:
+        return None
+    return digest.hexdigest()
+
+
+def _build(kind, data, max_points, kwargs):
+    import plotly.express as px
+
+    total = len(data)
+    method = {"line": "lttb", "bar": "minmax"}.get(kind)
+    if method and "y" in kwargs and "x" in kwargs:
+        with span("chart.downsample", kind=kind, method=method):
+            data = downsample(data, kwargs["x"], kwargs["y"], color=kwargs.get("color"),
+                              max_points=max_points, method=method)
+    elif kind == "scatter" and total > WEBGL_POINTS:
+        with span("chart.downsample", kind=kind, method="sample"):
+            # Seeded, so the same data always shows the same points
+            rows = np.random.default_rng(0).choice(total, size=WEBGL_POINTS, replace=False)
+            data = data.iloc[np.sort(rows)]
+    # Plotly can't serialise pd.NA; nullable integers (e.g. Conversions) are plotted as floats
+    nullable = {column: "float64" for column, dtype in data.dtypes.items()
+                if isinstance(dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(dtype)
+                and not pd.api.types.is_bool_dtype(dtype)}
+    if nullable:
+        data = data.astype(nullable)
+    # Plotly groups by categorical columns with pandas' deprecated observed=False; plain values in
+    # the order of the categories that occur plot the same as grouping with observed=True
+    categorical = [column for column, dtype in data.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if categorical:
+        orders = {column: data[column].cat.remove_unused_categories().cat.categories.tolist()
+                  for column in categorical}
+        kwargs = {**kwargs, "category_orders": {**orders, **kwargs.get("category_orders", {})}}
+        data = data.astype({column: object for column in categorical})
+    if kind == "scatter" and total > WEBGL_POINTS or kind == "line" and len(data) < total:
+        kwargs = {"render_mode": "webgl", **kwargs}
+    with span("chart.build", kind=kind):
+        fig = getattr(px, kind)(data, **kwargs)
+    return fig, len(data), total
+
+
+def plot(kind, data, max_points=MAX_POINTS, data_key=None, **kwargs):
+    """Build ``px.<kind>(data, **kwargs)``, downsampled as needed, and render it.
+
+    ``data_key`` identifies the data (e.g. a dataset hash) when the caller
+    already has one; otherwise the frame is hashed.  Figures are cached per
+    data key, chart kind, threshold and keyword arguments.
+    """
+    with span("chart.hash", kind=kind):
+        data_key = data_key or data_hash(data)
+    key = (kind, data_key, max_points, repr(sorted(kwargs.items())))
+    with _figure_cache_lock:
+        cached = _figure_cache.get(key) if data_key else None
+        if cached is not None:
+            _figure_cache.move_to_end(key)
+    if cached is None:
+        cached = _build(kind, data, max_points, kwargs)
+        if data_key:
+            with _figure_cache_lock:
+                _figure_cache[key] = cached
+                while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                    _figure_cache.popitem(last=False)
+    fig, shown, total = cached
+    with span("chart.render", kind=kind):
+        st.plotly_chart(fig)
+    if shown < total:
+        st.caption(f"Showing {shown:,} of {total:,} points")
+    return fig
@@ -0,0 +1,329 @@
+"""Headless batch runs of the SEO, keyword and ROI analyses.
+
+::
+
+    python -m marketing_suite seo https://a.example https://b.example -o seo.parquet
+    python -m marketing_suite seo --input urls.txt -o seo.csv --pages-output pages.parquet
+    python -m marketing_suite keywords content/ -o keywords.csv
+    python -m marketing_suite roi exports/ --optimize Conversions -o roi.csv --campaigns-output campaigns.csv
+
+Inputs are processed on a process pool, and each result is appended to the
+output as soon as it is ready.  Memory therefore stays bounded by the number
+of inputs in flight, not by the size of the batch.  Outputs are CSV or
+Parquet depending on their extension; ``-`` writes CSV to stdout.  An input
+that fails is reported on stderr and the run carries on.  The exit status is
+1 if any input failed.
+
+Nothing here imports Streamlit, so the CLI runs without the UI.
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from marketing_suite.ingestion import load_ad_csv
+from marketing_suite.keywords import RESULT_COLUMNS, analyze_documents
+from marketing_suite.roi import campaign_totals, has_roi_columns, roi_summary
+from marketing_suite.seo_crawler import PAGE_COLUMNS, analyze_site
+from marketing_suite.spend_model import optimize_budget
+
+TEXT_PATTERNS = ("*.txt", "*.md")
+CSV_PATTERNS = ("*.csv",)
+# Documents per keyword task: enough to amortise the vocabulary, small enough to spread
+KEYWORD_BATCH = 32
+# Results waiting to be written per worker, which bounds memory on huge batches
+IN_FLIGHT_PER_WORKER = 4
+
+SEO_COLUMNS = ["Input", "SEO Score", "Pages Crawled", "Meta Tags", "Internal Links", "Avg Response (ms)",
+               "Issues"]
+ROI_COLUMNS = ["Input", "Rows", "Total Spend", "Total Revenue", "ROI (%)", "ROAS", "CPA"]
+CAMPAIGN_COLUMNS = ["Input", "Campaign", "Rows", "Spend", "Revenue", "Conversions", "ROI (%)", "ROAS", "CPA"]
+
+
+def optimize_columns(target, campaigns=False):
+    """Columns ``--optimize`` adds to the ROI summary, or with ``campaigns`` to the campaign table."""
+    predicted = [f"Predicted {target} (current)", f"Predicted {target}", "CI Low", "CI High"]
+    if not campaigns:
+        return predicted
+    return ["Current Spend", "Recommended Spend", "Change (%)"] + predicted + ["Saturation", "Half-saturation Spend"]
+
+
+class TableWriter:
+    """Appends DataFrames to one CSV or Parquet file as they arrive.
+
+    With ``columns``, every frame is written with exactly those columns
+    (missing ones empty), so inputs with different columns still line up
+    under one header or Parquet schema.  ``strings`` are text columns, kept
+    as text even when a frame has none of their values.
+    """
+
+    def __init__(self, path, columns=None, strings=("Input",)):
+        self.path = path
+        self.columns = columns
+        self.strings = strings
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+        self._schema = None
+        self.format = "parquet" if path.endswith((".parquet", ".pq")) else "csv"
+
+    def write(self, df):
+        if df is None or df.empty:
+            return
+        if self.columns is not None:
+            df = df.reindex(columns=self.columns)
+        # Categories differ from batch to batch; write their values
+        df = df.astype({column: object for column, dtype in df.dtypes.items() if dtype == "category"})
+        df = df.astype({column: "string" for column in self.strings if column in df.columns})
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+            self._parquet.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        else:
+            header = self._file is None
+            if header:
+                self._file = sys.stdout if self.path == "-" else open(self.path, "w", newline="", encoding="utf-8")
+            df.to_csv(self._file, header=header, index=False)
+            self._file.flush()
+        self.rows += len(df)
+
+    def close(self):
+        if self.rows == 0 and self.columns is not None:
+            # Leave an empty table with a header rather than no file at all
+            empty = pd.DataFrame(columns=self.columns)
+            if self.format == "parquet":
+                empty.to_parquet(self.path, index=False)
+            else:
+                empty.to_csv(sys.stdout if self.path == "-" else self.path, index=False)
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def expand_paths(paths, patterns):
+    """Files named in ``paths``, with directories searched recursively for ``patterns``."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = {match for pattern in patterns
+                     for match in glob.glob(os.path.join(path, "**", pattern), recursive=True)}
+            files.extend(sorted(found))
+        else:
+            files.append(path)
+    return files
+
+
+def read_lines(path):
+    """Non-blank, non-comment lines of a file (``-`` for stdin)."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        return [line.strip() for line in stream if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# Tasks run in worker processes and return one DataFrame per output
+
+def seo_task(url, max_pages, max_depth, per_host_delay):
+    summary, pages = analyze_site(url, max_pages=max_pages, max_depth=max_depth, per_host_delay=per_host_delay)
+    row = dict(summary, Input=url, Issues="; ".join(summary["Issues"]))
+    pages.insert(0, "Input", url)
+    return pd.DataFrame([row], columns=SEO_COLUMNS), pages
+
+
+def keywords_task(paths, ngram_range, top_k):
+    documents = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            documents.append(f.read())
+    return (analyze_documents(documents, ngram_range=ngram_range, top_k=top_k, names=paths),)
+
+
+def roi_task(path, target, budget, samples, cache_dir=None):
+    with open(path, "rb") as f, tempfile.TemporaryDirectory() as scratch:
+        # Without a cache directory the parsed export is thrown away with the task
+        _, df = load_ad_csv(f, cache_dir=cache_dir or scratch)
+    if not has_roi_columns(df):
+        raise ValueError("CSV must contain 'Spend' and 'Revenue' columns")
+    row = {"Input": path, "Rows": len(df), **roi_summary(df)}
+    campaigns = campaign_totals(df)
+    if target and target not in df.columns:
+        raise ValueError(f"CSV has no '{target}' column to optimize for")
+    if target:
+        # One process per file already; the bootstrap must not start its own pool
+        summary, table = optimize_budget(df, target=target, budget=budget, samples=samples, max_workers=1)
+        row.update({f"Predicted {target} (current)": summary["current_outcome"],
+                    f"Predicted {target}": summary["predicted_outcome"],
+                    "CI Low": summary["ci"][0], "CI High": summary["ci"][1]})
+        table = table.rename_axis("Campaign").reset_index().drop(columns="Rows")
+        campaigns = campaigns.merge(table, on="Campaign", how="left")
+    campaigns.insert(0, "Input", path)
+    return pd.DataFrame([row]), campaigns
+
+
+def run_tasks(fn, inputs, args_for, writers, workers, label=str):
+    """Run ``fn(*args_for(item))`` for every input and stream results to ``writers``.
+
+    Returns the number of failed inputs.
+    """
+    failures = 0
+    done_count = 0
+    started = time.perf_counter()
+
+    def finish(item, outcome):
+        nonlocal failures, done_count
+        done_count += 1
+        if isinstance(outcome, BaseException):
+            failures += 1
+            print(f"{label(item)}: {type(outcome).__name__}: {outcome}", file=sys.stderr)
+            return
+        for writer, df in zip(writers, outcome):
+            if writer is not None:
+                writer.write(df)
+
+    if workers <= 1:
+        for item in inputs:
+            try:
+                outcome = fn(*args_for(item))
+            except Exception as e:
+                outcome = e
+            finish(item, outcome)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            items = iter(inputs)
+            while True:
+                for item in items:
+                    pending[pool.submit(fn, *args_for(item))] = item
+                    if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    finish(item, error if error is not None else future.result())
+    elapsed = time.perf_counter() - started
+    print(f"{done_count} input(s) processed in {elapsed:.1f} s, {failures} failed", file=sys.stderr)
+    return failures
+
+
+def _writer(path, columns=None, **options):
+    return TableWriter(path, columns, **options) if path else None
+
+
+def _close(*writers):
+    for writer in writers:
+        if writer is not None:
+            writer.close()
+
+
+def cmd_seo(args):
+    urls = list(args.urls) + (read_lines(args.input) if args.input else [])
+    if not urls:
+        raise SystemExit("No URLs given")
+    sites, pages = _writer(args.output, SEO_COLUMNS), _writer(args.pages_output, ["Input"] + PAGE_COLUMNS)
+    try:
+        return run_tasks(seo_task, urls, lambda url: (url, args.max_pages, args.max_depth, args.delay),
+                         [sites, pages], args.workers)
+    finally:
+        _close(sites, pages)
+
+
+def cmd_keywords(args):
+    files = expand_paths(args.paths, args.pattern or TEXT_PATTERNS)
+    if not files:
+        raise SystemExit("No text files found")
+    batches = [files[i:i + KEYWORD_BATCH] for i in range(0, len(files), KEYWORD_BATCH)]
+    # Small batches over few files would leave workers idle
+    if len(batches) < args.workers:
+        size = max(1, -(-len(files) // args.workers))
+        batches = [files[i:i + size] for i in range(0, len(files), size)]
+    writer = TableWriter(args.output, RESULT_COLUMNS)
+    try:
+        return run_tasks(keywords_task, batches, lambda batch: (batch, (1, args.max_words), args.top),
+                         [writer], args.workers, label=lambda batch: f"{batch[0]} (+{len(batch) - 1} more)")
+    finally:
+        writer.close()
+
+
+def cmd_roi(args):
+    files = expand_paths(args.paths, CSV_PATTERNS)
+    if not files:
+        raise SystemExit("No CSV files found")
+    summary_columns, campaign_columns = ROI_COLUMNS, CAMPAIGN_COLUMNS
+    if args.optimize:
+        summary_columns = ROI_COLUMNS + optimize_columns(args.optimize)
+        campaign_columns = CAMPAIGN_COLUMNS + optimize_columns(args.optimize, campaigns=True)
+    summary = _writer(args.output, summary_columns)
+    campaigns = _writer(args.campaigns_output, campaign_columns, strings=("Input", "Campaign"))
+    try:
+        return run_tasks(roi_task, files,
+                         lambda path: (path, args.optimize, args.budget, args.samples, args.cache_dir),
+                         [summary, campaigns], args.workers)
+    finally:
+        _close(summary, campaigns)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m marketing_suite", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def common(sub, default_workers):
+        sub.add_argument("-o", "--output", required=True, help="output .csv or .parquet file, or - for stdout")
+        sub.add_argument("-j", "--workers", type=int, default=default_workers,
+                         help=f"worker processes (default: {default_workers})")
+
+    cpus = os.cpu_count() or 1
+    seo = commands.add_parser("seo", help="crawl sites and score their SEO")
+    seo.add_argument("urls", nargs="*", help="start URLs")
+    seo.add_argument("--input", help="file with one URL per line (- for stdin)")
+    seo.add_argument("--pages-output", help="also write one row per crawled page here")
+    seo.add_argument("--max-pages", type=int, default=200)
+    seo.add_argument("--max-depth", type=int, default=3)
+    seo.add_argument("--delay", type=float, default=0.0, help="seconds between requests to one host")
+    # Crawls are network-bound and each one runs its own thread pool
+    common(seo, min(4, cpus))
+    seo.set_defaults(run=cmd_seo)
+
+    keywords = commands.add_parser("keywords", help="keyword and phrase density of text files")
+    keywords.add_argument("paths", nargs="+", help="text files or directories")
+    keywords.add_argument("--pattern", action="append", help="file pattern in directories (default: *.txt, *.md)")
+    keywords.add_argument("--top", type=int, default=10, help="keywords per document and phrase length")
+    keywords.add_argument("--max-words", type=int, default=3, help="longest phrase to count")
+    common(keywords, cpus)
+    keywords.set_defaults(run=cmd_keywords)
+
+    roi = commands.add_parser("roi", help="ROI and spend recommendations for ad exports")
+    roi.add_argument("paths", nargs="+", help="ad CSV files or directories")
+    roi.add_argument("--campaigns-output", help="also write one row per (file, campaign) here")
+    roi.add_argument("--optimize", choices=["Conversions", "Revenue"], help="fit spend curves for this target")
+    roi.add_argument("--budget", type=float, help="budget per period (default: current spend)")
+    roi.add_argument("--samples", type=int, default=100, help="bootstrap samples for the intervals")
+    roi.add_argument("--cache-dir", help="keep parsed exports here for later runs (default: not kept)")
+    common(roi, cpus)
+    roi.set_defaults(run=cmd_roi)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return 1 if args.run(args) else 0
@@ -0,0 +1,171 @@
+"""Process-wide pool of authenticated platform clients.
+
+Connecting to Instagram or LinkedIn means a slow login that, repeated, gets
+the account challenged.  ``ClientPool.get`` returns the client an earlier
+session built for the same credentials and only calls the connect function
+on a miss.  Keys are hashes of the credentials salted per process, so the
+pool never holds a password and a wrong password never matches.
+
+Clients unused for ``idle_timeout`` seconds are dropped, and the least
+recently used ones once the pool holds more than ``max_size``.
+
+Login sessions also outlive the process: connectors store them (the
+Instaloader session file, LinkedIn's cookie jar) under ``SESSION_DIR``.
+Next to each one ``remember_password`` stores a salted PBKDF2 hash of the
+password it was created with.  A stored session is only reused when
+``password_matches`` it, so a restart doesn't turn the session file into
+a way around the password.
+"""
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from marketing_suite.timing import span
+
+SESSION_DIR = os.getenv("MARKETING_SESSION_DIR", os.path.join(".cache", "sessions"))
+MAX_CLIENTS = 32
+IDLE_TIMEOUT = 3600
+PBKDF2_ITERATIONS = 200_000
+
+
+def session_dir(platform):
+    """Private directory for ``platform``'s stored login sessions."""
+    directory = os.path.join(SESSION_DIR, platform.lower())
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return directory
+
+
+def session_path(platform, username):
+    """Where the connector for ``platform`` keeps ``username``'s login session."""
+    return os.path.join(session_dir(platform), hashlib.sha256(username.encode()).hexdigest()[:16])
+
+
+def _password_hash(password, salt):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+
+
+def remember_password(path, password):
+    """Store a salted hash of the password the session at ``path`` was created with."""
+    os.chmod(path, 0o600)
+    salt = secrets.token_bytes(16)
+    fd = os.open(f"{path}.check", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"salt": salt.hex(), "hash": _password_hash(password, salt).hex()}, f)
+
+
+def password_matches(path, password):
+    """Whether the session at ``path`` exists and was created with ``password``."""
+    try:
+        with open(f"{path}.check") as f:
+            check = json.load(f)
+        expected = bytes.fromhex(check["hash"])
+        salt = bytes.fromhex(check["salt"])
+    except (OSError, ValueError, KeyError):
+        return False
+    return os.path.exists(path) and hmac.compare_digest(_password_hash(password, salt), expected)
+
+
+class ClientPool:
+    """Authenticated clients keyed by (platform, hash of the credentials).
+
+    Concurrent ``get`` calls for the same key wait for a single connect
+    rather than each logging in.
+    """
+
+    def __init__(self, max_size=MAX_CLIENTS, idle_timeout=IDLE_TIMEOUT, clock=time.monotonic):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._salt = secrets.token_bytes(16)
+        # key -> [client, platform, last used]
+        self._clients = OrderedDict()
+        self._connecting = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, platform, credentials):
+        digest = hashlib.blake2b(key=self._salt, digest_size=16)
+        for part in credentials:
+            digest.update(str(part).encode() + b"\0")
+        return platform, digest.hexdigest()
+
+    def _evict(self, now):
+        """Drop idle clients, then the least recently used beyond ``max_size``; call with the lock held."""
+        for key in [key for key, (_, _, used) in self._clients.items() if now - used > self.idle_timeout]:
+            del self._clients[key]
+            self.evictions += 1
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key):
+        now = self.clock()
+        self._evict(now)
+        entry = self._clients.get(key)
+        if entry is None:
+            return None
+        entry[2] = now
+        self._clients.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def get(self, platform, credentials, connect):
+        """The pooled client for ``credentials``, calling ``connect()`` to build it on a miss.
+
+        Whatever ``connect`` returns is pooled as is (e.g. a ``(client,
+        profile)`` tuple).  Its exceptions propagate and nothing is pooled.
+        """
+        key = self.key(platform, credentials)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            # [lock, callers holding or waiting for it]; the entry outlives a failed connect while
+            # anyone still waits, so the waiter and later callers keep queueing on the same lock
+            connecting = self._connecting.setdefault(key, [threading.Lock(), 0])
+            connecting[1] += 1
+        try:
+            with connecting[0]:
+                with self._lock:
+                    # Another session may have connected while we waited
+                    entry = self._lookup(key)
+                    if entry is not None:
+                        return entry[0]
+                with span("pool.connect", platform=platform):
+                    client = connect()
+                with self._lock:
+                    self.misses += 1
+                    self._clients[key] = [client, platform, self.clock()]
+                    self._evict(self.clock())
+        finally:
+            with self._lock:
+                connecting[1] -= 1
+                if not connecting[1]:
+                    del self._connecting[key]
+        return client
+
+    def discard(self, platform, credentials):
+        """Forget the client for ``credentials`` (e.g. after its token was revoked)."""
+        with self._lock:
+            self._clients.pop(self.key(platform, credentials), None)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def metrics(self):
+        with self._lock:
+            platforms = [platform for _, platform, _ in self._clients.values()]
+        return {
+            "Clients": len(platforms),
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Evictions": self.evictions,
+            "Platforms": ", ".join(sorted(set(platforms))),
+        }
@@ -0,0 +1,12 @@
+"""Per-platform connectors for the Social Media Dashboard.
+
+Each connector imports its platform SDK on first use, so opening the app (or
+any tab that doesn't talk to that platform) never pays for it. Every
+``fetch_*_posts`` function takes an authenticated client and the account's
+stored cursor and returns ``(posts, new_cursor)`` in the shape expected by
+``PostStore.sync``: ``posts`` are ``(post_id, created_at, record)`` tuples and
+``record`` is the row shown in the dashboard.
+"""
+
+# Upper bound on posts pulled for an account that has never been synced
+INITIAL_LIMIT = 200
@@ -0,0 +1,277 @@
+"""Facebook Graph API connector for the Social Media Dashboard.
+
+All calls go through one pooled ``requests.Session``. Page posts are read with
+cursor pagination down to a date horizon, post insights are fetched with Graph
+batch requests, GET responses are revalidated with ETags, and rate-limit
+errors are retried with exponential backoff.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from marketing_suite.ratelimit import (MAX_WAIT, RateLimitExceeded, backoff_delay, classify, credential_key, limiter,
+                                      observe_headers)
+from marketing_suite.timing import instrument_session
+
+GRAPH_URL = "https://graph.facebook.com"
+GRAPH_VERSION = "v19.0"
+POST_FIELDS = "created_time,message,shares"
+INSIGHT_METRICS = ("post_engaged_users", "post_impressions")
+PAGE_SIZE = 100
+# Graph accepts at most 50 sub-requests per batch call
+BATCH_SIZE = 50
+# Application, user, page and ad-account level throttling codes
+RATE_LIMIT_CODES = {4, 17, 32, 341, 613, 80001, 80004}
+# GET responses kept per client for ETag revalidation; the least recently used go first
+MAX_ETAGS = 256
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide Graph session, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            instrument_session(_session)
+        return _session
+
+
+class GraphAPIError(Exception):
+    def __init__(self, message, code=None, subcode=None, status=None):
+        super().__init__(message)
+        self.code = code
+        self.subcode = subcode
+        self.status = status
+
+    @property
+    def is_rate_limit(self):
+        return self.code in RATE_LIMIT_CODES or self.status == 429
+
+    @classmethod
+    def from_payload(cls, payload, status=None):
+        error = payload.get("error", {}) if isinstance(payload, dict) else {}
+        return cls(error.get("message", f"Graph API request failed ({status})"),
+                   code=error.get("code"), subcode=error.get("error_subcode"), status=status)
+
+
+def _etag_key(url):
+    """``url`` without its ``access_token``, the key of its cached response."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "access_token"]
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+def _parse_time(value):
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+class GraphClient:
+    """Thin Graph API client; ``base_url`` and ``session`` can point at a stub server."""
+
+    def __init__(self, access_token, version=GRAPH_VERSION, base_url=GRAPH_URL, session=None,
+                 max_retries=5, backoff=2.0, sleep=time.sleep, max_etags=MAX_ETAGS):
+        self.access_token = access_token
+        self.base = f"{base_url.rstrip('/')}/{version}"
+        self.session = session or get_session()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.max_etags = max_etags
+        # URL without the token -> (ETag, payload), most recently used last
+        self._etags = OrderedDict()
+        self._etags_lock = threading.Lock()
+        # Graph quotas are per app and token, so every endpoint shares one bucket
+        self.bucket = limiter.bucket("Facebook", credential=credential_key(access_token))
+
+    def _send(self, method, url, data=None, calls=1):
+        """Send one request, retrying throttling and server errors with jittered backoff.
+
+        ``calls`` is how many API calls the request counts as (a batch
+        counts every sub-request).
+        """
+        headers = {}
+        key = _etag_key(url) if method == "GET" else None
+        cached = self._cached(key) if key else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire(calls, max_wait=MAX_WAIT)
+            response = self.session.request(method, url, data=data, headers=headers, timeout=30)
+            observe_headers(self.bucket, response.headers)
+            if response.status_code == 304 and cached:
+                return cached[1]
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = {}
+            if response.ok and not (isinstance(payload, dict) and "error" in payload):
+                etag = response.headers.get("ETag")
+                if key and etag:
+                    self._cache(key, etag, payload)
+                return payload
+
+            error = GraphAPIError.from_payload(payload, status=response.status_code)
+            retryable, throttled = classify(error)
+            if not retryable or attempt == self.max_retries:
+                raise error
+            if throttled:
+                self.bucket.count_throttled()
+            self.bucket.count_retry()
+            self.sleep(backoff_delay(attempt, base=self.backoff))
+
+    def _cached(self, key):
+        with self._etags_lock:
+            cached = self._etags.get(key)
+            if cached:
+                self._etags.move_to_end(key)
+            return cached
+
+    def _cache(self, key, etag, payload):
+        with self._etags_lock:
+            self._etags[key] = (etag, payload)
+            self._etags.move_to_end(key)
+            while len(self._etags) > self.max_etags:
+                self._etags.popitem(last=False)
+
+    def _url(self, path, params=None):
+        params = dict(params or {}, access_token=self.access_token)
+        return f"{self.base}/{path.lstrip('/')}?{urlencode(params)}"
+
+    def get(self, path, **params):
+        return self._send("GET", self._url(path, params))
+
+    def post(self, path, **data):
+        return self._send("POST", self._url(path), data=data)
+
+    def get_url(self, url):
+        """Fetch an absolute URL such as a ``paging.next`` cursor link."""
+        return self._send("GET", url)
+
+    def batch(self, relative_urls):
+        """Run up to ``BATCH_SIZE`` relative GET requests in one round-trip.
+
+        Returns the decoded body of each sub-request, or a ``GraphAPIError``
+        in its place when that sub-request failed.
+        """
+        batch = [{"method": "GET", "relative_url": relative_url} for relative_url in relative_urls]
+        responses = self._send("POST", self.base, data={"access_token": self.access_token,
+                                                        "batch": json.dumps(batch)}, calls=len(batch))
+        results = []
+        for item in responses:
+            if not item:
+                # Graph returns null for sub-requests it did not get to run
+                results.append(GraphAPIError("Batch sub-request was not processed"))
+                continue
+            body = json.loads(item.get("body") or "{}")
+            if item.get("code") != 200:
+                results.append(GraphAPIError.from_payload(body, status=item.get("code")))
+            else:
+                results.append(body)
+        return results
+
+    def page_info(self, page_id):
+        return self.get(page_id, fields="name,fan_count")
+
+    def iter_posts(self, page_id, since=None, fields=POST_FIELDS, limit=PAGE_SIZE):
+        """Yield page posts newest first, following cursors until ``since``."""
+        params = {"fields": fields, "limit": limit}
+        if since is not None:
+            params["since"] = int(since.timestamp())
+        payload = self.get(f"{page_id}/posts", **params)
+        while True:
+            for post in payload.get("data", []):
+                if since is not None and _parse_time(post["created_time"]) < since:
+                    return
+                yield post
+            next_url = payload.get("paging", {}).get("next")
+            if not next_url or not payload.get("data"):
+                return
+            payload = self.get_url(next_url)
+
+    def post_insights(self, post_ids, metrics=INSIGHT_METRICS):
+        """Map each post id to ``{metric: value}`` using batched insight calls."""
+        metric_list = ",".join(metrics)
+        insights = {}
+        post_ids = list(post_ids)
+        for start in range(0, len(post_ids), BATCH_SIZE):
+            chunk = post_ids[start:start + BATCH_SIZE]
+            results = self.batch([f"{post_id}/insights?metric={metric_list}" for post_id in chunk])
+            for post_id, result in zip(chunk, results):
+                if isinstance(result, GraphAPIError):
+                    insights[post_id] = {}
+                    continue
+                insights[post_id] = {
+                    item["name"]: item["values"][0]["value"] if item.get("values") else 0
+                    for item in result.get("data", [])
+                }
+        return insights
+
+
+def _record(post, metrics):
+    message = post.get("message", "")
+    return (post["id"], post["created_time"], {
+        "Date": post["created_time"],
+        "Message": message[:100] + "..." if message else "",
+        "Impressions": metrics.get("post_impressions", 0),
+        "Engaged Users": metrics.get("post_engaged_users", 0),
+        "Shares": post.get("shares", {}).get("count", 0)
+    })
+
+
+def _newest(records, cursor):
+    """Cursor for ``records``: the newest ``created_time`` among them, else ``cursor``."""
+    if not records:
+        return cursor
+    return max(_parse_time(created) for _, created, _ in records).isoformat()
+
+
+def page_post_records(client, page_id, since):
+    """``(post_id, created_time, record)`` for every post since ``since``.
+
+    Insights are fetched oldest posts first, so that when the quota runs out
+    part way the completed posts are the oldest ones and a later sync can
+    resume after them; they are attached to the ``RateLimitExceeded``.
+    """
+    posts = list(client.iter_posts(page_id, since=since))[::-1]
+    records = []
+    try:
+        for start in range(0, len(posts), BATCH_SIZE):
+            chunk = posts[start:start + BATCH_SIZE]
+            insights = client.post_insights(post["id"] for post in chunk)
+            records.extend(_record(post, insights.get(post["id"], {})) for post in chunk)
+    except RateLimitExceeded as e:
+        e.partial = records
+        raise
+    return records
+
+
+def fetch_facebook_posts(client, page_id, cursor=None, days=365):
+    """Page posts created after the stored ``created_time``, with insights."""
+    if cursor:
+        since = datetime.fromisoformat(cursor) + timedelta(seconds=1)
+    else:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+    try:
+        posts = page_post_records(client, page_id, since)
+    except RateLimitExceeded as e:
+        e.partial = (e.partial, _newest(e.partial, cursor)) if e.partial else None
+        raise
+    return posts, _newest(posts, cursor)
+
+
+def publish_facebook_post(client, page_id, message):
+    """Publish a text post to a page feed; returns the new post's id."""
+    return client.post(f"{page_id}/feed", message=message)["id"]
@@ -0,0 +1,86 @@
+"""Instagram connector (instaloader)."""
+import json
+import time
+from datetime import datetime
+
+from marketing_suite.client_pool import password_matches, remember_password
+from marketing_suite.connectors import INITIAL_LIMIT
+from marketing_suite.ratelimit import MAX_WAIT, RateLimitExceeded, call, credential_key, limiter
+from marketing_suite.timing import span
+
+
+def connect_instagram(username, password, session_file=None):
+    """Log in and return the account's ``Profile``.
+
+    With ``session_file``, a session saved there by an earlier login with
+    the same password is reused (if Instagram still accepts it) instead of
+    logging in again, and a fresh login is saved there.
+    """
+    import instaloader
+
+    credential = credential_key(username)
+    bucket = limiter.bucket("Instagram", credential=credential)
+
+    class SharedRateController(instaloader.RateController):
+        """Instaloader's per-query-type pacing, on top of the account's shared bucket.
+
+        Waits instaloader would sleep through (minutes after a 429) raise
+        ``RateLimitExceeded`` instead of hanging the rerun.
+        """
+
+        def wait_before_query(self, query_type):
+            bucket.acquire(max_wait=MAX_WAIT)
+            super().wait_before_query(query_type)
+
+        def handle_429(self, query_type):
+            bucket.count_throttled()
+            bucket.block(self.query_waittime(query_type, time.monotonic(), True))
+            super().handle_429(query_type)
+
+        def sleep(self, secs):
+            if secs > MAX_WAIT:
+                raise RateLimitExceeded("Instagram", bucket.endpoint, secs)
+            super().sleep(secs)
+
+    with span("connector.connect", platform="Instagram"):
+        loader = instaloader.Instaloader(rate_controller=SharedRateController)
+        logged_in = False
+        if session_file and password_matches(session_file, password):
+            loader.load_session_from_file(username, session_file)
+            logged_in = call("Instagram", "session", loader.test_login, credential=credential) == username
+        if not logged_in:
+            # Failed logins are not retried; repeating them gets the account challenged
+            call("Instagram", "login", loader.login, username, password, credential=credential, max_attempts=1)
+            if session_file:
+                loader.save_session_to_file(session_file)
+                remember_password(session_file, password)
+        return instaloader.Profile.from_username(loader.context, username)
+
+
+def fetch_instagram_posts(profile, cursor=None, limit=INITIAL_LIMIT):
+    """Posts newer than the stored newest post; the cursor holds its shortcode and date.
+
+    ``get_posts`` yields newest first, apart from pinned posts which come
+    first regardless of age, so those are never used to stop the scan.
+    """
+    last = json.loads(cursor) if cursor else None
+    last_date = datetime.fromisoformat(last["date"]) if last else None
+    posts = []
+    for post in profile.get_posts():
+        if last and (post.shortcode == last["shortcode"] or post.date_utc <= last_date):
+            if getattr(post, "is_pinned", False):
+                continue
+            break
+        if not last and len(posts) >= limit:
+            break
+        posts.append((post.shortcode, post.date_utc, {
+            "Date": post.date_utc,
+            "Likes": post.likes,
+            "Comments": post.comments,
+            "Caption": post.caption[:50] + "..." if post.caption else "",
+            "URL": f"https://instagram.com/p/{post.shortcode}"
+        }))
+    if not posts:
+        return posts, cursor
+    newest = max(posts, key=lambda post: post[1])
+    return posts, json.dumps({"shortcode": newest[0], "date": newest[1].isoformat()})
@@ -0,0 +1,80 @@
+"""LinkedIn connector (linkedin_api)."""
+import os
+from datetime import datetime, timezone
+
+from marketing_suite.client_pool import password_matches, remember_password
+from marketing_suite.connectors import INITIAL_LIMIT
+from marketing_suite.ratelimit import call, credential_key
+from marketing_suite.timing import span
+
+# Posts a delta sync asks for first; doubled until the page reaches the cursor
+DELTA_PAGE = 20
+
+
+def connect_linkedin(username, password, cookies_dir=None):
+    """Log in and return ``(client, profile)``.
+
+    With ``cookies_dir``, session cookies saved there by an earlier login
+    with the same password are reused instead of logging in again.
+    """
+    from linkedin_api import Linkedin
+    from linkedin_api.cookie_repository import LinkedinSessionExpired
+
+    credential = credential_key(username)
+    options = {}
+    if cookies_dir:
+        # linkedin_api names the jar <cookies_dir><username>.jr
+        cookies_dir = os.path.join(cookies_dir, "")
+        cookie_file = f"{cookies_dir}{username}.jr"
+        options = {"cookies_dir": cookies_dir, "refresh_cookies": not password_matches(cookie_file, password)}
+
+    def login(**extra):
+        # The constructor logs in; failed logins are not retried
+        return call("LinkedIn", "login", Linkedin, username, password, credential=credential,
+                    max_attempts=1, **options, **extra)
+
+    with span("connector.connect", platform="LinkedIn"):
+        try:
+            linkedin = login()
+        except LinkedinSessionExpired:
+            linkedin = login(refresh_cookies=True)
+        if cookies_dir and os.path.exists(cookie_file):
+            remember_password(cookie_file, password)
+        return linkedin, call("LinkedIn", "profile", linkedin.get_profile, credential=credential_key(username))
+
+
+def fetch_linkedin_posts(linkedin, profile_id, cursor=None, limit=INITIAL_LIMIT):
+    """Posts whose ``createdAt`` (epoch ms) is newer than the cursor.
+
+    The LinkedIn API has no ``since`` filter or offset, so a delta sync asks
+    for a small page of the newest posts and, while every post on it is
+    still newer than the high-water mark, asks again for twice as many.  The
+    cursor only moves once the posts up to the old one have all been fetched.
+    """
+    since = int(cursor) if cursor else None
+    post_count = DELTA_PAGE if since else limit
+    while True:
+        activities = call("LinkedIn", "posts", linkedin.get_profile_posts, profile_id,
+                          post_count=post_count, credential=credential_key(profile_id))
+        created = [post['createdAt'] for post in activities if post.get('createdAt') is not None]
+        # Stop at the cursor, or when the profile has no older posts to give
+        if since is None or len(activities) < post_count or (created and min(created) <= since):
+            break
+        post_count *= 2
+    posts = []
+    for post in activities:
+        created = post.get('createdAt')
+        if created is None or (since is not None and created <= since):
+            continue
+        counts = post.get('socialDetail', {}).get('totalSocialActivityCounts', {})
+        created_at = datetime.fromtimestamp(created / 1000, tz=timezone.utc)
+        post_id = post.get('urn') or post.get('entityUrn') or str(created)
+        posts.append((post_id, created_at, {
+            "Date": created_at,
+            "Content": post.get('commentary', '')[:100] + "..." if post.get('commentary') else "",
+            "Likes": counts.get('like', 0),
+            "Comments": counts.get('comment', 0),
+            "Shares": counts.get('share', 0)
+        }))
+    newest = max([post.get('createdAt') or 0 for post in activities] + [since or 0])
+    return posts, str(newest) if newest else None
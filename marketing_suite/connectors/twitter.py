@@ -0,0 +1,69 @@
+"""Twitter connector (tweepy, v1.1 API)."""
+from urllib.parse import urlparse
+
+from marketing_suite.connectors import INITIAL_LIMIT
+from marketing_suite.ratelimit import call, credential_key, limited, observe_responses
+from marketing_suite.timing import span
+
+# API paths (without the version and format) of the endpoints with their own limits
+ENDPOINTS = {
+    "statuses/user_timeline": "user_timeline",
+    "account/verify_credentials": "verify_credentials",
+    "statuses/update": "update_status",
+    "media/upload": "media_upload",
+}
+
+
+def _credential(api):
+    return credential_key(api.auth.consumer_key, api.auth.access_token)
+
+
+def _endpoint(url):
+    path = urlparse(url).path.split("/", 2)[-1]
+    return ENDPOINTS.get(path.rsplit(".", 1)[0])
+
+
+def connect_twitter(api_key, api_secret, access_token, access_secret):
+    import tweepy
+
+    with span("connector.connect", platform="Twitter"):
+        auth = tweepy.OAuthHandler(api_key, api_secret)
+        auth.set_access_token(access_token, access_secret)
+        api = tweepy.API(auth)
+        # Every response carries the endpoint's remaining calls and reset time
+        observe_responses(api.session, "Twitter", _endpoint, credential=_credential(api))
+        return api, call("Twitter", "verify_credentials", api.verify_credentials, credential=_credential(api))
+
+
+def fetch_twitter_posts(api, since_id=None, limit=INITIAL_LIMIT):
+    """Tweets newer than ``since_id``; the new cursor is the highest tweet id."""
+    import tweepy
+
+    params = {"count": 200}
+    if since_id:
+        params["since_id"] = int(since_id)
+    user_timeline = limited("Twitter", "user_timeline", api.user_timeline, credential=_credential(api))
+    posts = []
+    for tweet in tweepy.Cursor(user_timeline, **params).items(None if since_id else limit):
+        posts.append((tweet.id_str, tweet.created_at, {
+            "Date": tweet.created_at,
+            "Text": tweet.text,
+            "Likes": tweet.favorite_count,
+            "Retweets": tweet.retweet_count,
+            "Replies": getattr(tweet, "reply_count", 0)
+        }))
+    new_cursor = max((int(post_id) for post_id, _, _ in posts), default=None)
+    return posts, str(new_cursor) if new_cursor else since_id
+
+
+def publish_tweet(api, text, media_path=None):
+    """Post a tweet, optionally with one image; returns the new tweet's id."""
+    credential = _credential(api)
+    with span("connector.publish", platform="Twitter"):
+        media_ids = None
+        if media_path:
+            media_ids = [call("Twitter", "media_upload", api.media_upload, media_path,
+                              credential=credential).media_id]
+        # A retried status update could post twice, so only the wait is shared
+        return call("Twitter", "update_status", api.update_status, status=text, media_ids=media_ids,
+                    credential=credential, max_attempts=1).id_str
@@ -0,0 +1,131 @@
+"""YouTube connector (pytube)."""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from marketing_suite.ratelimit import RateLimitExceeded, call
+from marketing_suite.timing import increment, propagate, span
+
+# Watch pages fetched at once; the rate limit, not this, bounds the request rate
+BATCH_WORKERS = 8
+CHANNEL_LIMIT = 500
+# Thumbnails are served from a fixed URL per video, so none has to be fetched up front
+THUMBNAIL_URL = "https://i.ytimg.com/vi/{}/hqdefault.jpg"
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+VIDEO_COLUMNS = ["post_id", "Date", "Title", "Views", "Length (s)", "Author", "Thumbnail"]
+
+
+def video_details(video_url):
+    """Metadata of a single video as a dashboard row, plus its thumbnail URL."""
+    from pytube import YouTube
+
+    def fetch():
+        # pytube loads the watch page lazily, on the first attribute read
+        yt = YouTube(video_url)
+        return yt, {
+            "Title": yt.title,
+            "Views": yt.views,
+            "Length": f"{yt.length // 60}:{yt.length % 60:02d}",
+            "Publish Date": yt.publish_date.strftime('%Y-%m-%d'),
+            "Likes": "N/A (Requires API)",
+            "Comments": "N/A (Requires API)"
+        }
+
+    with span("connector.fetch", platform="YouTube", kind="video"):
+        yt, video_data = call("YouTube", "video", fetch)
+    return video_data, yt.thumbnail_url
+
+
+def video_id(url):
+    """The 11-character ID of a video URL (or of a bare ID)."""
+    from pytube import extract
+    from pytube.exceptions import RegexMatchError
+
+    url = url.strip()
+    if re.fullmatch(r"[\w-]{11}", url):
+        return url
+    try:
+        return extract.video_id(url)
+    except RegexMatchError:
+        raise ValueError(f"Not a YouTube video URL: {url}") from None
+
+
+def _metadata(video_id):
+    """One video's cacheable metadata (two page fetches)."""
+    from pytube import YouTube
+
+    yt = YouTube(WATCH_URL.format(video_id))
+    return {
+        "Date": yt.publish_date.isoformat() if yt.publish_date else None,
+        "Title": yt.title,
+        "Views": yt.views,
+        "Length (s)": yt.length,
+        "Author": yt.author
+    }
+
+
+def fetch_videos(urls, cache=None, max_workers=BATCH_WORKERS, refresh=False):
+    """Metadata of many videos as dashboard rows, resolved concurrently.
+
+    Videos found in ``cache`` (a ``VideoCache``) are not fetched unless
+    ``refresh`` is set; the others are fetched on up to ``max_workers``
+    threads and stored in it.  Once the rate limit is reached the videos
+    not yet requested are skipped, so a later run picks up where this one
+    stopped.  Returns ``(frame, errors, cached)``: one row per distinct
+    video in input order, a message per URL that could not be resolved,
+    and the number of rows served from the cache.
+    """
+    ids = {}
+    errors = {}
+    for url in urls:
+        try:
+            ids.setdefault(video_id(url), url)
+        except ValueError as e:
+            errors[url] = str(e)
+    records = cache.get_many(ids) if cache is not None and not refresh else {}
+    cached = len(records)
+    missing = [vid for vid in ids if vid not in records]
+    if missing:
+        fetched = {}
+        increment("youtube.fetched", len(missing))
+        with span("connector.fetch", platform="YouTube", kind="batch"), \
+                ThreadPoolExecutor(max_workers=min(max_workers, len(missing)),
+                                   thread_name_prefix="youtube-fetch") as pool:
+            futures = {pool.submit(propagate(call), "YouTube", "video", _metadata, vid): vid for vid in missing}
+            for future in as_completed(futures):
+                vid = futures[future]
+                if future.cancelled():
+                    errors[ids[vid]] = "Skipped: rate limit reached"
+                    continue
+                try:
+                    fetched[vid] = future.result()
+                except RateLimitExceeded as e:
+                    errors[ids[vid]] = str(e)
+                    for pending in futures:
+                        pending.cancel()
+                except Exception as e:
+                    errors[ids[vid]] = f"{type(e).__name__}: {e}"
+        if cache is not None and fetched:
+            cache.put_many(fetched)
+        records.update(fetched)
+    rows = [dict(records[vid], post_id=vid, Thumbnail=THUMBNAIL_URL.format(vid)) for vid in ids if vid in records]
+    df = pd.DataFrame(rows, columns=VIDEO_COLUMNS)
+    df["Date"] = pd.to_datetime(df["Date"], utc=True, errors="coerce", format="ISO8601")
+    return df, errors, cached
+
+
+def channel_video_urls(channel_url, limit=CHANNEL_LIMIT):
+    """URLs of the channel's ``limit`` most recent videos (listing pages only, no watch pages)."""
+    from pytube import Channel
+
+    with span("connector.fetch", platform="YouTube", kind="channel"):
+        return call("YouTube", "channel", lambda: list(Channel(channel_url).video_urls[:limit]))
+
+
+def fetch_youtube_videos(channel_url, limit=20, cache=None):
+    """The channel's most recent videos as dashboard rows with a ``post_id``."""
+    df, errors, _ = fetch_videos(channel_video_urls(channel_url, limit), cache)
+    if errors and df.empty:
+        raise RuntimeError(next(iter(errors.values())))
+    return df
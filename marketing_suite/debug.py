@@ -0,0 +1,67 @@
+"""Optional debug sidebar: per-rerun span timings, rate limits, exports and profiling.
+
+Shown when the app is opened with ``?debug=1`` or ``MARKETING_DEBUG=1`` is
+set.  "Profile next rerun" runs the following rerun under the chosen
+profiler and keeps its report in the session.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from marketing_suite.ratelimit import limiter
+from marketing_suite.timing import available_profilers, prometheus_text, summarize
+
+HISTORY = 20
+
+
+def enabled():
+    return os.getenv("MARKETING_DEBUG", "0") not in ("", "0") or st.query_params.get("debug") == "1"
+
+
+def requested_profiler():
+    """The profiler queued for this rerun by the sidebar, if any (consumed)."""
+    return st.session_state.pop("profile_next", None)
+
+
+def render_sidebar(recorder, profile=None):
+    history = st.session_state.setdefault("span_history", [])
+    rerun = st.session_state.get("rerun_count", 0) + 1
+    st.session_state.rerun_count = rerun
+    history.append((rerun, recorder))
+    del history[:-HISTORY]
+    if profile is not None:
+        st.session_state.last_profile = (rerun, profile.kind, profile.text)
+
+    with st.sidebar:
+        st.header("Debug")
+        spans = list(recorder.spans)
+        st.metric(f"Rerun #{rerun}", f"{recorder.elapsed_ms:,.0f} ms")
+        st.dataframe(pd.DataFrame(summarize(spans)), hide_index=True)
+
+        st.caption(f"Rerun times (last {len(history)})")
+        st.bar_chart(pd.DataFrame({"ms": [past.elapsed_ms for _, past in history]},
+                                  index=[number for number, _ in history]))
+
+        buckets = limiter.metrics()
+        if buckets:
+            st.subheader("Rate limits")
+            st.dataframe(pd.DataFrame(buckets), hide_index=True)
+
+        jsonl = "".join(past.to_jsonl(rerun=number) for number, past in history)
+        st.download_button("Download spans (JSON lines)", jsonl, file_name="spans.jsonl",
+                           mime="application/x-ndjson")
+        st.download_button("Download metrics (Prometheus)", prometheus_text(),
+                           file_name="metrics.prom", mime="text/plain")
+
+        st.subheader("Profiling")
+        kind = st.selectbox("Profiler", available_profilers(), key="debug_profiler")
+        if st.button("Profile next rerun"):
+            st.session_state.profile_next = kind
+            st.info(f"The next rerun will be profiled with {kind}.")
+        if st.session_state.get("last_profile"):
+            number, kind, text = st.session_state.last_profile
+            with st.expander(f"{kind} report (rerun #{number})"):
+                st.code(text, language=None)
+            st.download_button("Download profile", text, file_name=f"profile-{number}.txt",
+                               mime="text/plain")
@@ -0,0 +1,144 @@
+"""Engagement metrics and anomaly flags for any platform's posts.
+
+``engagement_metrics`` takes a dashboard frame of one platform (``Likes``,
+``Retweets``, ``Views``, ... per ``social.METRIC_COLUMNS``) or the unified
+cross-platform frame (``likes``, ``views``, ... with ``platform`` and
+``account`` columns).  It returns, per post:
+
+* ``Engagement``: likes + comments + shares, over the ones the platform reports;
+* ``Engagement Rate (%)``: engagement over views, where views are reported;
+* ``Rolling Mean`` / ``Rolling Median``: over the account's last ``window``
+  posts, of the engagement rate where there is one, else of engagement;
+* ``Growth (%)``: change of the rolling mean since the account's previous post;
+* ``Z-Score`` and ``Robust Z`` (median and median absolute deviation), per
+  account, of the same quantity, and ``Anomaly`` when either passes its
+  threshold (in accounts with at least ``MIN_POSTS`` posts).
+
+Everything is computed on NumPy arrays after a single sort by account and
+time: no per-account Python loop and no ``groupby().rolling()``.
+"""
+import numpy as np
+import pandas as pd
+
+from marketing_suite.social import METRIC_COLUMNS
+
+ROLLING_WINDOW = 7
+Z_THRESHOLD = 3.0
+MAD_THRESHOLD = 3.5
+# Rows whose rolling windows are materialised at once
+ROLLING_BLOCK = 250_000
+# Accounts with fewer posts are never flagged: their spread means little
+MIN_POSTS = 5
+# Makes the MAD of normal data comparable to its standard deviation
+MAD_SCALE = 0.6745
+GROUP_COLUMNS = ["platform", "account"]
+TIME_COLUMNS = ["timestamp", "Date", "Publish Date"]
+OUTPUT_COLUMNS = ["Engagement", "Engagement Rate (%)", "Rolling Mean", "Rolling Median", "Growth (%)",
+                  "Z-Score", "Robust Z", "Anomaly"]
+
+
+def _counts(df, platform, metric):
+    """A unified metric (``likes``, ``views``, ...) as float64, NaN when not reported."""
+    column = metric if metric in df.columns else METRIC_COLUMNS.get(platform, {}).get(metric)
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+
+
+def _ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan),
+                     where=np.isfinite(denominator) & (denominator != 0))
+
+
+def _group_medians(values, groups, starts, counts):
+    """Median of the non-NaN ``values`` of each group; ``groups`` must be sorted."""
+    # Sorting by (group, value) keeps groups at the same offsets, with NaNs last in each
+    ordered = values[np.lexsort((values, groups))]
+    low = starts + np.maximum(counts - 1, 0) // 2
+    high = starts + counts // 2
+    medians = (ordered[np.minimum(low, len(values) - 1)] + ordered[np.minimum(high, len(values) - 1)]) / 2
+    return np.where(counts > 0, medians, np.nan)
+
+
+def _rolling(values, start_of, window):
+    """Mean and median of each value and the ``window - 1`` before it, within its group.
+
+    ``start_of`` is the index where each value's group starts.  Windows are
+    built ``ROLLING_BLOCK`` rows at a time to bound memory on large frames.
+    """
+    n = len(values)
+    means = np.empty(n)
+    medians = np.empty(n)
+    offsets = np.arange(window)
+    for lo in range(0, n, ROLLING_BLOCK):
+        rows = np.arange(lo, min(lo + ROLLING_BLOCK, n))
+        # The block's windows, NaN-padded where they would reach into the previous group
+        lag = rows[:, None] - offsets[None, :]
+        windows = np.where(lag >= start_of[rows, None], values[np.maximum(lag, 0)], np.nan)
+        counts = (~np.isnan(windows)).sum(axis=1)
+        means[rows] = _ratio(np.nansum(windows, axis=1), counts.astype(np.float64))
+        windows.sort(axis=1)
+        index = np.arange(len(rows))
+        low, high = np.maximum(counts - 1, 0) // 2, counts // 2
+        medians[rows] = np.where(counts > 0, (windows[index, low] + windows[index, high]) / 2, np.nan)
+    return means, medians
+
+
+def engagement_metrics(df, platform=None, window=ROLLING_WINDOW, z_threshold=Z_THRESHOLD,
+                       mad_threshold=MAD_THRESHOLD):
+    """Per-post engagement metrics and anomaly flags, aligned with ``df``'s index."""
+    n = len(df)
+    if n == 0:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS, index=df.index)
+    parts = np.vstack([_counts(df, platform, metric) for metric in ("likes", "comments", "shares")])
+    reported = ~np.isnan(parts).all(axis=0)
+    engagement = np.where(reported, np.nansum(parts, axis=0), np.nan)
+    rate = _ratio(engagement, _counts(df, platform, "views")) * 100
+    basis = np.where(np.isnan(rate), engagement, rate)
+
+    keys = [column for column in GROUP_COLUMNS if column in df.columns]
+    groups = (df.groupby(keys, observed=True, sort=False).ngroup().to_numpy() if keys
+              else np.zeros(n, dtype=np.int64))
+    time_column = next((column for column in TIME_COLUMNS if column in df.columns), None)
+    if time_column is None:
+        times = np.arange(n)
+    else:
+        times = pd.to_datetime(df[time_column], errors="coerce", utc=True).to_numpy("datetime64[ns]").view("i8")
+
+    order = np.lexsort((times, groups))
+    g = groups[order]
+    b = basis[order]
+    first = np.r_[True, g[1:] != g[:-1]]
+    starts = np.flatnonzero(first)
+    start_of = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+
+    rolling_mean, rolling_median = _rolling(b, start_of, window)
+    previous = np.r_[np.nan, rolling_mean[:-1]]
+    previous[first] = np.nan
+    growth = _ratio(rolling_mean - previous, previous) * 100
+
+    # Per-account z-scores, and robust ones from the median and MAD
+    present = ~np.isnan(b)
+    size = len(starts)
+    group_index = np.cumsum(first) - 1
+    counts = np.bincount(group_index, weights=present, minlength=size)
+    means = _ratio(np.bincount(group_index, weights=np.where(present, b, 0.0), minlength=size), counts)
+    deviation = b - means[group_index]
+    stds = np.sqrt(_ratio(np.bincount(group_index, weights=np.where(present, deviation ** 2, 0.0),
+                                      minlength=size), counts))
+    z = _ratio(deviation, stds[group_index])
+    int_counts = counts.astype(np.int64)
+    medians = _group_medians(b, group_index, starts, int_counts)
+    spread = np.abs(b - medians[group_index])
+    mads = _group_medians(spread, group_index, starts, int_counts)
+    robust = _ratio(MAD_SCALE * (b - medians[group_index]), mads[group_index])
+    anomaly = (np.abs(np.nan_to_num(z)) > z_threshold) | (np.abs(np.nan_to_num(robust)) > mad_threshold)
+    anomaly &= counts[group_index] >= MIN_POSTS
+
+    columns = {}
+    for name, values in zip(OUTPUT_COLUMNS, [engagement[order], rate[order], rolling_mean, rolling_median,
+                                             growth, z, robust, anomaly]):
+        restored = np.empty_like(values)
+        restored[order] = values
+        columns[name] = restored
+    return pd.DataFrame(columns, index=df.index)
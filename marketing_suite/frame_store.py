@@ -0,0 +1,209 @@
+"""Compact per-session store for the Social Media Dashboard's frames.
+
+Each session keeps one frame per (platform, account) instead of a single
+``social_data`` frame shared by every platform.  Frames are compacted when
+stored (see ``compact``) and are treated as read-only afterwards: views
+derive new columns with ``assign`` rather than writing into them.
+
+Memory is bounded twice.  A session holds at most ``SESSION_BUDGET_MB`` of
+frames, and all sessions of the process together at most
+``PROCESS_BUDGET_MB``.  Over budget, the least recently used frames are
+spilled to a pickle under ``SPILL_DIR`` and read back on their next
+``get``.  The frame a session used last is never spilled, so a single
+oversized frame still displays.  A session's spill files are removed when
+its store is garbage collected, i.e. when Streamlit drops the session.
+"""
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SPILL_DIR = os.getenv("MARKETING_SPILL_DIR", os.path.join(".cache", "frames"))
+SESSION_BUDGET_MB = float(os.getenv("MARKETING_SESSION_BUDGET_MB", "64"))
+PROCESS_BUDGET_MB = float(os.getenv("MARKETING_PROCESS_BUDGET_MB", "1024"))
+# Text cells are cut to this many characters; the full text stays in the PostStore
+MAX_TEXT = 280
+INT32_LIMIT = 2**31 - 1
+INT_HEADROOM = 16
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+# Global access order, so the process budget can evict across sessions
+_ticks = itertools.count()
+
+
+def compact(df, max_text=MAX_TEXT):
+    """A copy of ``df`` with the smallest dtypes that hold its values.
+
+    Integers become int32 where that leaves headroom, floats float32,
+    repetitive text categorical and other text Arrow-backed strings cut to
+    ``max_text`` characters.  Other columns (datetimes, lists, mixed
+    objects) are kept.
+    """
+    columns = {}
+    for name, values in df.items():
+        if pd.api.types.is_bool_dtype(values):
+            pass
+        elif pd.api.types.is_integer_dtype(values) and isinstance(values.dtype, np.dtype) and len(values):
+            # int32 at the smallest, and only with headroom, so that summing a
+            # few count columns (likes + comments + shares) can't overflow
+            low, high = int(values.min()), int(values.max())
+            if INT32_LIMIT > max(-low, high) * INT_HEADROOM:
+                values = values.astype(np.int32)
+        elif pd.api.types.is_float_dtype(values):
+            values = values.astype("float32")
+        elif values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) == "string":
+            long = values.str.len() > max_text
+            if long.any():
+                values = values.where(~long, values.str.slice(0, max_text - 1) + "…")
+            if values.nunique() <= len(values) * CATEGORY_RATIO:
+                values = values.astype("category")
+            else:
+                values = values.astype("string[pyarrow]")
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+class _Registry:
+    """Every live ``FrameStore`` of the process, for the process-wide budget."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.stores = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def enforce(self):
+        with self._lock:
+            while True:
+                stores = list(self.stores)
+                if sum(store.resident_bytes for store in stores) <= self.budget:
+                    return
+                candidates = [(oldest[0], store) for store in stores
+                              for oldest in [store.oldest()] if oldest is not None]
+                if not candidates:
+                    return
+                _, store = min(candidates, key=lambda candidate: candidate[0])
+                store.spill_oldest()
+
+
+registry = _Registry(PROCESS_BUDGET_MB * 2**20)
+
+
+def _remove(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class _Entry:
+    __slots__ = ("frame", "path", "nbytes", "tick")
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.path = None
+        self.nbytes = int(frame.memory_usage(deep=True).sum())
+        self.tick = next(_ticks)
+
+
+class FrameStore:
+    """One session's frames, keyed by (platform, account)."""
+
+    def __init__(self, budget_mb=SESSION_BUDGET_MB, directory=SPILL_DIR, registry=registry):
+        self.budget = budget_mb * 2**20
+        self.directory = directory
+        self.registry = registry
+        self._spill_dir = None
+        self._entries = OrderedDict()
+        self._active = {}
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.loads = 0
+        registry.stores.add(self)
+
+    @property
+    def resident_bytes(self):
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values() if entry.frame is not None)
+
+    def put(self, platform, account, df):
+        """Compact and store ``df`` as the platform's current frame; returns the stored frame."""
+        frame = compact(df)
+        key = (platform, account)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None and old.path:
+                os.remove(old.path)
+            self._entries[key] = _Entry(frame)
+            self._active[platform] = account
+            self._enforce()
+        self.registry.enforce()
+        return frame
+
+    def get(self, platform, account=None):
+        """The frame for ``account`` (default: the platform's current one), or ``None``."""
+        with self._lock:
+            if account is None:
+                if platform not in self._active:
+                    return None
+                account = self._active[platform]
+            entry = self._entries.get((platform, account))
+            if entry is None:
+                return None
+            entry.tick = next(_ticks)
+            self._entries.move_to_end((platform, account))
+            loaded = entry.frame is None
+            if loaded:
+                entry.frame = pd.read_pickle(entry.path)
+                self.loads += 1
+                self._enforce()
+            frame = entry.frame
+        if loaded:
+            self.registry.enforce()
+        return frame
+
+    def accounts(self, platform):
+        with self._lock:
+            return [account for (name, account) in self._entries if name == platform]
+
+    def oldest(self):
+        """``(tick, key)`` of the least recently used spillable frame, or ``None``."""
+        with self._lock:
+            resident = [(entry.tick, key) for key, entry in list(self._entries.items())[:-1]
+                        if entry.frame is not None]
+            return min(resident) if resident else None
+
+    def spill_oldest(self):
+        with self._lock:
+            oldest = self.oldest()
+            if oldest is None:
+                return False
+            entry = self._entries[oldest[1]]
+            if entry.path is None:
+                if self._spill_dir is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._spill_dir = tempfile.mkdtemp(prefix="session-", dir=self.directory)
+                    weakref.finalize(self, _remove, self._spill_dir)
+                entry.path = os.path.join(self._spill_dir, f"{next(_ticks)}.pkl")
+                # Frames are never modified once stored, so a spilled copy stays valid
+                entry.frame.to_pickle(entry.path)
+            entry.frame = None
+            self.spills += 1
+            return True
+
+    def _enforce(self):
+        while self.resident_bytes > self.budget and self.spill_oldest():
+            pass
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "Frames": len(self._entries),
+                "Resident (MB)": round(self.resident_bytes / 2**20, 2),
+                "Spilled": sum(entry.frame is None for entry in self._entries.values()),
+                "Spills": self.spills,
+                "Loads": self.loads,
+            }
@@ -0,0 +1,235 @@
+"""Chunked, cached ingestion of Ad Performance CSV exports.
+
+Uploads are parsed in fixed-size chunks with pinned compact dtypes and written
+to a Parquet file named after the content hash of the upload, so re-uploading
+the same export (or rerunning the app) reads the columnar cache instead of
+re-parsing the CSV.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from marketing_suite.timing import span
+
+CACHE_DIR = os.getenv("MARKETING_CACHE_DIR", os.path.join(".cache", "ingest"))
+CHUNK_ROWS = 250_000
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Columns with a known meaning in ad exports and the dtype they are pinned to
+CATEGORICAL_COLUMNS = ["Campaign"]
+FLOAT32_COLUMNS = ["Spend", "Revenue"]
+INT32_COLUMNS = ["Conversions"]
+DATE_COLUMNS = ["Date", "Day", "date", "day"]
+INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+# Integers beyond this lose digits as float64 (e.g. 64-bit ad and campaign ids)
+EXACT_FLOAT_LIMIT = 2 ** 53
+
+
+class _Replan(Exception):
+    """A later chunk doesn't fit the plan of ``column``; parse again with ``kind``."""
+
+    def __init__(self, column, kind):
+        super().__init__(column, kind)
+        self.column = column
+        self.kind = kind
+
+
+def content_hash(fileobj):
+    """Hash a file-like object block by block and rewind it."""
+    digest = hashlib.blake2b(digest_size=16)
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def cache_path(dataset_hash, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, f"{dataset_hash}.parquet")
+
+
+def _looks_numeric(values):
+    """Whether every value is a number that float64 holds exactly."""
+    numbers = values.dropna()
+    if not pd.api.types.is_numeric_dtype(numbers):
+        numbers = pd.to_numeric(numbers, errors="coerce")
+        if len(numbers) == 0 or numbers.isna().any():
+            return False
+    return len(numbers) == 0 or float(np.abs(numbers).max()) < EXACT_FLOAT_LIMIT
+
+
+def _to_number(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _column_plan(first_chunk, overrides=None):
+    """Decide a target kind for every column from the first chunk.
+
+    Later chunks are coerced to the same plan so every Parquet row group
+    shares one schema.  When a later chunk doesn't fit (text in a numeric
+    column, fractional or out-of-range conversions), the parse starts over
+    with that column's kind in ``overrides``.
+    """
+    plan = {}
+    for column in first_chunk.columns:
+        if overrides and column in overrides:
+            plan[column] = overrides[column]
+        elif column in CATEGORICAL_COLUMNS:
+            plan[column] = "category"
+        elif column in FLOAT32_COLUMNS:
+            plan[column] = "float32"
+        elif column in INT32_COLUMNS:
+            plan[column] = "int32"
+        elif column in DATE_COLUMNS:
+            plan[column] = "datetime"
+        elif _looks_numeric(first_chunk[column]):
+            plan[column] = "float64"
+        else:
+            plan[column] = "string"
+    return plan
+
+
+def _coerce_chunk(chunk, plan):
+    out = {}
+    for column, kind in plan.items():
+        values = chunk[column]
+        if kind == "float32":
+            out[column] = _to_number(values).astype("float32")
+        elif kind == "number":
+            # A known numeric column; unreadable cells become NaN
+            out[column] = _to_number(values).astype("float64")
+        elif kind == "float64":
+            numbers = _to_number(values)
+            if numbers.count() < values.count() or numbers.abs().max() >= EXACT_FLOAT_LIMIT:
+                raise _Replan(column, "string")
+            out[column] = numbers.astype("float64")
+        elif kind == "int32":
+            # Missing or unreadable conversions stay missing rather than becoming 0
+            numbers = _to_number(values)
+            present = numbers.dropna()
+            if len(present) and ((present % 1 != 0).any() or present.min() < INT32_RANGE[0]
+                                 or present.max() > INT32_RANGE[1]):
+                raise _Replan(column, "number")
+            out[column] = numbers.astype("Int32")
+        elif kind == "datetime":
+            out[column] = pd.to_datetime(values, errors="coerce")
+        else:
+            # Categories are dictionary-encoded on read; store plain strings per row group
+            out[column] = values.astype("string") if values.dtype != "string" else values
+    return pd.DataFrame(out, index=chunk.index)
+
+
+def _arrow_schema(plan):
+    types = {
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "number": pa.float64(),
+        "int32": pa.int32(),
+        "datetime": pa.timestamp("ns"),
+        "category": pa.string(),
+        "string": pa.string(),
+    }
+    return pa.schema([(column, types[kind]) for column, kind in plan.items()])
+
+
+def _parse_dtypes(fileobj):
+    """Let the C parser produce the pinned numeric columns directly."""
+    columns = pd.read_csv(fileobj, nrows=0).columns
+    fileobj.seek(0)
+    dtypes = {}
+    for column in columns:
+        if column in FLOAT32_COLUMNS:
+            dtypes[column] = "float32"
+        elif column in INT32_COLUMNS:
+            # Parsed as float so that blank cells don't abort the read
+            dtypes[column] = "float64"
+        elif column in CATEGORICAL_COLUMNS:
+            dtypes[column] = "string"
+    return dtypes
+
+
+def parse_csv_to_parquet(fileobj, path, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV into a Parquet file one chunk at a time.
+
+    Only one chunk is materialised at a time, so peak memory is bounded by
+    ``chunk_rows`` rather than by the size of the export.
+    """
+    fileobj.seek(0)
+    try:
+        dtypes = _parse_dtypes(fileobj)
+    except pd.errors.EmptyDataError:
+        raise ValueError("The uploaded CSV is empty") from None
+    overrides = {}
+    while True:
+        try:
+            return _write_parquet(fileobj, path, chunk_rows, dtypes, overrides)
+        except _Replan as e:
+            # A column only turned out not to fit further down; parse again with a wider kind
+            overrides[e.column] = e.kind
+        except ValueError:
+            if dtypes is str:
+                raise
+            # A pinned numeric column holds text somewhere; read everything as
+            # text and let the coercion step turn bad cells into NaN instead
+            dtypes = str
+        fileobj.seek(0)
+
+
+def _write_parquet(fileobj, path, chunk_rows, dtypes, overrides=None):
+    tmp_path = f"{path}.tmp"
+    writer = None
+    plan = None
+    try:
+        # Closing the reader (rather than leaving it to the GC when a chunk
+        # fails) leaves the caller's file open for another pass
+        with pd.read_csv(fileobj, chunksize=chunk_rows, dtype=dtypes, low_memory=True) as reader:
+            for chunk in reader:
+                if plan is None:
+                    plan = _column_plan(chunk, overrides)
+                    schema = _arrow_schema(plan)
+                    writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+                table = pa.Table.from_pandas(_coerce_chunk(chunk, plan), schema=schema, preserve_index=False)
+                writer.write_table(table)
+        if plan is None:
+            raise ValueError("The uploaded CSV is empty")
+        writer.close()
+        writer = None
+        os.replace(tmp_path, path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        fileobj.seek(0)
+    return plan
+
+
+def read_cached(path):
+    names = pq.read_schema(path).names
+    categorical = [column for column in CATEGORICAL_COLUMNS if column in names]
+    # Conversions stay nullable integers; Arrow would turn them into floats wherever one is missing
+    table = pq.read_table(path, read_dictionary=categorical)
+    return table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+
+
+def load_ad_csv(fileobj, cache_dir=None, chunk_rows=CHUNK_ROWS):
+    """Return ``(dataset_hash, DataFrame)`` for an uploaded ad CSV.
+
+    The hash identifies the upload's content and can be used to key any
+    further per-dataset caches.
+    """
+    with span("ingest.hash"):
+        dataset_hash = content_hash(fileobj)
+    path = cache_path(dataset_hash, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with span("ingest.parse"):
+            parse_csv_to_parquet(fileobj, path, chunk_rows=chunk_rows)
+    with span("ingest.read"):
+        return dataset_hash, read_cached(path)
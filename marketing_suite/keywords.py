@@ -0,0 +1,124 @@
+"""Keyword and n-gram density analysis for the Keyword Density Analyzer.
+
+Text is tokenized with one compiled regex, every distinct token is mapped to
+an integer code once, and 1- to 3-grams are counted as combined integer codes
+with NumPy, so multi-megabyte inputs never go through a Python-level counting
+loop. Batches of documents share one vocabulary and are counted together.
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Words, plus sentence punctuation so that phrases don't run across sentences
+TOKEN_RE = re.compile(r"[^\W_]+(?:['’][^\W_]+)*|[.!?;:]")
+BREAKS = frozenset(".!?;:")
+RESULT_COLUMNS = ["Document", "Keyword", "Words", "Count", "Density (%)"]
+
+
+@lru_cache(maxsize=1)
+def english_stop_words():
+    # sklearn is only imported once keywords are first analyzed
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    return frozenset(ENGLISH_STOP_WORDS)
+
+
+def tokenize(text):
+    """Lowercased word tokens, with sentence punctuation kept as break tokens."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def _top_k(counts, k):
+    """Indices of the ``k`` largest counts, largest first, without a full sort."""
+    if len(counts) > k:
+        idx = np.argpartition(counts, -k)[-k:]
+    else:
+        idx = np.arange(len(counts))
+    return idx[np.argsort(-counts[idx], kind="stable")]
+
+
+def analyze_documents(documents, ngram_range=(1, 3), top_k=10, stop_words=None, min_length=3, names=None):
+    """Top-k keyword densities for each document in ``documents``.
+
+    Density follows the usual SEO definition: occurrences times words per
+    phrase, over the total number of words in the document. Phrases are runs
+    of consecutive words within one sentence; stop words and tokens shorter
+    than ``min_length`` are never counted and break phrases.
+    ``stop_words`` defaults to sklearn's English list.
+    Returns one long DataFrame with a row per (document, n-gram); the
+    ``Document`` column holds ``names[i]`` if given, else the index ``i``.
+    """
+    if stop_words is None:
+        stop_words = english_stop_words()
+    token_lists = [tokenize(doc) for doc in documents]
+    lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+    if lengths.sum() == 0:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    doc_ids = np.repeat(np.arange(len(token_lists)), lengths)
+    all_tokens = np.fromiter((t for tokens in token_lists for t in tokens), dtype=object, count=int(lengths.sum()))
+
+    codes, vocab = pd.factorize(all_tokens)
+    vocab = np.asarray(vocab, dtype=object)
+    is_word = np.fromiter((word not in BREAKS for word in vocab), dtype=bool, count=len(vocab))
+    keep = np.fromiter((len(word) >= min_length and word not in stop_words and word not in BREAKS for word in vocab),
+                       dtype=bool, count=len(vocab))
+    total_words = np.bincount(doc_ids, weights=is_word[codes], minlength=len(documents))
+    kept = keep[codes]
+
+    columns = {name: [] for name in RESULT_COLUMNS}
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        windows = len(codes) - n + 1
+        if windows <= 0:
+            break
+        # A window counts only if every token in it is kept and it stays in one document
+        valid = kept[:windows].copy()
+        for offset in range(1, n):
+            valid &= kept[offset:offset + windows]
+        valid &= doc_ids[:windows] == doc_ids[n - 1:n - 1 + windows]
+        positions = np.flatnonzero(valid)
+        if len(positions) == 0:
+            continue
+
+        # Combine token codes into one integer per window. When the combined
+        # code could overflow int64, re-factorize after each step instead
+        safe = len(vocab) ** n * len(documents) < 2 ** 63
+        gram = codes[positions].astype(np.int64)
+        for offset in range(1, n):
+            gram = gram * len(vocab) + codes[positions + offset]
+            if not safe:
+                gram = pd.factorize(gram)[0].astype(np.int64)
+        key, _ = pd.factorize(doc_ids[positions] * (int(gram.max()) + 1) + gram)
+        counts = np.bincount(key)
+        # First window of each (document, n-gram) pair, used to decode its text
+        first = np.empty(len(counts), dtype=np.int64)
+        first[key[::-1]] = positions[::-1]
+        owner = doc_ids[first]
+
+        order = np.argsort(owner, kind="stable")
+        bounds = np.searchsorted(owner[order], np.arange(len(documents) + 1))
+        best = [order[lo:hi][_top_k(counts[order[lo:hi]], top_k)]
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+        best = np.concatenate(best)
+        columns["Document"].append(owner[best])
+        columns["Keyword"].append([" ".join(vocab[codes[p:p + n]]) for p in first[best]])
+        columns["Words"].append(np.full(len(best), n))
+        columns["Count"].append(counts[best])
+        columns["Density (%)"].append(counts[best] * n / total_words[owner[best]] * 100)
+
+    if not columns["Document"]:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    result = pd.DataFrame({name: np.concatenate(parts) for name, parts in columns.items()})
+    result = result.sort_values(["Document", "Words", "Count"], ascending=[True, True, False],
+                                kind="stable", ignore_index=True)
+    if names is not None:
+        result["Document"] = np.asarray(names, dtype=object)[result["Document"].to_numpy()]
+    return result
+
+
+def analyze_text(text, ngram_range=(1, 3), top_k=10, stop_words=None, min_length=3):
+    """Top-k keyword densities for a single piece of text."""
+    result = analyze_documents([text], ngram_range=ngram_range, top_k=top_k,
+                               stop_words=stop_words, min_length=min_length)
+    return result.drop(columns="Document")
@@ -0,0 +1,142 @@
+"""Persistent local store for fetched social posts.
+
+Posts are kept in SQLite, one row per (platform, account, post id), together
+with a per-account sync cursor (the platform's high-water mark, e.g. Twitter's
+``since_id``). A sync only asks the platform for posts newer than the cursor
+and merges them into what is already on disk.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from marketing_suite.ratelimit import RateLimitExceeded
+from marketing_suite.timing import span
+
+DB_PATH = os.getenv("MARKETING_POST_DB", os.path.join(".cache", "posts.sqlite3"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    platform TEXT NOT NULL,
+    account TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (platform, account, post_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS posts_by_time ON posts (platform, account, created_at);
+CREATE TABLE IF NOT EXISTS cursors (
+    platform TEXT NOT NULL,
+    account TEXT NOT NULL,
+    cursor TEXT,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (platform, account)
+);
+"""
+
+
+def _iso(value):
+    """Normalise a post timestamp to an ISO-8601 UTC string for sorting."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert("UTC").isoformat()
+
+
+class PostStore:
+    """Thread-safe SQLite post store shared by every session in the process."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_cursor(self, platform, account):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM cursors WHERE platform = ? AND account = ?", (platform, account)
+            ).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, platform, account, posts, cursor=None):
+        """Merge ``posts`` (``(post_id, created_at, record)`` tuples) and move the cursor.
+
+        Re-fetched posts replace their stored copy so engagement counts stay
+        current. The cursor is only advanced when one is given.
+        """
+        rows = [(platform, account, str(post_id), _iso(created_at), json.dumps(record, default=str))
+                for post_id, created_at, record in posts]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO posts (platform, account, post_id, created_at, record) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (platform, account, post_id) DO UPDATE SET "
+                "created_at = excluded.created_at, record = excluded.record",
+                rows,
+            )
+            if cursor is not None:
+                self._conn.execute(
+                    "INSERT INTO cursors (platform, account, cursor, synced_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (platform, account) DO UPDATE SET "
+                    "cursor = excluded.cursor, synced_at = excluded.synced_at",
+                    (platform, account, cursor, datetime.now(timezone.utc).isoformat()),
+                )
+        return len(rows)
+
+    def load(self, platform, account, limit=None, include_ids=False):
+        """Stored posts for an account, newest first, as the dashboard's DataFrame.
+
+        ``include_ids`` adds the platform's post id as a ``post_id`` column.
+        """
+        query = "SELECT post_id, record FROM posts WHERE platform = ? AND account = ? ORDER BY created_at DESC"
+        params = (platform, account)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        records = []
+        for post_id, record in rows:
+            record = json.loads(record)
+            if include_ids:
+                record["post_id"] = post_id
+            records.append(record)
+        df = pd.DataFrame(records)
+        if "Date" in df.columns:
+            df["Date"] = pd.to_datetime(df["Date"], errors="coerce", utc=True, format="ISO8601")
+        return df
+
+    def accounts(self, platform):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT account FROM cursors WHERE platform = ? ORDER BY synced_at DESC", (platform,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def sync(self, platform, account, fetch_since, include_ids=False):
+        """Fetch only posts newer than the stored cursor and return full history.
+
+        ``fetch_since(cursor)`` must return ``(posts, new_cursor)`` where
+        ``posts`` are ``(post_id, created_at, record)`` tuples.  When it
+        raises ``RateLimitExceeded`` with ``partial`` progress, that progress
+        is stored before the error is re-raised.
+        """
+        with span("store.fetch", platform=platform):
+            try:
+                posts, new_cursor = fetch_since(self.get_cursor(platform, account))
+            except RateLimitExceeded as e:
+                if e.partial:
+                    # Keep what was fetched before the quota ran out; the next sync resumes after it
+                    self.upsert(platform, account, *e.partial)
+                raise
+        with span("store.upsert", platform=platform):
+            self.upsert(platform, account, posts, cursor=new_cursor)
+        with span("store.load", platform=platform):
+            return self.load(platform, account, include_ids=include_ids)
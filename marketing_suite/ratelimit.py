@@ -0,0 +1,381 @@
+"""Shared rate limiting and retries for the social connectors.
+
+Every outbound platform call takes a token from a bucket keyed by
+(platform, endpoint, credential).  The buckets live in the process-wide
+``limiter``, so concurrent Streamlit sessions using the same account share
+one quota instead of each spending it in full.  Credentials are only kept as
+a short hash.
+
+Buckets start from the published per-window limits in ``LIMITS`` and adapt
+to what the platform reports: rate-limit headers (``x-rate-limit-*``,
+``Retry-After``, Facebook's ``x-app-usage``) lower the available tokens or
+block the bucket until the reported reset.  Connectors whose SDK uses a
+``requests`` session hook it with ``observe_responses``, so successful
+calls report their headers as well as failed ones.
+
+``call`` wraps one SDK call with a token acquisition and retries throttling
+and transient server errors with jittered exponential backoff.  Waits longer
+than ``max_wait`` raise ``RateLimitExceeded`` instead of hanging the rerun.
+Wait time, throttles, retries and rejections are counted per bucket
+(``limiter.metrics()``) and also recorded as timing spans and counters.
+"""
+import functools
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from marketing_suite.timing import increment, record_span
+
+MAX_ATTEMPTS = 4
+MAX_WAIT = 30.0
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+# Facebook's usage headers report percentages of the quota; at 100% the
+# app is throttled for an unspecified time
+USAGE_BLOCK_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class Rate:
+    """``limit`` calls per ``period`` seconds, allowed in bursts of up to ``limit``."""
+    limit: float
+    period: float
+
+
+# Published (or, for unofficial APIs, conservative) limits per endpoint;
+# ``None`` is the default for the platform's other endpoints
+LIMITS = {
+    ("Twitter", "user_timeline"): Rate(900, 900),
+    ("Twitter", "verify_credentials"): Rate(75, 900),
+    ("Twitter", "update_status"): Rate(300, 10800),
+    ("Twitter", "media_upload"): Rate(415, 900),
+    ("Twitter", None): Rate(75, 900),
+    # Page tokens get 4800 calls per engaged user per rolling day, and every
+    # sub-request of a batch counts; usage headers tighten the bucket from there
+    ("Facebook", None): Rate(4800, 86400),
+    # Logins are kept rare: repeated ones get Instagram and LinkedIn accounts locked
+    ("Instagram", "login"): Rate(3, 3600),
+    ("Instagram", None): Rate(200, 660),
+    ("LinkedIn", "login"): Rate(3, 3600),
+    ("LinkedIn", None): Rate(300, 3600),
+    # Batch analysis resolves watch pages concurrently; channel listings stay slow
+    ("YouTube", "video"): Rate(300, 60),
+    ("YouTube", None): Rate(60, 60),
+}
+DEFAULT_RATE = Rate(60, 60)
+
+
+class RateLimitExceeded(Exception):
+    """The call would have to wait longer than allowed for its quota.
+
+    A fetch interrupted part way can set ``partial`` to ``(posts, cursor)``
+    of the work it completed, which ``PostStore.sync`` keeps.
+    """
+
+    def __init__(self, platform, endpoint, retry_after):
+        super().__init__(f"{platform} rate limit reached ({endpoint}); try again in {retry_after:.0f} s")
+        self.platform = platform
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.partial = None
+
+
+def credential_key(*parts):
+    """Short, non-reversible key for a credential (token, username, ...)."""
+    if not any(parts):
+        return ""
+    return hashlib.blake2b("\0".join(str(part) for part in parts).encode(), digest_size=8).hexdigest()
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP, rng=random):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    ``acquire`` reserves tokens and sleeps until they are due, so concurrent
+    callers are served in order instead of all waking at once.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep, platform="", endpoint=None,
+                 name=""):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.platform = platform
+        self.endpoint = endpoint or "default"
+        self.name = name or f"{platform}:{self.endpoint}"
+        self.blocked_until = 0.0
+        self.updated = clock()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0.0
+        self.rejected = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_for(self, tokens, now):
+        deficit = tokens - self.tokens
+        return max(self.blocked_until - now, deficit / self.rate if deficit > 0 else 0.0, 0.0)
+
+    def wait_time(self, tokens=1):
+        """Seconds until ``tokens`` could be taken (0 if they can be taken now)."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            return self._wait_for(tokens, now)
+
+    def try_acquire(self, tokens=1):
+        """Take ``tokens`` if available right now, without waiting."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            if self._wait_for(tokens, now) > 0:
+                return False
+            self.tokens -= tokens
+            self.acquired += 1
+            return True
+
+    def acquire(self, tokens=1, max_wait=None):
+        """Take ``tokens``, sleeping until they are available.
+
+        Raises ``RateLimitExceeded`` (without reserving anything) when that
+        would take longer than ``max_wait`` seconds.
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            wait = self._wait_for(tokens, now)
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                # Reserve now (the balance may go negative) so later callers queue behind us
+                self.tokens -= tokens
+                self.acquired += 1
+                self.waited += wait
+        if rejected:
+            increment("ratelimit.rejected", bucket=self.name)
+            raise RateLimitExceeded(self.platform, self.endpoint, wait)
+        if wait > 0:
+            record_span("ratelimit.wait", wait, bucket=self.name)
+            self.sleep(wait)
+        return wait
+
+    def block(self, seconds):
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429 with ``Retry-After``)."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def observe(self, remaining=None, reset_in=None, usage_pct=None):
+        """Adapt to quota information reported by the platform.
+
+        ``remaining`` calls left until the window resets in ``reset_in``
+        seconds, or ``usage_pct`` of the quota already used.
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            if usage_pct is not None:
+                remaining = max(0.0, (100.0 - usage_pct) / 100.0 * self.capacity)
+                if usage_pct >= 100:
+                    reset_in = USAGE_BLOCK_SECONDS if reset_in is None else reset_in
+            if remaining is None:
+                return
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_in:
+                self.blocked_until = max(self.blocked_until, now + reset_in)
+
+    def count_throttled(self):
+        """Count a throttled response (429 or a platform equivalent)."""
+        with self._lock:
+            self.throttled += 1
+        increment("ratelimit.throttled", bucket=self.name)
+
+    def count_retry(self):
+        with self._lock:
+            self.retries += 1
+        increment("ratelimit.retry", bucket=self.name)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "Bucket": self.name,
+                "Tokens": round(max(self.tokens, 0.0), 1),
+                "Capacity": self.capacity,
+                "Calls": self.acquired,
+                "Waited (s)": round(self.waited, 2),
+                "Rejected": self.rejected,
+                "Throttled": self.throttled,
+                "Retries": self.retries,
+            }
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by (platform, endpoint, credential)."""
+
+    def __init__(self, limits=None, clock=time.monotonic, sleep=time.sleep):
+        self.limits = dict(LIMITS, **(limits or {}))
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def rate(self, platform, endpoint=None):
+        return self.limits.get((platform, endpoint)) or self.limits.get((platform, None)) or DEFAULT_RATE
+
+    def bucket(self, platform, endpoint=None, credential=""):
+        key = (platform, endpoint, credential)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate = self.rate(platform, endpoint)
+                name = f"{platform}:{endpoint or 'default'}"
+                if credential:
+                    name += f":{credential[:6]}"
+                bucket = TokenBucket(rate.limit / rate.period, rate.limit, clock=self.clock, sleep=self.sleep,
+                                     platform=platform, endpoint=endpoint, name=name)
+                self._buckets[key] = bucket
+            return bucket
+
+    def metrics(self):
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return [bucket.metrics() for bucket in buckets]
+
+
+limiter = RateLimiter()
+
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def observe_headers(bucket, headers, clock=time.time):
+    """Feed rate-limit response headers into ``bucket``.
+
+    Understands ``x-rate-limit-remaining``/``-reset`` (Twitter, epoch
+    seconds), ``x-ratelimit-*``, ``Retry-After`` and Facebook's
+    ``x-app-usage``/``x-business-use-case-usage`` JSON percentages.
+    """
+    if not headers:
+        return
+    retry_after = _header(headers, "Retry-After", "retry-after")
+    if retry_after is not None:
+        try:
+            bucket.block(float(retry_after))
+        except ValueError:
+            pass
+    remaining = _header(headers, "x-rate-limit-remaining", "x-ratelimit-remaining")
+    reset = _header(headers, "x-rate-limit-reset", "x-ratelimit-reset")
+    if remaining is not None:
+        reset_in = None
+        if reset is not None:
+            reset = float(reset)
+            # Epoch timestamps vs. seconds-until-reset
+            reset_in = max(0.0, reset - clock()) if reset > 1e9 else reset
+        bucket.observe(remaining=float(remaining), reset_in=reset_in)
+    usage = _header(headers, "x-app-usage", "X-App-Usage", "x-business-use-case-usage")
+    if usage:
+        try:
+            usage = json.loads(usage)
+        except ValueError:
+            return
+        # Business use case usage is keyed by business id, each holding a list
+        entries = [usage] if "call_count" in usage else [
+            entry for values in usage.values() if isinstance(values, list) for entry in values]
+        percentages = [float(entry.get(field, 0)) for entry in entries
+                       for field in ("call_count", "total_time", "total_cputime")]
+        if percentages:
+            bucket.observe(usage_pct=max(percentages))
+
+
+def observe_responses(session, platform, endpoint_for=lambda url: None, credential=""):
+    """Feed the rate-limit headers of every response ``session`` receives into the limiter.
+
+    SDKs only expose response headers on errors; hooking their ``requests``
+    session lets the buckets also learn from successful calls.
+    ``endpoint_for(url)`` names the endpoint whose bucket a response's
+    headers describe (``None`` for the platform's default bucket).
+    """
+    def hook(response, *args, **kwargs):
+        observe_headers(limiter.bucket(platform, endpoint_for(response.url), credential), response.headers)
+    session.hooks["response"].append(hook)
+    return session
+
+
+def _error_status(error):
+    status = getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        # aiohttp-style responses and tweepy's own attribute
+        status = getattr(getattr(error, "response", None), "status", None)
+    return status if isinstance(status, int) else None
+
+
+def classify(error):
+    """``(retryable, throttled)`` for an exception raised by a platform SDK."""
+    name = type(error).__name__
+    status = _error_status(error)
+    throttled = (status == 429 or getattr(error, "is_rate_limit", False)
+                 or name in ("TooManyRequests", "TooManyRequestsException"))
+    transient = (status is not None and status >= 500) or isinstance(error, (ConnectionError, TimeoutError)) \
+        or name in ("ConnectionError", "Timeout", "ReadTimeout", "ConnectTimeout", "TwitterServerError")
+    return throttled or transient, throttled
+
+
+def call(platform, endpoint, fn, *args, credential="", tokens=1, max_attempts=MAX_ATTEMPTS,
+         max_wait=MAX_WAIT, **kwargs):
+    """Call ``fn(*args, **kwargs)`` under the bucket for (platform, endpoint, credential).
+
+    Throttling (429 and platform equivalents) blocks the shared bucket for
+    the reported ``Retry-After``/reset time; it and transient server or
+    connection errors are retried with jittered exponential backoff.  Other
+    errors (bad credentials, challenges, not found) are raised at once, as
+    retrying them is what gets accounts locked.
+    """
+    bucket = limiter.bucket(platform, endpoint, credential)
+    for attempt in range(max_attempts):
+        bucket.acquire(tokens, max_wait=max_wait)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            retryable, throttled = classify(e)
+            if throttled:
+                bucket.count_throttled()
+                observe_headers(bucket, getattr(getattr(e, "response", None), "headers", None))
+            if not retryable or attempt == max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt)
+            if throttled and bucket.wait_time(tokens) > max_wait:
+                raise RateLimitExceeded(platform, bucket.endpoint, bucket.wait_time(tokens)) from e
+            bucket.count_retry()
+            limiter.sleep(delay)
+
+
+def limited(platform, endpoint, fn, credential="", **options):
+    """``fn`` wrapped with ``call``; keeps ``fn``'s attributes (e.g. tweepy's ``pagination_mode``)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return call(platform, endpoint, fn, *args, credential=credential, **options, **kwargs)
+    return wrapper
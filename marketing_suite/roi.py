@@ -0,0 +1,125 @@
+"""ROI figures and rollups of ad performance exports.
+
+Shared by the Ad Performance tab and the CLI.  ``rollup`` aggregates the raw
+rows once per grouping (campaign, period, or campaign × period) and adds
+ROI, ROAS and CPA columns computed on whole arrays.  The tab caches rollups
+per dataset hash, so browsing and filtering only touch the aggregated frames.
+"""
+import numpy as np
+import pandas as pd
+
+from marketing_suite.ingestion import DATE_COLUMNS
+
+METRIC_COLUMNS = ["Spend", "Revenue", "Conversions"]
+# Period names and their pandas frequencies; weeks start on Monday
+PERIODS = {"Day": "D", "Week": "W", "Month": "M"}
+# Campaign of rows whose Campaign cell is blank
+NO_CAMPAIGN = "(none)"
+
+
+def has_roi_columns(df):
+    return "Spend" in df.columns and "Revenue" in df.columns
+
+
+def _ratio(numerator, denominator):
+    """``numerator / denominator``, NaN where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator != 0)
+
+
+def roi_summary(df):
+    """Total spend and revenue of an ad export (or of a rollup), with ROI (%), ROAS and CPA."""
+    totals = {"Total Spend": float(df["Spend"].sum()), "Total Revenue": float(df["Revenue"].sum())}
+    totals["ROI (%)"] = float(_ratio(totals["Total Revenue"] - totals["Total Spend"], totals["Total Spend"]) * 100)
+    totals["ROAS"] = float(_ratio(totals["Total Revenue"], totals["Total Spend"]))
+    if "Conversions" in df.columns:
+        totals["CPA"] = float(_ratio(totals["Total Spend"], df["Conversions"].sum()))
+    return totals
+
+
+def with_ratios(frame):
+    """Add ROI (%), ROAS and, with conversions, CPA columns to a frame of summed metrics."""
+    frame["ROI (%)"] = _ratio(frame["Revenue"] - frame["Spend"], frame["Spend"]) * 100
+    frame["ROAS"] = _ratio(frame["Revenue"], frame["Spend"])
+    if "Conversions" in frame.columns:
+        frame["CPA"] = _ratio(frame["Spend"], frame["Conversions"])
+    return frame
+
+
+def date_column(df):
+    """The export's date column, if it has one that parsed as dates."""
+    for column in DATE_COLUMNS:
+        if column in df.columns and pd.api.types.is_datetime64_any_dtype(df[column]):
+            return column
+    return None
+
+
+def period_start(dates, period):
+    """Start of the day, week or month (``PERIODS`` values) each date falls in."""
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    if period == "D":
+        return dates.dt.floor("D")
+    return dates.dt.to_period(period).dt.start_time
+
+
+def rollup(df, campaign=True, period=None):
+    """Summed metrics and row counts per campaign and/or period, with ratio columns.
+
+    ``period`` is a ``PERIODS`` frequency and needs a date column.  Every row
+    is counted: blank campaigns are grouped as ``NO_CAMPAIGN`` and rows
+    without a date fall in a ``NaT`` period, so the rollup sums to the raw
+    totals.
+    """
+    keys = []
+    if campaign and "Campaign" in df.columns:
+        keys.append(_campaigns(df["Campaign"]))
+    if period is not None:
+        dates = date_column(df)
+        if dates is None:
+            raise ValueError("The dataset has no date column")
+        keys.append(period_start(df[dates], period).rename("Period"))
+    metrics = [column for column in METRIC_COLUMNS if column in df.columns]
+    if not keys:
+        totals = df[metrics].sum().to_frame().T.astype("float64")
+        totals.insert(0, "Rows", len(df))
+        return with_ratios(totals)
+    grouped = df[metrics].groupby(keys, observed=True, sort=True, dropna=False)
+    frame = grouped.sum().astype("float64")
+    frame.insert(0, "Rows", grouped.size())
+    return with_ratios(frame.reset_index())
+
+
+def _campaigns(values):
+    """Campaign names with blanks labelled ``NO_CAMPAIGN``."""
+    if not values.isna().any():
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype) and NO_CAMPAIGN not in values.cat.categories:
+        values = values.cat.add_categories([NO_CAMPAIGN])
+    return values.fillna(NO_CAMPAIGN)
+
+
+def campaign_totals(df):
+    """Spend, revenue (and conversions) summed per campaign, one row per campaign."""
+    return rollup(df, campaign=True)
+
+
+def filter_rollup(frame, campaign=None, start=None, end=None):
+    """Rows of a rollup whose campaign contains ``campaign`` and whose period is in [start, end]."""
+    mask = np.ones(len(frame), dtype=bool)
+    if campaign and "Campaign" in frame.columns:
+        values = frame["Campaign"]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match each category once instead of every row
+            hits = values.cat.categories.astype(str).str.contains(campaign, case=False, regex=False)
+            codes = values.cat.codes.to_numpy()
+            mask &= (codes >= 0) & np.asarray(hits)[codes]
+        else:
+            mask &= values.astype(str).str.contains(campaign, case=False, regex=False).to_numpy()
+    if "Period" in frame.columns:
+        if start is not None:
+            mask &= (frame["Period"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (frame["Period"] <= pd.Timestamp(end)).to_numpy()
+    return frame if mask.all() else frame[mask]
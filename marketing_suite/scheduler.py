@@ -0,0 +1,377 @@
+"""Durable post scheduler.
+
+Jobs live in SQLite so they survive restarts; only the ids and due times of
+pending jobs are kept in memory, in a heap ordered by due time, so finding
+the next job never scans the table.  A dispatcher thread pops due jobs and
+hands them to a worker pool, subject to per-platform concurrency and rate
+limits.  Failed jobs are retried with jittered exponential backoff (or
+after the wait a ``RateLimitExceeded`` reports) up to ``max_attempts``
+times.
+
+Publishers are callables ``publish(job) -> remote_id`` registered per
+(platform, account); a due job whose account has no publisher yet (e.g.
+right after a restart, before anyone has logged in again) waits until one is
+registered.  The clock is injectable and ``run_pending`` dispatches due jobs
+synchronously, so the scheduler can be driven by fake publishers and a fake
+clock.
+"""
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from marketing_suite.ratelimit import RateLimitExceeded, TokenBucket, backoff_delay
+
+DB_PATH = os.getenv("MARKETING_SCHEDULER_DB", os.path.join(".cache", "scheduler.sqlite3"))
+MEDIA_DIR = os.path.join(os.path.dirname(DB_PATH) or ".", "scheduled_media")
+
+MAX_ATTEMPTS = 5
+RETRY_BASE = 30.0
+RETRY_MAX = 3600.0
+
+PENDING, RUNNING, SENT, FAILED, CANCELLED = "pending", "running", "sent", "failed", "cancelled"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    account TEXT NOT NULL,
+    content TEXT NOT NULL,
+    media_path TEXT,
+    due_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    remote_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, due_at);
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Per-platform dispatch limits: concurrent publishes and publishes per minute."""
+    concurrency: int = 1
+    per_minute: float = 10.0
+
+
+PLATFORM_LIMITS = {
+    "Twitter": Limit(concurrency=2, per_minute=10),
+    "Facebook": Limit(concurrency=4, per_minute=30),
+    "Instagram": Limit(concurrency=1, per_minute=5),
+    "LinkedIn": Limit(concurrency=1, per_minute=5),
+}
+DEFAULT_LIMIT = Limit()
+
+
+@dataclass
+class Job:
+    id: int
+    platform: str
+    account: str
+    content: str
+    media_path: str
+    due_at: float
+    attempts: int
+
+
+class PublishError(Exception):
+    """Raised by a publisher; ``retryable=False`` fails the job immediately."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class Scheduler:
+    """SQLite-backed scheduler shared by every session in the process."""
+
+    def __init__(self, path=DB_PATH, clock=time.time, max_workers=8, limits=None,
+                 max_attempts=MAX_ATTEMPTS, retry_base=RETRY_BASE, retry_max=RETRY_MAX):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self.clock = clock
+        self.max_workers = max_workers
+        self.limits = dict(PLATFORM_LIMITS, **(limits or {}))
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._cond = threading.Condition()
+        self._heap = []
+        # job id -> (due_at, platform, account) for every pending job in the heap
+        self._pending = {}
+        self._parked = defaultdict(list)
+        self._publishers = {}
+        self._running = defaultdict(int)
+        self._buckets = {}
+        self._pool = None
+        self._thread = None
+        self._stopping = False
+        self._woken = False
+        self.media_dir = MEDIA_DIR if path == ":memory:" else os.path.join(os.path.dirname(path) or ".",
+                                                                          "scheduled_media")
+        self._recover()
+
+    def _execute_sql(self, query, params=()):
+        with self._db_lock, self._conn:
+            return self._conn.execute(query, params)
+
+    def _recover(self):
+        """Requeue jobs interrupted mid-publish and load every pending job into the heap."""
+        now = self.clock()
+        # A job left "running" may or may not have been published before the
+        # process died; publishing again is preferred to silently dropping it
+        self._execute_sql("UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                          (PENDING, now, RUNNING))
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id, due_at, platform, account FROM jobs WHERE status = ?", (PENDING,)
+            ).fetchall()
+        with self._cond:
+            for job_id, due_at, platform, account in rows:
+                self._push(job_id, due_at, platform, account)
+
+    def _push(self, job_id, due_at, platform, account):
+        self._pending[job_id] = (due_at, platform, account)
+        heapq.heappush(self._heap, (due_at, job_id))
+
+    def _wake(self):
+        """Wake the dispatcher; call with ``self._cond`` held."""
+        self._woken = True
+        self._cond.notify()
+
+    def _limit(self, platform):
+        return self.limits.get(platform, DEFAULT_LIMIT)
+
+    def _bucket(self, platform):
+        if platform not in self._buckets:
+            limit = self._limit(platform)
+            self._buckets[platform] = TokenBucket(limit.per_minute / 60.0, max(1, limit.concurrency),
+                                                  clock=self.clock, platform=platform, endpoint="schedule")
+        return self._buckets[platform]
+
+    # Public API
+
+    def schedule(self, platform, account, content, due_at, media=None, media_name=None):
+        """Queue a post; ``due_at`` is a datetime or epoch seconds. Returns the job id.
+
+        ``media`` is optional image bytes, stored next to the database so the
+        job stays publishable after a restart.
+        """
+        if not isinstance(due_at, (int, float)):
+            due_at = pd.Timestamp(due_at).timestamp()
+        now = self.clock()
+        media_path = None
+        with self._db_lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (platform, account, content, due_at, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (platform, account, content, float(due_at), PENDING, now, now),
+            )
+            job_id = cursor.lastrowid
+            if media is not None:
+                os.makedirs(self.media_dir, exist_ok=True)
+                extension = os.path.splitext(media_name or "")[1] or ".bin"
+                media_path = os.path.join(self.media_dir, f"{job_id}{extension}")
+                with open(media_path, "wb") as f:
+                    f.write(media)
+                self._conn.execute("UPDATE jobs SET media_path = ? WHERE id = ?", (media_path, job_id))
+        with self._cond:
+            self._push(job_id, float(due_at), platform, account)
+            self._wake()
+        return job_id
+
+    def cancel(self, job_id):
+        """Cancel a pending job. Returns False if it already ran or is running."""
+        cursor = self._execute_sql("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                                   (CANCELLED, self.clock(), job_id, PENDING))
+        with self._cond:
+            # The heap entry is dropped lazily when it comes up
+            self._pending.pop(job_id, None)
+        return cursor.rowcount > 0
+
+    def register(self, platform, account, publish):
+        """Route jobs for ``(platform, account)`` to ``publish(job) -> remote_id``."""
+        with self._cond:
+            self._publishers[(platform, account)] = publish
+            for job_id in self._parked.pop((platform, account), []):
+                if job_id in self._pending:
+                    due_at, _, _ = self._pending[job_id]
+                    heapq.heappush(self._heap, (due_at, job_id))
+            self._wake()
+
+    def jobs(self, status=None, limit=200):
+        """Most recent jobs (by due time) as a DataFrame."""
+        query = ("SELECT id, platform, account, content, due_at, status, attempts, last_error, remote_id"
+                 " FROM jobs")
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY due_at DESC LIMIT ?"
+        with self._db_lock:
+            rows = self._conn.execute(query, params + (int(limit),)).fetchall()
+        df = pd.DataFrame(rows, columns=["id", "platform", "account", "content", "due_at", "status",
+                                         "attempts", "last_error", "remote_id"])
+        df["due_at"] = pd.to_datetime(df["due_at"], unit="s", utc=True)
+        return df
+
+    def counts(self):
+        with self._db_lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    # Dispatch
+
+    def _take_due(self):
+        """Pop every job that may start now; returns ``(ready, wait_seconds)``.
+
+        Jobs held back by a concurrency or rate limit are pushed back with the
+        time they can next be tried (in memory only; their stored due time is
+        unchanged).  ``wait_seconds`` is how long until the next heap entry.
+        """
+        ready = []
+        deferred = []
+        now = self.clock()
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, job_id = heapq.heappop(self._heap)
+                entry = self._pending.get(job_id)
+                if entry is None:
+                    continue  # cancelled
+                _, platform, account = entry
+                publish = self._publishers.get((platform, account))
+                if publish is None:
+                    self._parked[(platform, account)].append(job_id)
+                    continue
+                if self._running[platform] >= self._limit(platform).concurrency:
+                    # Retried when a running job of this platform finishes
+                    self._parked[("running", platform)].append(job_id)
+                    continue
+                bucket = self._bucket(platform)
+                if not bucket.try_acquire():
+                    deferred.append((now + bucket.wait_time(), job_id))
+                    continue
+                self._running[platform] += 1
+                del self._pending[job_id]
+                ready.append((job_id, platform, publish))
+            for item in deferred:
+                heapq.heappush(self._heap, item)
+            wait_seconds = self._heap[0][0] - now if self._heap else None
+        return ready, wait_seconds
+
+    def _load(self, job_id):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT id, platform, account, content, media_path, due_at, attempts FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return Job(*row)
+
+    def _run(self, job_id, platform, publish):
+        """Publish one job and record the outcome."""
+        try:
+            job = self._load(job_id)
+            attempts = job.attempts + 1
+            started = self._execute_sql(
+                "UPDATE jobs SET status = ?, attempts = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, attempts, self.clock(), job_id, PENDING))
+            if started.rowcount == 0:
+                return  # cancelled after the dispatcher took it
+            try:
+                remote_id = publish(job)
+            except Exception as e:
+                retryable = getattr(e, "retryable", True)
+                now = self.clock()
+                if retryable and attempts < self.max_attempts:
+                    delay = backoff_delay(attempts - 1, base=self.retry_base, cap=self.retry_max)
+                    if isinstance(e, RateLimitExceeded):
+                        delay = max(delay, e.retry_after)
+                    due_at = now + delay
+                    self._execute_sql(
+                        "UPDATE jobs SET status = ?, due_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                        (PENDING, due_at, str(e), now, job_id))
+                    with self._cond:
+                        self._push(job_id, due_at, job.platform, job.account)
+                else:
+                    self._execute_sql("UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                                      (FAILED, str(e), now, job_id))
+            else:
+                self._execute_sql(
+                    "UPDATE jobs SET status = ?, remote_id = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                    (SENT, None if remote_id is None else str(remote_id), self.clock(), job_id))
+        finally:
+            with self._cond:
+                self._running[platform] -= 1
+                for waiting in self._parked.pop(("running", platform), []):
+                    if waiting in self._pending:
+                        heapq.heappush(self._heap, (self._pending[waiting][0], waiting))
+                self._wake()
+
+    def run_pending(self):
+        """Publish every job that is due now in the calling thread; returns how many ran.
+
+        Meant for tests and scripts; ``start`` runs the same dispatch in the
+        background.
+        """
+        count = 0
+        while True:
+            ready, _ = self._take_due()
+            if not ready:
+                return count
+            for job_id, platform, publish in ready:
+                self._run(job_id, platform, publish)
+            count += len(ready)
+
+    def start(self):
+        """Start the dispatcher thread and worker pool (idempotent)."""
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._stopping = False
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="publisher")
+            self._thread = threading.Thread(target=self._dispatch_loop, name="scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        with self._cond:
+            self._stopping = True
+            self._wake()
+            thread, pool = self._thread, self._pool
+        if thread is None:
+            return
+        # The dispatcher may be submitting jobs it just took; the pool stays up until it has returned
+        thread.join()
+        pool.shutdown(wait=wait)
+        with self._cond:
+            self._thread = self._pool = None
+
+    def _dispatch_loop(self):
+        while True:
+            ready, wait_seconds = self._take_due()
+            for job_id, platform, publish in ready:
+                self._pool.submit(self._run, job_id, platform, publish)
+            with self._cond:
+                if self._stopping:
+                    return
+                # Woken early by schedule, register or a finished job; a wake-up
+                # that arrived while jobs were being taken is not lost
+                if not ready and not self._woken:
+                    self._cond.wait(timeout=wait_seconds)
+                self._woken = False
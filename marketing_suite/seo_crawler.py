@@ -0,0 +1,364 @@
+"""Concurrent same-site crawler used by the SEO Analyzer.
+
+Pages are fetched on a bounded thread pool that shares one pooled keep-alive
+``requests.Session``. Each host has its own concurrency cap and optional delay,
+robots.txt is honoured, and the crawl stops at a depth and page budget.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from urllib import robotparser
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from marketing_suite.timing import instrument_session, propagate
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Raised for documents the parser can't make a tree of (e.g. an empty body)
+PARSE_ERRORS = (ValueError,) if lxml is None else (ValueError, lxml.etree.LxmlError)
+
+USER_AGENT = "MarketingAnalyticsSuite-SEO/2.0"
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+# Responses that mean a page is gone, so it leaves the site index
+GONE_STATUSES = (404, 410)
+# Without lxml, only the tags the SEO summary looks at become soup objects
+SEO_TAGS = ["title", "meta", "h1", "h2", "h3", "a"]
+PAGE_COLUMNS = ["URL", "Status", "Response (ms)", "Title", "Meta Description", "H1", "Internal Links",
+                "External Links", "Error"]
+
+
+@dataclass
+class PageResult:
+    url: str
+    depth: int
+    # Where the request ended up after redirects
+    final_url: str = ""
+    status: int = 0
+    elapsed_ms: float = 0.0
+    size_bytes: int = 0
+    title: str = ""
+    meta_description: str = ""
+    meta_tags: dict = field(default_factory=dict)
+    headings: dict = field(default_factory=dict)
+    internal_links: list = field(default_factory=list)
+    external_links: list = field(default_factory=list)
+    error: str = ""
+    # True if the site index took the page, False if it was unchanged since the last crawl
+    indexed: bool = None
+
+
+def make_session(pool_size=32):
+    """A session whose connection pool is large enough for the fetch pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return instrument_session(session)
+
+
+def normalize_url(url):
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    path = parsed.path or "/"
+    return parsed._replace(path=path, netloc=parsed.netloc.lower()).geturl()
+
+
+def _add_link(result, href, base_url, host):
+    href = href.strip()
+    if href.startswith(("mailto:", "tel:", "javascript:")):
+        return
+    link = normalize_url(urljoin(base_url, href))
+    parsed = urlparse(link)
+    if parsed.scheme not in ("http", "https"):
+        return
+    if parsed.netloc == host:
+        result.internal_links.append(link)
+    else:
+        result.external_links.append(link)
+
+
+def _parse_with_lxml(result, html, base_url):
+    root = lxml.html.fromstring(html)
+    title = root.findtext(".//title")
+    if title:
+        result.title = title.strip()
+    for tag in root.iter("meta"):
+        key = tag.get("name") or tag.get("property") or tag.get("http-equiv")
+        if key:
+            result.meta_tags[key.lower()] = tag.get("content", "")
+    for heading in root.iter("h1", "h2", "h3"):
+        text = " ".join(heading.text_content().split())
+        result.headings.setdefault(heading.tag, []).append(text)
+    host = urlparse(base_url).netloc.lower()
+    for anchor in root.iter("a"):
+        href = anchor.get("href")
+        if href:
+            _add_link(result, href, base_url, host)
+
+
+def _parse_with_soup(result, html, base_url):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(SEO_TAGS))
+    if soup.title and soup.title.string:
+        result.title = soup.title.string.strip()
+    for tag in soup.find_all("meta"):
+        key = tag.get("name") or tag.get("property") or tag.get("http-equiv")
+        if key:
+            result.meta_tags[key.lower()] = tag.get("content", "")
+    for heading in soup.find_all(["h1", "h2", "h3"]):
+        result.headings.setdefault(heading.name, []).append(heading.get_text(" ", strip=True))
+    host = urlparse(base_url).netloc.lower()
+    for anchor in soup.find_all("a", href=True):
+        _add_link(result, anchor["href"], base_url, host)
+
+
+def page_text(html):
+    """Visible text of an HTML document: no scripts, styles or markup."""
+    if lxml is not None:
+        try:
+            root = lxml.html.fromstring(html)
+        except PARSE_ERRORS:
+            # Blank pages and pages holding only a comment have no text
+            return ""
+        for tag in list(root.iter("script", "style", "noscript", "template")):
+            tag.drop_tree()
+        return " ".join(" ".join(root.itertext()).split())
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return soup.get_text(" ", strip=True)
+
+
+def parse_page(result, html, base_url):
+    """Fill ``result`` with the SEO-relevant parts of an HTML document."""
+    if lxml is not None:
+        _parse_with_lxml(result, html, base_url)
+    else:
+        _parse_with_soup(result, html, base_url)
+    result.meta_description = result.meta_tags.get("description", "")
+    return result
+
+
+class SiteCrawler:
+    """Breadth-first crawler restricted to the start URL's host.
+
+    ``session`` can be any ``requests.Session``-compatible object, which keeps
+    the crawler easy to point at a local test server.  With an ``index`` (a
+    ``SiteIndex``), every HTML page's text is also indexed as it arrives.
+    """
+
+    def __init__(self, max_pages=200, max_depth=3, max_workers=16, per_host_limit=8,
+                 per_host_delay=0.0, timeout=10, respect_robots=True, session=None, index=None):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.respect_robots = respect_robots
+        self.session = session or make_session(pool_size=max_workers)
+        self.index = index
+        self._host_slots = {}
+        self._host_last = {}
+        self._robots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _wait_politely(self, host):
+        if not self.per_host_delay:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._host_last.get(host, 0.0) + self.per_host_delay)
+            self._host_last[host] = start
+        if start > now:
+            time.sleep(start - now)
+
+    def _robots_for(self, url):
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            if origin in self._robots:
+                return self._robots[origin]
+        parser = robotparser.RobotFileParser()
+        try:
+            response = self.session.get(f"{origin}/robots.txt", timeout=self.timeout)
+            if response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException:
+            parser.allow_all = True
+        with self._lock:
+            self._robots[origin] = parser
+        return parser
+
+    def allowed(self, url):
+        if not self.respect_robots:
+            return True
+        return self._robots_for(url).can_fetch(USER_AGENT, url)
+
+    def fetch(self, url, depth):
+        result = PageResult(url=url, depth=depth)
+        host = urlparse(url).netloc
+        with self._slot(host):
+            self._wait_politely(host)
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                result.error = str(e)
+                return result
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+        result.status = response.status_code
+        result.final_url = normalize_url(response.url)
+        result.size_bytes = len(response.content)
+        content_type = response.headers.get("Content-Type", "")
+        if response.ok and content_type.startswith(HTML_TYPES) and response.content:
+            try:
+                parse_page(result, response.content, response.url)
+            except PARSE_ERRORS as e:
+                result.error = f"Unparseable HTML: {e}"
+                return result
+            if self.index is not None:
+                result.indexed = self.index.add_page(urlparse(result.final_url).netloc, result.final_url,
+                                                     response.content, etag=response.headers.get("ETag"))
+        elif response.status_code in GONE_STATUSES and self.index is not None:
+            self.index.remove_page(urlparse(result.final_url).netloc, result.final_url)
+        return result
+
+    def crawl(self, start_url):
+        """Crawl from ``start_url`` and return a list of ``PageResult``."""
+        start_url = normalize_url(start_url)
+        host = urlparse(start_url).netloc
+        seen = {start_url}
+        frontier = deque([(start_url, 0)])
+        results = []
+        running = set()
+        # Whether a link was left unfollowed at the depth limit
+        cut_off = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while frontier or running:
+                while frontier and len(running) < self.max_workers and len(results) + len(running) < self.max_pages:
+                    url, depth = frontier.popleft()
+                    if not self.allowed(url):
+                        continue
+                    running.add(pool.submit(propagate(self.fetch), url, depth))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = future.result()
+                    results.append(page)
+                    if page.url == start_url and page.final_url:
+                        # A redirected start URL (bare domain to www, ...) moves the whole crawl to its host
+                        host = urlparse(page.final_url).netloc
+                        seen.add(page.final_url)
+                    if page.depth >= self.max_depth:
+                        cut_off = cut_off or any(link not in seen for link in page.internal_links)
+                        continue
+                    for link in page.internal_links:
+                        if link not in seen and urlparse(link).netloc == host:
+                            seen.add(link)
+                            frontier.append((link, page.depth + 1))
+        failed = any(not page.status or page.status >= 500 for page in results)
+        if self.index is not None and not (frontier or cut_off or failed):
+            # Every reachable page was fetched, so indexed pages the crawl didn't find are gone
+            self.index.prune(host, {page.final_url or page.url for page in results
+                                    if page.status not in GONE_STATUSES})
+        return results
+
+
+def summarize(pages):
+    """Site-level SEO metrics derived from crawled pages."""
+    html_pages = [p for p in pages if p.status == 200 and not p.error]
+    # Pages the site index skipped because they hadn't changed since the last crawl
+    unchanged = sum(1 for p in pages if p.indexed is False)
+    if not html_pages:
+        return {"SEO Score": 0, "Pages Crawled": len(pages), "Pages Unchanged": unchanged, "Meta Tags": 0,
+                "Internal Links": 0, "Avg Response (ms)": 0.0, "Issues": ["No pages could be fetched"]}
+
+    n = len(html_pages)
+    with_title = sum(1 for p in html_pages if p.title)
+    with_description = sum(1 for p in html_pages if p.meta_description)
+    with_h1 = sum(1 for p in html_pages if p.headings.get("h1"))
+    single_h1 = sum(1 for p in html_pages if len(p.headings.get("h1", [])) == 1)
+    titles = [p.title for p in html_pages if p.title]
+    unique_titles = len(set(titles)) / len(titles) if titles else 0
+    elapsed = sorted(p.elapsed_ms for p in html_pages)
+    median_ms = elapsed[len(elapsed) // 2]
+    broken = sum(1 for p in pages if p.status >= 400 or p.error)
+
+    # Response time scores full marks up to 200 ms and nothing past 2 s
+    speed = max(0.0, min(1.0, (2000 - median_ms) / 1800))
+    score = (25 * with_title / n + 20 * with_description / n + 15 * with_h1 / n
+             + 10 * single_h1 / n + 10 * unique_titles + 10 * speed
+             + 10 * (1 - broken / len(pages)))
+
+    issues = []
+    if with_title < n:
+        issues.append(f"{n - with_title} page(s) missing a <title>")
+    if with_description < n:
+        issues.append(f"{n - with_description} page(s) missing a meta description")
+    if with_h1 < n:
+        issues.append(f"{n - with_h1} page(s) without an <h1>")
+    if unique_titles < 1:
+        issues.append("Duplicate page titles found")
+    if broken:
+        issues.append(f"{broken} broken or unreachable page(s)")
+    if median_ms > 800:
+        issues.append(f"Slow median response time ({median_ms:.0f} ms)")
+
+    return {
+        "SEO Score": int(round(score)),
+        "Pages Crawled": len(pages),
+        "Pages Unchanged": unchanged,
+        "Meta Tags": sum(len(p.meta_tags) for p in html_pages),
+        "Internal Links": sum(len(p.internal_links) for p in html_pages),
+        "Avg Response (ms)": sum(elapsed) / n,
+        "Issues": issues,
+    }
+
+
+def page_table(pages):
+    """One row per crawled page, as shown in the SEO Analyzer."""
+    return pd.DataFrame([{
+        "URL": p.url,
+        "Status": p.status,
+        "Response (ms)": round(p.elapsed_ms, 1),
+        "Title": p.title,
+        "Meta Description": p.meta_description,
+        "H1": " | ".join(p.headings.get("h1", [])),
+        "Internal Links": len(p.internal_links),
+        "External Links": len(p.external_links),
+        "Error": p.error
+    } for p in pages], columns=PAGE_COLUMNS)
+
+
+def analyze_site(url, max_pages=200, max_depth=3, **options):
+    """Crawl a site and return ``(summarize(pages), page_table(pages))``.
+
+    ``options`` are passed on to ``SiteCrawler``.
+    """
+    pages = SiteCrawler(max_pages=max_pages, max_depth=max_depth, **options).crawl(url)
+    return summarize(pages), page_table(pages)
@@ -0,0 +1,260 @@
+"""Incremental inverted index of keyword counts over crawled pages.
+
+The SEO Analyzer's crawler hands every HTML page to ``SiteIndex.add_page``,
+which stores the page's keyword counts in SQLite:
+
+* ``postings``: (term, page, count), keyed by term so that "which pages use
+  this keyword" reads one index range, with a second index by page;
+* ``site_terms``: each site's total count and page count per term, kept up
+  to date as pages change, so site-wide top terms never scan the postings.
+
+Terms are interned as integers.  A recrawl only re-indexes pages whose
+``ETag`` or text hash changed, and a crawl that reaches every page of a
+site prunes the pages it no longer finds.  Keywords are counted as in the
+Keyword Density Analyzer: lowercased words of at least three letters,
+without stop words, and density is a term's count over the page's (or
+site's) words.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from marketing_suite.keywords import BREAKS, english_stop_words, tokenize
+from marketing_suite.seo_crawler import page_text
+from marketing_suite.timing import span
+
+DB_PATH = os.getenv("MARKETING_SITE_INDEX_DB", os.path.join(".cache", "site_index.sqlite3"))
+MIN_LENGTH = 3
+# Keyword density above which a page is usually considered stuffed
+OVERUSE_DENSITY = 3.0
+# Parameters per IN (...) lookup, well under SQLite's limit
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page_id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT,
+    content_hash TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (site, url)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    page_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (term_id, page_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_page ON postings (page_id, term_id, count);
+CREATE TABLE IF NOT EXISTS site_terms (
+    site TEXT NOT NULL,
+    term_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    PRIMARY KEY (site, term_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS site_terms_by_count ON site_terms (site, count DESC);
+"""
+
+
+def term_counts(text, stop_words=None, min_length=MIN_LENGTH):
+    """``(Counter of keywords, number of words)`` of a text."""
+    if stop_words is None:
+        stop_words = english_stop_words()
+    words = [token for token in tokenize(text) if token not in BREAKS]
+    return Counter(word for word in words if len(word) >= min_length and word not in stop_words), len(words)
+
+
+def _placeholders(values):
+    return ", ".join("?" * len(values))
+
+
+class SiteIndex:
+    """Thread-safe SQLite keyword index shared by every session in the process."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._term_ids = {}
+        self.indexed = 0
+        self.unchanged = 0
+
+    def _intern(self, terms):
+        """Integer ids of ``terms``, adding new ones; call with the lock held."""
+        missing = [term for term in terms if term not in self._term_ids]
+        for i in range(0, len(missing), LOOKUP_BATCH):
+            batch = missing[i:i + LOOKUP_BATCH]
+            self._conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", [(term,) for term in batch])
+            self._term_ids.update(self._conn.execute(
+                f"SELECT term, term_id FROM terms WHERE term IN ({_placeholders(batch)})", batch).fetchall())
+        return [self._term_ids[term] for term in terms]
+
+    def add_page(self, site, url, html, etag=None):
+        """Index a fetched page unless its ETag or text is unchanged; returns whether it was indexed."""
+        # A matching ETag skips parsing; anything else is decided again below, inside the write
+        # transaction, because another crawl of the same site may index the page in the meantime
+        row = self._page(site, url)
+        if row is not None and etag and row[1] == etag:
+            with self._lock:
+                self.unchanged += 1
+            return False
+        with span("index.parse"):
+            text = page_text(html)
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        counts, words = term_counts(text)
+        with span("index.write"), self._lock, self._conn:
+            row = self._page(site, url, locked=True)
+            if row is not None and row[2] == digest:
+                # Same text under a new ETag: remember the ETag so the next check is cheaper
+                if etag and row[1] != etag:
+                    self._conn.execute("UPDATE pages SET etag = ? WHERE page_id = ?", (etag, row[0]))
+                self.unchanged += 1
+                return False
+            if row is not None:
+                page_id = row[0]
+                self._remove_postings(site, page_id)
+                self._conn.execute(
+                    "UPDATE pages SET etag = ?, content_hash = ?, words = ?, indexed_at = ? WHERE page_id = ?",
+                    (etag, digest, words, time.time(), page_id))
+            else:
+                page_id = self._conn.execute(
+                    "INSERT INTO pages (site, url, etag, content_hash, words, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (site, url, etag, digest, words, time.time())).lastrowid
+            terms = list(counts)
+            postings = [(term_id, page_id, counts[term]) for term_id, term in zip(self._intern(terms), terms)]
+            self._conn.executemany("INSERT INTO postings (term_id, page_id, count) VALUES (?, ?, ?)", postings)
+            self._conn.executemany(
+                "INSERT INTO site_terms (site, term_id, count, pages) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (site, term_id) DO UPDATE SET count = count + excluded.count, pages = pages + 1",
+                [(site, term_id, count) for term_id, _, count in postings])
+            self.indexed += 1
+        return True
+
+    def _page(self, site, url, locked=False):
+        """``(page_id, etag, content_hash)`` of an indexed page, or None; ``locked`` if the lock is held."""
+        sql = "SELECT page_id, etag, content_hash FROM pages WHERE site = ? AND url = ?"
+        if locked:
+            return self._conn.execute(sql, (site, url)).fetchone()
+        with self._lock:
+            return self._conn.execute(sql, (site, url)).fetchone()
+
+    def _remove_postings(self, site, page_id):
+        """Take a page's postings out of the index and its site's totals; call with the lock held."""
+        self._conn.execute(
+            "UPDATE site_terms SET count = site_terms.count - p.count, pages = site_terms.pages - 1 "
+            "FROM postings AS p WHERE p.page_id = ? AND site_terms.site = ? AND site_terms.term_id = p.term_id",
+            (page_id, site))
+        self._conn.execute("DELETE FROM site_terms WHERE site = ? AND pages <= 0", (site,))
+        self._conn.execute("DELETE FROM postings WHERE page_id = ?", (page_id,))
+
+    def remove_page(self, site, url):
+        with self._lock, self._conn:
+            return self._remove_page(site, url)
+
+    def _remove_page(self, site, url):
+        """Drop a page and its postings; call with the lock held."""
+        row = self._page(site, url, locked=True)
+        if row is None:
+            return False
+        self._remove_postings(site, row[0])
+        self._conn.execute("DELETE FROM pages WHERE page_id = ?", (row[0],))
+        return True
+
+    def prune(self, site, urls):
+        """Remove the pages of ``site`` that are not in ``urls`` (the pages a full crawl found); returns how many."""
+        keep = set(urls)
+        with self._lock, self._conn:
+            gone = [url for url, in self._conn.execute("SELECT url FROM pages WHERE site = ?", (site,))
+                    if url not in keep]
+            for url in gone:
+                self._remove_page(site, url)
+        return len(gone)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def sites(self):
+        return [site for site, in self._query("SELECT DISTINCT site FROM pages ORDER BY site")]
+
+    def urls(self, site, limit=None):
+        """Indexed pages of ``site``, wordiest first."""
+        sql = "SELECT url FROM pages WHERE site = ? ORDER BY words DESC"
+        params = (site,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        return [url for url, in self._query(sql, params)]
+
+    def top_terms(self, site, k=20):
+        """The site's ``k`` most frequent keywords, with their pages and site-wide density."""
+        rows = self._query(
+            "SELECT t.term, s.count, s.pages FROM site_terms AS s JOIN terms AS t USING (term_id) "
+            "WHERE s.site = ? ORDER BY s.count DESC LIMIT ?", (site, int(k)))
+        total = self._query("SELECT COALESCE(SUM(words), 0) FROM pages WHERE site = ?", (site,))[0][0]
+        df = pd.DataFrame(rows, columns=["Keyword", "Count", "Pages"])
+        df["Density (%)"] = df["Count"] / total * 100 if total else 0.0
+        return df
+
+    def overuse(self, site, term, threshold=OVERUSE_DENSITY, limit=None):
+        """Pages of ``site`` using ``term``, densest first, with whether each is over ``threshold`` %."""
+        sql = ("SELECT g.url, p.count, g.words, 100.0 * p.count / g.words AS density "
+               "FROM postings AS p JOIN pages AS g USING (page_id) "
+               "WHERE p.term_id = (SELECT term_id FROM terms WHERE term = ?) AND g.site = ? AND g.words > 0 "
+               "ORDER BY density DESC")
+        params = (term.strip().lower(), site)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        df = pd.DataFrame(self._query(sql, params), columns=["URL", "Count", "Words", "Density (%)"])
+        df["Over-used"] = df["Density (%)"] > threshold
+        return df
+
+    def page_terms(self, site, url, k=20):
+        """A page's ``k`` most frequent keywords and their density on the page."""
+        rows = self._query(
+            "SELECT t.term, p.count, 100.0 * p.count / g.words FROM pages AS g "
+            "JOIN postings AS p USING (page_id) JOIN terms AS t USING (term_id) "
+            "WHERE g.site = ? AND g.url = ? AND g.words > 0 ORDER BY p.count DESC LIMIT ?", (site, url, int(k)))
+        return pd.DataFrame(rows, columns=["Keyword", "Count", "Density (%)"])
+
+    def compare(self, site, urls, terms=None, k=10):
+        """Density (%) of ``terms`` (default: the site's top ``k``) on each of ``urls``, one row per page."""
+        if terms is None:
+            terms = self.top_terms(site, k)["Keyword"].tolist()
+        terms = [term.strip().lower() for term in terms]
+        urls = list(urls)
+        if not terms or not urls:
+            return pd.DataFrame(index=pd.Index(urls, name="URL"), columns=terms, dtype=float)
+        rows = self._query(
+            f"SELECT g.url, t.term, 100.0 * p.count / g.words FROM pages AS g "
+            f"JOIN postings AS p USING (page_id) JOIN terms AS t USING (term_id) "
+            f"WHERE g.site = ? AND g.words > 0 AND g.url IN ({_placeholders(urls)}) "
+            f"AND t.term IN ({_placeholders(terms)})", (site, *urls, *terms))
+        densities = pd.DataFrame(rows, columns=["URL", "Keyword", "Density (%)"])
+        table = densities.pivot(index="URL", columns="Keyword", values="Density (%)")
+        return table.reindex(index=pd.Index(urls, name="URL"), columns=terms).fillna(0.0)
+
+    def metrics(self):
+        with self._lock:
+            pages, terms, postings = (self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                                      for table in ("pages", "terms", "postings"))
+        return {"Pages": pages, "Terms": terms, "Postings": postings, "Indexed": self.indexed,
+                "Unchanged": self.unchanged}
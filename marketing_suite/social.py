@@ -0,0 +1,108 @@
+"""Cross-platform engagement data for the Social Media Dashboard.
+
+``fetch_all`` runs several platform fetches in parallel and ``normalize``
+maps each platform's rows onto one long-format engagement schema.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from marketing_suite.timing import propagate, span
+
+PLATFORM_TIMEOUT = 60
+
+UNIFIED_COLUMNS = ["platform", "account", "post_id", "timestamp", "views", "likes", "comments", "shares"]
+# Dashboard column feeding each unified metric; platforms that don't report a
+# metric leave it missing rather than zero
+METRIC_COLUMNS = {
+    "Twitter": {"likes": "Likes", "comments": "Replies", "shares": "Retweets"},
+    "Instagram": {"likes": "Likes", "comments": "Comments"},
+    "Facebook": {"views": "Impressions", "shares": "Shares"},
+    "LinkedIn": {"likes": "Likes", "comments": "Comments", "shares": "Shares"},
+    "YouTube": {"views": "Views", "likes": "Likes", "comments": "Comments"},
+    "TikTok": {"views": "Views", "likes": "Likes", "comments": "Comments", "shares": "Shares"},
+}
+
+
+def normalize(platform, account, df):
+    """Map one platform's dashboard frame onto the unified engagement schema.
+
+    ``df`` needs a ``post_id`` column (see ``PostStore.load(include_ids=True)``).
+    Metrics are float32 so that unreported ones can stay NaN.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=UNIFIED_COLUMNS)
+    unified = pd.DataFrame({
+        "post_id": df["post_id"].astype("string"),
+        "timestamp": pd.to_datetime(df["Date"], errors="coerce", utc=True, format="ISO8601"),
+    })
+    mapping = METRIC_COLUMNS.get(platform, {})
+    for metric in ("views", "likes", "comments", "shares"):
+        column = mapping.get(metric)
+        if column in df.columns:
+            unified[metric] = pd.to_numeric(df[column], errors="coerce").astype("float32")
+        else:
+            unified[metric] = np.float32("nan")
+    unified.insert(0, "account", account)
+    unified.insert(0, "platform", platform)
+    return unified[UNIFIED_COLUMNS]
+
+
+def combine(frames):
+    """Concatenate normalized frames with categorical platform/account columns."""
+    if not frames:
+        unified = pd.DataFrame({column: pd.Series(dtype="float32") for column in UNIFIED_COLUMNS})
+    else:
+        unified = pd.concat(frames, ignore_index=True)
+    unified["platform"] = unified["platform"].astype("category")
+    unified["account"] = unified["account"].astype("category")
+    unified["post_id"] = unified["post_id"].astype("string")
+    unified["timestamp"] = pd.to_datetime(unified["timestamp"], utc=True)
+    return unified.sort_values("timestamp", ascending=False, ignore_index=True)
+
+
+def fetch_all(fetchers, timeouts=None, default_timeout=PLATFORM_TIMEOUT):
+    """Run platform fetchers in parallel and merge their results.
+
+    ``fetchers`` maps a platform name to a callable returning
+    ``(account, frame)``, where ``frame`` has a ``post_id`` column. Each
+    platform gets its own timeout measured from the moment all fetches start,
+    so the total wait is bounded by the slowest platform rather than the sum.
+    Returns ``(unified_frame, errors)`` where ``errors`` maps failed or timed
+    out platforms to a message.
+    """
+    timeouts = timeouts or {}
+    errors = {}
+    frames = []
+    if not fetchers:
+        return combine(frames), errors
+
+    pool = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="social-fetch")
+    start = time.monotonic()
+    pending = {pool.submit(propagate(fetch)): platform for platform, fetch in fetchers.items()}
+    deadlines = {platform: start + timeouts.get(platform, default_timeout) for platform in fetchers}
+    try:
+        while pending:
+            next_deadline = min(deadlines[platform] for platform in pending.values())
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                platform = pending.pop(future)
+                try:
+                    account, df = future.result()
+                    with span("social.normalize", platform=platform):
+                        frames.append(normalize(platform, account, df))
+                except Exception as e:
+                    errors[platform] = str(e)
+            now = time.monotonic()
+            for future, platform in list(pending.items()):
+                if now >= deadlines[platform]:
+                    pending.pop(future)
+                    future.cancel()
+                    errors[platform] = f"Timed out after {timeouts.get(platform, default_timeout)} s"
+    finally:
+        # Timed-out fetches are left to finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+    return combine(frames), errors
@@ -0,0 +1,272 @@
+"""Per-campaign spend-response curves and budget allocation for ad data.
+
+Each campaign's outcome (conversions or revenue per row, usually per day) is
+modelled as a saturating curve ``a * (1 - exp(-spend / b))``: ``a`` is the
+ceiling the campaign approaches and ``b`` the spend scale at which returns
+start to diminish.  All campaigns are fitted together with ``np.bincount``
+over a shared grid of ``b`` values (``a`` has a closed form for a fixed
+``b``), so thousands of campaigns fit in a handful of array passes.
+
+``allocate`` splits a total budget so every funded campaign ends up at the
+same marginal return, and ``bootstrap`` refits on Poisson-resampled rows in
+a process pool to put confidence intervals on the fitted curves and on the
+outcome predicted for an allocation.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Candidate values of b, as multiples of each campaign's mean spend
+B_MULTIPLIERS = np.geomspace(0.05, 50.0, 60)
+BOOTSTRAP_SAMPLES = 200
+# Grid points either side of the full-data fit that bootstrap replicates search
+BOOTSTRAP_RADIUS = 4
+# Below this many rows x replicates a process pool costs more than it saves
+PARALLEL_MIN_WORK = 2_000_000
+
+
+def prepare(df, target, spend_column="Spend", campaign_column="Campaign"):
+    """Extract the arrays the fit needs from an ad performance frame.
+
+    Rows with a missing or negative spend or target are dropped.  Without a
+    campaign column every row belongs to a single ``"All"`` campaign.
+    """
+    spend = pd.to_numeric(df[spend_column], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+    outcome = pd.to_numeric(df[target], errors="coerce").to_numpy(np.float64, na_value=np.nan)
+    valid = np.isfinite(spend) & np.isfinite(outcome) & (spend >= 0) & (outcome >= 0)
+    if campaign_column in df.columns:
+        codes, campaigns = pd.factorize(df[campaign_column].astype("string")[valid], sort=True)
+        campaigns = pd.Index(campaigns.astype(str), name="Campaign")
+        valid_codes = codes >= 0
+    else:
+        codes = np.zeros(int(valid.sum()), dtype=np.intp)
+        campaigns = pd.Index(["All"], name="Campaign")
+        valid_codes = np.ones(len(codes), dtype=bool)
+    return {
+        "codes": codes[valid_codes],
+        "spend": spend[valid][valid_codes],
+        "outcome": outcome[valid][valid_codes],
+        "campaigns": campaigns,
+    }
+
+
+def _scales(codes, spend, n_campaigns):
+    """Mean spend per campaign, used to put every campaign's b grid on its own scale."""
+    counts = np.bincount(codes, minlength=n_campaigns)
+    totals = np.bincount(codes, weights=spend, minlength=n_campaigns)
+    scale = np.divide(totals, counts, out=np.zeros(n_campaigns), where=counts > 0)
+    return np.where(scale > 0, scale, 1.0)
+
+
+def _columns(codes, relative, outcome, multipliers):
+    """Yield ``(x * y, x * x)`` per candidate b for every row.
+
+    ``multipliers`` is either one shared grid or an array of shape
+    (candidates, campaigns) giving every campaign its own candidates.
+    """
+    for m in multipliers:
+        x = -np.expm1(-relative / (m[codes] if np.ndim(m) else m))
+        yield x * outcome, x * x
+
+
+def _best_fit(codes, n_campaigns, yy, columns, weights=None):
+    """Pick the least-squares (a, candidate) per campaign from precomputed columns."""
+    best_sse = np.full(n_campaigns, np.inf)
+    best_a = np.zeros(n_campaigns)
+    best_index = np.zeros(n_campaigns, dtype=np.intp)
+    for index, (xy_rows, xx_rows) in enumerate(columns):
+        if weights is not None:
+            xy_rows, xx_rows = xy_rows * weights, xx_rows * weights
+        xy = np.bincount(codes, weights=xy_rows, minlength=n_campaigns)
+        xx = np.bincount(codes, weights=xx_rows, minlength=n_campaigns)
+        a = np.divide(xy, xx, out=np.zeros(n_campaigns), where=xx > 0)
+        # A curve that only ever goes down is no use for allocation
+        a = np.maximum(a, 0.0)
+        sse = yy - 2 * a * xy + a * a * xx
+        better = sse < best_sse
+        best_sse = np.where(better, sse, best_sse)
+        best_a = np.where(better, a, best_a)
+        best_index = np.where(better, index, best_index)
+    return best_a, best_index, best_sse
+
+
+def fit_curves(codes, spend, outcome, n_campaigns, multipliers=B_MULTIPLIERS):
+    """Least-squares fit of ``a * (1 - exp(-spend / b))`` for every campaign at once.
+
+    Returns ``(a, b, sse)`` arrays indexed by campaign code.
+    """
+    scale = _scales(codes, spend, n_campaigns)
+    relative = spend / scale[codes]
+    yy = np.bincount(codes, weights=outcome * outcome, minlength=n_campaigns)
+    a, index, sse = _best_fit(codes, n_campaigns, yy, _columns(codes, relative, outcome, multipliers))
+    return a, multipliers[index] * scale, sse
+
+
+def current_budget(df, spend_column="Spend", campaign_column="Campaign"):
+    """Spend per row period at today's mix: the sum of every campaign's mean spend."""
+    spend = pd.to_numeric(df[spend_column], errors="coerce")
+    if campaign_column not in df.columns:
+        return float(spend.mean())
+    return float(spend.groupby(df[campaign_column], observed=True).mean().sum())
+
+
+def rollup_budget(frame):
+    """``current_budget`` from a campaign rollup (or a totals one) rather than the raw rows.
+
+    Each campaign's mean is its summed spend over its row count, so rows
+    with a blank spend count as spending nothing.
+    """
+    return float((frame["Spend"] / frame["Rows"]).sum()) if len(frame) else 0.0
+
+
+def predict(a, b, spend):
+    return a * -np.expm1(-spend / b)
+
+
+def allocate(a, b, budget, max_spend=None, iterations=100):
+    """Split ``budget`` across campaigns to maximise the summed predicted outcome.
+
+    The optimum gives every funded campaign the same marginal return
+    ``lam = (a / b) * exp(-x / b)``, i.e. ``x = b * log(a / (b * lam))``.
+    Total spend falls as ``lam`` rises, so ``lam`` is found by bisection in
+    log space.  ``max_spend`` optionally caps each campaign's share.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    cap = np.full(len(a), np.inf) if max_spend is None else np.asarray(max_spend, dtype=np.float64)
+    peak = np.divide(a, b, out=np.zeros(len(a)), where=b > 0)
+    if budget <= 0 or not (peak > 0).any():
+        return np.zeros(len(a))
+    if np.isfinite(cap).all() and cap.sum() <= budget:
+        return np.where(peak > 0, cap, 0.0)
+
+    def spend_at(log_lam):
+        with np.errstate(divide="ignore"):
+            x = b * (np.log(peak) - log_lam)
+        return np.clip(np.where(peak > 0, x, 0.0), 0.0, cap)
+
+    # Every campaign is unfunded at the highest peak marginal return; the
+    # lower end is pushed down until the budget is used up
+    high = np.log(peak[peak > 0].max())
+    low = high - 1.0
+    while spend_at(low).sum() < budget and low > high - 700:
+        low = high - 2 * (high - low)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        if spend_at(mid).sum() > budget:
+            low = mid
+        else:
+            high = mid
+    return spend_at(high)
+
+
+def _bootstrap_chunk(codes, spend, outcome, n_campaigns, allocation, b, seeds, radius=BOOTSTRAP_RADIUS):
+    """Refit on Poisson-resampled rows once per seed (runs in a worker process).
+
+    Replicates only search the ``radius`` grid points either side of each
+    campaign's full-data fit, and the per-row terms for those candidates are
+    computed once and reused by every replicate; only the weights change.
+    """
+    scale = _scales(codes, spend, n_campaigns)
+    relative = spend / scale[codes]
+    centre = np.abs(np.log(B_MULTIPLIERS)[:, None] - np.log(b / scale)).argmin(axis=0)
+    offsets = np.arange(-radius, radius + 1)[:, None]
+    candidates = B_MULTIPLIERS[np.clip(centre + offsets, 0, len(B_MULTIPLIERS) - 1)]
+    columns = list(_columns(codes, relative, outcome, candidates))
+    squares = outcome * outcome
+
+    a_samples, b_samples, outcome_samples = [], [], []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        weights = rng.poisson(1.0, size=len(codes)).astype(np.float64)
+        yy = np.bincount(codes, weights=squares * weights, minlength=n_campaigns)
+        a_rep, index, _ = _best_fit(codes, n_campaigns, yy, columns, weights=weights)
+        b_rep = candidates[index, np.arange(n_campaigns)] * scale
+        a_samples.append(a_rep)
+        b_samples.append(b_rep)
+        outcome_samples.append(predict(a_rep, b_rep, allocation))
+    return np.array(a_samples), np.array(b_samples), np.array(outcome_samples)
+
+
+def bootstrap(codes, spend, outcome, n_campaigns, allocation, b, samples=BOOTSTRAP_SAMPLES,
+              seed=0, max_workers=None):
+    """Bootstrap the curve fits; returns ``(a, b, predicted)`` arrays of shape (samples, campaigns).
+
+    ``b`` is the full-data fit the replicates search around and ``predicted``
+    is each replicate's outcome at ``allocation``.  Replicates are split into
+    one chunk per worker so the input arrays are pickled once per process
+    rather than once per replicate.
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(samples)
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(codes) * samples < PARALLEL_MIN_WORK:
+        return _bootstrap_chunk(codes, spend, outcome, n_campaigns, allocation, b, seeds)
+
+    chunks = [chunk for chunk in np.array_split(seeds, workers) if len(chunk)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [pool.submit(_bootstrap_chunk, codes, spend, outcome, n_campaigns, allocation, b, chunk)
+                   for chunk in chunks]
+        results = [future.result() for future in futures]
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def optimize_budget(df, target="Conversions", budget=None, samples=BOOTSTRAP_SAMPLES,
+                    confidence=0.9, seed=0, max_workers=None):
+    """Fit, allocate and bootstrap in one go; returns ``(summary, table)``.
+
+    ``budget`` is per row period (a day for daily exports) and defaults to
+    the current one: the sum of every campaign's mean spend.  ``table`` has
+    one row per campaign with current and recommended spend, the predicted
+    outcome at each, and its confidence interval at the recommendation.
+    """
+    data = prepare(df, target)
+    codes, spend, outcome = data["codes"], data["spend"], data["outcome"]
+    campaigns = data["campaigns"]
+    n = len(campaigns)
+    if len(codes) == 0:
+        raise ValueError(f"No rows with a numeric Spend and {target}")
+
+    a, b, _ = fit_curves(codes, spend, outcome, n)
+    counts = np.bincount(codes, minlength=n)
+    current = np.bincount(codes, weights=spend, minlength=n) / np.maximum(counts, 1)
+    if budget is None:
+        budget = float(current.sum())
+    recommended = allocate(a, b, budget)
+
+    predicted_current = predict(a, b, current)
+    predicted = predict(a, b, recommended)
+    tail = (1 - confidence) / 2 * 100
+    if samples:
+        _, _, boot_predicted = bootstrap(codes, spend, outcome, n, recommended, b, samples=samples,
+                                         seed=seed, max_workers=max_workers)
+        low, high = np.percentile(boot_predicted, [tail, 100 - tail], axis=0)
+        total_low, total_high = np.percentile(boot_predicted.sum(axis=1), [tail, 100 - tail])
+    else:
+        low = high = np.full(n, np.nan)
+        total_low = total_high = np.nan
+
+    table = pd.DataFrame({
+        "Rows": counts,
+        "Current Spend": current,
+        "Recommended Spend": recommended,
+        "Change (%)": np.divide(recommended - current, current, out=np.full(n, np.nan),
+                                where=current > 0) * 100,
+        f"Predicted {target} (current)": predicted_current,
+        f"Predicted {target}": predicted,
+        "CI Low": low,
+        "CI High": high,
+        "Saturation": a,
+        "Half-saturation Spend": b * np.log(2),
+    }, index=campaigns).sort_values("Recommended Spend", ascending=False)
+    summary = {
+        "target": target,
+        "budget": budget,
+        "campaigns": n,
+        "current_outcome": float(predicted_current.sum()),
+        "predicted_outcome": float(predicted.sum()),
+        "ci": (float(total_low), float(total_high)),
+        "confidence": confidence,
+    }
+    return summary, table
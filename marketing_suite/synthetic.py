@@ -0,0 +1,208 @@
+"""Seeded synthetic datasets in the app's own schemas.
+
+Every generator takes a row count (10 to 10 million) and a seed, and returns
+the same data for the same arguments, built on whole NumPy arrays:
+
+* ``posts``: one platform's dashboard frame, as its connector produces it;
+* ``unified``: the cross-platform frame of ``social.combine``;
+* ``ad_export``: an Ad Performance CSV export, as a frame;
+* ``documents``: text for the keyword analyzer;
+* ``site``: crawl results for the SEO Analyzer.
+
+Audiences, engagement rates and spend responses vary per account or
+campaign, with a heavy tail of viral posts, so rolling statistics, anomaly
+flags and spend curves have something to find.  The TikTok view uses
+``posts`` in place of the API it has no access to, and the benchmark suite
+uses all of them.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from marketing_suite.connectors.youtube import THUMBNAIL_URL, VIDEO_COLUMNS
+from marketing_suite.seo_crawler import PageResult
+from marketing_suite.social import combine, normalize
+
+# Fixed, so that a seed gives the same dates whenever it runs
+END = pd.Timestamp("2024-06-30", tz="UTC")
+PLATFORM_COLUMNS = {
+    "Twitter": ["Date", "Text", "Likes", "Retweets", "Replies"],
+    "Instagram": ["Date", "Likes", "Comments", "Caption", "URL"],
+    "Facebook": ["Date", "Message", "Impressions", "Engaged Users", "Shares"],
+    "LinkedIn": ["Date", "Content", "Likes", "Comments", "Shares"],
+    "TikTok": ["Date", "Views", "Likes", "Comments", "Shares"],
+    "YouTube": VIDEO_COLUMNS,
+}
+# Typical reach and interaction rates per platform: (log-median reach, like rate, comment share, share share)
+PROFILES = {
+    "Twitter": (7.0, 0.010, 0.15, 0.25),
+    "Instagram": (8.0, 0.035, 0.05, 0.0),
+    "Facebook": (7.5, 0.020, 0.10, 0.10),
+    "LinkedIn": (6.5, 0.015, 0.10, 0.05),
+    "TikTok": (9.0, 0.060, 0.03, 0.08),
+    "YouTube": (9.5, 0.030, 0.04, 0.0),
+}
+VIRAL_SHARE = 0.01
+SYLLABLES = ["ka", "lo", "mi", "ne", "ra", "so", "tu", "vi", "ze", "pa", "re", "do", "fi", "ga", "hu", "ji"]
+TOPICS = ["digital marketing", "brand growth", "social media", "content strategy", "product launch",
+          "customer stories", "seo tips", "video marketing", "email campaigns", "analytics"]
+
+
+def seed_for(*parts):
+    """A stable seed derived from ``parts`` (e.g. a username), the same in every process."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _dates(rng, rows, end, days):
+    """``rows`` timestamps in the ``days`` before ``end``, newest first."""
+    seconds = np.sort(rng.integers(0, days * 86400, rows))
+    return pd.DatetimeIndex(end - pd.to_timedelta(seconds, unit="s"))
+
+
+def _texts(rng, rows, choices=200):
+    """Post texts drawn from a few hundred templates, as a categorical."""
+    topics = rng.choice(TOPICS, choices)
+    words = ["New post about", "Thoughts on", "Five ideas for", "What we learned about", "Live now:"]
+    templates = pd.unique(np.array([f"{rng.choice(words)} {topic} #{topic.replace(' ', '')}" for topic in topics]))
+    return pd.Categorical.from_codes(rng.integers(0, len(templates), rows), categories=templates)
+
+
+def _audience(rng, rows, accounts, log_reach):
+    """Per-post reach: an account-level audience, post-level noise and a heavy viral tail."""
+    account = rng.integers(0, accounts, rows)
+    audience = rng.lognormal(log_reach, 1.0, accounts)
+    reach = audience[account] * rng.lognormal(0.0, 0.6, rows)
+    viral = rng.random(rows) < VIRAL_SHARE
+    reach[viral] *= 1 + rng.pareto(1.5, int(viral.sum())) * 10
+    return account, np.rint(reach).astype(np.int64) + 1
+
+
+def posts(platform, rows, seed=0, accounts=1, end=END, days=365):
+    """``rows`` posts in ``platform``'s dashboard schema, newest first."""
+    if platform not in PROFILES:
+        raise ValueError(f"Unknown platform: {platform}")
+    rng = np.random.default_rng(seed)
+    log_reach, like_rate, comment_share, share_share = PROFILES[platform]
+    account, reach = _audience(rng, rows, accounts, log_reach)
+    # Engagement rates vary per account and per post around the platform's typical rate
+    rates = rng.beta(2.0, 2.0 / like_rate - 2.0, accounts)[account] * rng.lognormal(0.0, 0.3, rows)
+    likes = rng.binomial(reach, np.clip(rates, 0.0, 1.0))
+    comments = rng.binomial(likes, comment_share)
+    shares = rng.binomial(likes, share_share)
+    dates = _dates(rng, rows, end, days)
+    columns = {
+        "Twitter": lambda: {"Date": dates, "Text": _texts(rng, rows), "Likes": likes, "Retweets": shares,
+                            "Replies": comments},
+        "Instagram": lambda: {"Date": dates, "Likes": likes, "Comments": comments, "Caption": _texts(rng, rows),
+                              "URL": "https://instagram.com/p/" + pd.Series(np.arange(rows)).astype(str)},
+        "Facebook": lambda: {"Date": dates, "Message": _texts(rng, rows), "Impressions": reach,
+                             "Engaged Users": likes + comments + shares, "Shares": shares},
+        "LinkedIn": lambda: {"Date": dates, "Content": _texts(rng, rows), "Likes": likes, "Comments": comments,
+                             "Shares": shares},
+        "TikTok": lambda: {"Date": dates, "Views": reach, "Likes": likes, "Comments": comments, "Shares": shares},
+        "YouTube": lambda: _youtube(rng, rows, dates, reach),
+    }[platform]()
+    return pd.DataFrame({name: columns[name] for name in PLATFORM_COLUMNS[platform]})
+
+
+def _youtube(rng, rows, dates, views):
+    ids = pd.Series(np.arange(rows)).map("v{:010d}".format)
+    return {"post_id": ids, "Date": dates, "Title": _texts(rng, rows), "Views": views,
+            "Length (s)": rng.integers(30, 3600, rows), "Author": "Synthetic Channel",
+            "Thumbnail": ids.map(THUMBNAIL_URL.format)}
+
+
+def unified(rows, seed=0, platforms=("Twitter", "Instagram", "Facebook", "LinkedIn", "TikTok", "YouTube"),
+            accounts=1):
+    """``rows`` posts spread over ``platforms`` and ``accounts`` each, in the unified schema."""
+    parts = [(platform, index) for platform in platforms for index in range(accounts)]
+    sizes = np.diff(np.linspace(0, rows, len(parts) + 1).astype(np.int64))
+    frames = []
+    for (platform, index), size in zip(parts, sizes):
+        df = posts(platform, int(size), seed=seed_for(seed, platform, index))
+        df["post_id"] = np.arange(len(df)).astype(str)
+        frames.append(normalize(platform, f"{platform.lower()}-{index}", df))
+    return combine(frames)
+
+
+def ad_export(rows, seed=0, campaigns=50, end=END, days=365):
+    """``rows`` rows of an ad export: Date, Campaign, Impressions, Clicks, Spend, Conversions, Revenue.
+
+    Conversions saturate with spend (``a * (1 - exp(-spend / b))``) with a
+    different curve per campaign, as the spend model assumes.
+    """
+    rng = np.random.default_rng(seed)
+    campaign = rng.integers(0, campaigns, rows)
+    ceiling = rng.lognormal(2.5, 0.6, campaigns)
+    half_life = rng.lognormal(5.0, 0.5, campaigns)
+    order_value = rng.lognormal(3.5, 0.4, campaigns)
+    spend = np.round(rng.gamma(2.0, half_life[campaign] / 2), 2)
+    conversions = rng.poisson(ceiling[campaign] * (1 - np.exp(-spend / half_life[campaign])))
+    impressions = rng.poisson(spend * rng.uniform(50, 200, campaigns)[campaign]) + 1
+    names = [f"Campaign {i + 1:03d}" for i in range(campaigns)]
+    return pd.DataFrame({
+        "Date": _dates(rng, rows, end, days).normalize().tz_localize(None)[::-1],
+        "Campaign": pd.Categorical.from_codes(campaign, categories=names),
+        "Impressions": impressions,
+        "Clicks": rng.binomial(impressions, rng.beta(2, 60, campaigns)[campaign]),
+        "Spend": spend,
+        "Conversions": conversions,
+        "Revenue": np.round(conversions * order_value[campaign] * rng.lognormal(0, 0.2, rows), 2),
+    })
+
+
+def _vocabulary(rng, size):
+    """``size`` distinct pronounceable words of two to four syllables."""
+    syllables = np.array(SYLLABLES)
+    words = set()
+    while len(words) < size:
+        lengths = rng.integers(2, 5, size)
+        picks = rng.integers(0, len(syllables), (size, 4))
+        words.update("".join(syllables[row[:length]]) for row, length in zip(picks, lengths))
+    return np.array(sorted(words)[:size])
+
+
+def documents(count, words=300, seed=0, vocabulary=5000):
+    """``count`` texts of about ``words`` words with Zipf-distributed word frequencies."""
+    rng = np.random.default_rng(seed)
+    stop_words = np.array(["the", "and", "of", "to", "a", "in", "for", "is", "on", "with"])
+    vocab = np.concatenate([stop_words, _vocabulary(rng, vocabulary)])
+    ranks = np.minimum(rng.zipf(1.3, (count, words)), len(vocab)) - 1
+    texts = []
+    for row in vocab[ranks]:
+        # A sentence break every 8 to 20 words
+        breaks = np.cumsum(rng.integers(8, 21, words // 8 + 1))
+        row = row.astype(object)
+        row[breaks[breaks < words] - 1] += "."
+        texts.append(" ".join(row))
+    return texts
+
+
+def site(pages, seed=0, host="https://example.com"):
+    """Crawl results (``PageResult``) of a synthetic site with some typical defects."""
+    rng = np.random.default_rng(seed)
+    depth = np.minimum(rng.geometric(0.4, pages) - 1, 5)
+    status = np.where(rng.random(pages) < 0.03, rng.choice([404, 500, 301], pages), 200)
+    elapsed = rng.lognormal(5.3, 0.6, pages)
+    has_title = rng.random(pages) > 0.05
+    has_description = rng.random(pages) > 0.2
+    h1_count = rng.choice([0, 1, 1, 1, 1, 2], pages)
+    links = rng.poisson(25, pages)
+    topics = rng.choice(TOPICS, pages)
+    results = []
+    for i in range(pages):
+        url = host + ("/" if i == 0 else f"/{topics[i].replace(' ', '-')}/{i}")
+        ok = status[i] == 200
+        results.append(PageResult(
+            url=url, depth=int(depth[i]), status=int(status[i]), elapsed_ms=float(elapsed[i]),
+            size_bytes=int(elapsed[i] * 200),
+            title=f"{topics[i].title()} | Example" if ok and has_title[i] else "",
+            meta_description=f"All about {topics[i]}." if ok and has_description[i] else "",
+            headings={"h1": [topics[i].title()] * int(h1_count[i])} if ok else {},
+            internal_links=[f"{host}/page/{j}" for j in range(int(links[i]))] if ok else [],
+            external_links=["https://other.example/"] * int(ok),
+            error="" if status[i] < 400 else f"HTTP {status[i]}",
+        ))
+    return results
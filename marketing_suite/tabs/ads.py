@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from marketing_suite.charts import plot
+from marketing_suite.ingestion import load_ad_csv
+from marketing_suite.roi import PERIODS, date_column, filter_rollup, has_roi_columns, rollup, roi_summary
+from marketing_suite.spend_model import optimize_budget, predict, rollup_budget
+from marketing_suite.timing import span
+
+
+PAGE_SIZES = [25, 100, 500]
+TOP_CAMPAIGNS = 30
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def ad_rollup(dataset_hash, campaign, period, _df):
+    """Rollup of a dataset, built once per dataset hash and grouping."""
+    with span("ads.rollup", period=period or "none"):
+        return rollup(_df, campaign=campaign, period=period)
+
+
+def browse(frame, key):
+    """Sortable, paginated view of a rollup; only the current page is sent to the browser."""
+    columns = [column for column in frame.columns if column not in ("Campaign", "Period")]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", columns, index=columns.index("Spend"), key=f"{key}_sort")
+    with col2:
+        descending = st.toggle("Descending", value=True, key=f"{key}_descending")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = max(1, -(-len(frame) // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        # The filter or page size shrank the view under the current page
+        st.session_state[f"{key}_page"] = 1
+    with col4:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    start = (int(page) - 1) * page_size
+    order = frame[sort_by].to_numpy()
+    # Sorting positions is cheaper than sorting the frame, and only one page is materialised
+    positions = np.argsort(-order if descending else order, kind="stable")[start:start + page_size]
+    st.dataframe(frame.iloc[positions], hide_index=True)
+    st.caption(f"Rows {min(start + 1, len(frame)):,}–{start + len(positions):,} of {len(frame):,}")
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def optimize_spend(dataset_hash, target, budget, samples, _df):
+    """Spend optimization, cached per dataset hash so reruns don't refit."""
+    return optimize_budget(_df, target=target, budget=budget, samples=samples)
+
+
+def render():
+    st.header("Ad Performance Analyzer")
+    
+    uploaded_file = st.file_uploader("Upload Ad Performance CSV", type=["csv"])
+    
+    if uploaded_file is not None:
+        # Only parse (or load from the Parquet cache) when a new file is uploaded
+        if st.session_state.ad_data_key != uploaded_file.file_id:
+            try:
+                with st.spinner("Loading ad data..."):
+                    dataset_hash, ad_data = load_ad_csv(uploaded_file)
+            except ValueError as e:
+                st.error(f"Could not read the CSV: {e}")
+                return
+            st.session_state.ad_data = ad_data
+            st.session_state.ad_data_hash = dataset_hash
+            st.session_state.ad_data_key = uploaded_file.file_id
+        df = st.session_state.ad_data
+        
+        st.subheader("Ad Performance Data")
+        st.dataframe(df.head())
+        st.caption(f"First rows of {len(df):,}")
+        
+        # ROI Calculator
+        st.subheader("ROI Calculator")
+        
+        if has_roi_columns(df):
+            dataset_hash = st.session_state.ad_data_hash
+            by_campaign = ad_rollup(dataset_hash, True, None, df)
+            # A rollup without keys is the raw rows' totals, computed once per dataset
+            totals = roi_summary(ad_rollup(dataset_hash, False, None, df))
+            
+            cols = st.columns(5 if "CPA" in totals else 4)
+            cols[0].metric("Total Spend", f"${totals['Total Spend']:,.2f}")
+            cols[1].metric("Total Revenue", f"${totals['Total Revenue']:,.2f}")
+            cols[2].metric("ROI", f"{totals['ROI (%)']:.2f}%")
+            cols[3].metric("ROAS", f"{totals['ROAS']:.2f}x")
+            if "CPA" in totals:
+                cols[4].metric("CPA", f"${totals['CPA']:,.2f}")
+            
+            # Visualization: one bar pair per campaign rather than one per row
+            top = by_campaign.nlargest(TOP_CAMPAIGNS, "Spend")
+            plot("bar", top, x='Campaign', y=['Spend', 'Revenue'],
+                 title="Spend vs Revenue by Campaign", barmode='group',
+                 data_key=f"{dataset_hash}:top_campaigns")
+            if len(by_campaign) > len(top):
+                st.caption(f"Top {len(top)} of {len(by_campaign):,} campaigns by spend")
+            
+            # Rollups: every view below reads the cached aggregates, never the raw rows
+            st.subheader("Performance Rollups")
+            dates = date_column(df)
+            levels = ["Campaign", "Period", "Campaign × Period"] if dates else ["Campaign"]
+            col1, col2 = st.columns(2)
+            with col1:
+                level = st.selectbox("Group by", levels, key="rollup_level")
+            period = None
+            if level != "Campaign":
+                with col2:
+                    period = PERIODS[st.selectbox("Period", list(PERIODS), index=1, key="rollup_period")]
+            frame = by_campaign if period is None else ad_rollup(dataset_hash, level != "Period", period, df)
+            
+            col1, col2 = st.columns(2)
+            campaign_filter = start = end = None
+            if level != "Period":
+                with col1:
+                    campaign_filter = st.text_input("Campaign contains", key="rollup_campaign")
+            if period is not None and len(frame):
+                with col2:
+                    first, last = frame["Period"].min().date(), frame["Period"].max().date()
+                    selected = st.date_input("Periods from – to", value=(first, last), min_value=first,
+                                             max_value=last, key=f"rollup_dates_{dataset_hash}_{period}")
+                if len(selected) == 2:
+                    start, end = selected
+            view = filter_rollup(frame, campaign=campaign_filter, start=start, end=end)
+            browse(view, key="rollup")
+            
+            if period is not None and level == "Period":
+                plot("line", view, x="Period", y=["Spend", "Revenue"], title="Spend and Revenue per period",
+                     data_key=f"{dataset_hash}:{period}:{start}:{end}")
+            
+            # Predictive spend optimization
+            st.subheader("Predictive Spend Optimization")
+            
+            targets = [column for column in ("Conversions", "Revenue") if column in df.columns]
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                target = st.selectbox("Optimize for", targets)
+            with col2:
+                budget = st.number_input("Budget per period ($)", min_value=0.0,
+                                         value=round(rollup_budget(by_campaign), 2), step=100.0)
+            with col3:
+                samples = st.slider("Bootstrap samples", 0, 500, 100, step=50)
+            
+            if st.button("Optimize Ad Spend"):
+                with st.spinner("Fitting spend-response curves..."), span("ads.optimize"):
+                    summary, table = optimize_spend(st.session_state.ad_data_hash, target, budget,
+                                                    samples, df)
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric(f"Predicted {target} (current mix)", f"{summary['current_outcome']:,.1f}")
+                with col2:
+                    st.metric(f"Predicted {target} (recommended)", f"{summary['predicted_outcome']:,.1f}",
+                              f"{summary['predicted_outcome'] - summary['current_outcome']:+,.1f}")
+                with col3:
+                    low, high = summary["ci"]
+                    if samples:
+                        st.metric(f"{summary['confidence']:.0%} interval", f"{low:,.1f} – {high:,.1f}")
+                
+                st.dataframe(table)
+                
+                plot("scatter", df, x="Spend", y=target, opacity=0.5, title=f"Spend vs {target}",
+                     data_key=st.session_state.ad_data_hash)
+                
+                # Fitted response curves of the campaigns receiving the most budget
+                top = table.head(10)
+                b = top["Half-saturation Spend"].to_numpy() / np.log(2)
+                grid = np.linspace(0, 1, 50)[:, None] * np.maximum(
+                    2 * top[["Current Spend", "Recommended Spend"]].max(axis=1).to_numpy(), 1.0)
+                curves = pd.DataFrame({
+                    "Campaign": np.tile(top.index.to_numpy(), len(grid)),
+                    "Spend": grid.ravel(),
+                    target: predict(top["Saturation"].to_numpy(), b, grid).ravel(),
+                })
+                plot("line", curves, x="Spend", y=target, color="Campaign",
+                     title=f"Fitted spend response ({target} per period)")
+        else:
+            st.warning("CSV must contain 'Spend' and 'Revenue' columns for ROI calculation")
@@ -0,0 +1,135 @@
+import streamlit as st
+
+from marketing_suite.charts import plot
+from marketing_suite.keywords import analyze_documents
+from marketing_suite.seo_crawler import analyze_site
+from marketing_suite.site_index import OVERUSE_DENSITY, SiteIndex
+from marketing_suite.timing import increment, span
+
+
+@st.cache_resource
+def get_site_index():
+    # One keyword index of crawled pages shared by every session in the process
+    return SiteIndex()
+
+
+def render():
+    st.header("SEO Analyzer")
+    
+    url = st.text_input("Enter URL to analyze:", "https://example.com")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        max_pages = st.number_input("Max pages to crawl", min_value=1, max_value=10000, value=200, step=50)
+    with col2:
+        max_depth = st.number_input("Max link depth", min_value=0, max_value=20, value=3)
+    
+    if st.button("Analyze SEO"):
+        with st.spinner("Crawling website..."), span("seo.crawl"):
+            # Store in session state
+            st.session_state.seo_data, st.session_state.seo_pages = analyze_site(
+                url, max_pages=int(max_pages), max_depth=int(max_depth), index=get_site_index())
+            st.session_state.seo_unchanged += st.session_state.seo_data["Pages Unchanged"]
+    
+    if st.session_state.seo_data is not None:
+        seo_data = st.session_state.seo_data
+        seo_score = seo_data["SEO Score"]
+        
+        # Display results
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("SEO Score", f"{seo_score}/100")
+        with col2:
+            st.metric("Meta Tags Found", seo_data["Meta Tags"])
+        with col3:
+            st.metric("Internal Links", seo_data["Internal Links"])
+        with col4:
+            st.metric("Avg Response", f"{seo_data['Avg Response (ms)']:.0f} ms")
+        
+        st.caption(f"{seo_data['Pages Crawled']} page(s) crawled")
+        st.dataframe(st.session_state.seo_pages)
+        
+        # SEO recommendations
+        st.subheader("Recommendations")
+        if seo_data["Issues"]:
+            st.warning("Your SEO needs improvement. Consider the following:")
+            for issue in seo_data["Issues"]:
+                st.write(f"- {issue}")
+        else:
+            st.success("Good SEO score! Keep monitoring and improving.")
+    
+    site_index_panel(get_site_index())
+        
+    # Keyword density analyzer
+    st.subheader("Keyword Density Analyzer")
+    sample_text = st.text_area("Paste your content here to analyze keyword density:", 
+                             "This is sample content about digital marketing and SEO. Digital marketing helps businesses grow online. SEO is important for visibility.")
+    text_files = st.file_uploader("Or upload text files", type=["txt", "md"], accept_multiple_files=True)
+    
+    if st.button("Analyze Keywords"):
+        if text_files:
+            names = [f.name for f in text_files]
+            documents = [f.getvalue().decode("utf-8", errors="ignore") for f in text_files]
+        else:
+            names = ["Pasted content"]
+            documents = [sample_text]
+        increment("keywords.documents", len(documents))
+        with span("keywords.analyze"):
+            keywords_df = analyze_documents(documents, ngram_range=(1, 3), top_k=10, names=names)
+        
+        for name, doc_df in keywords_df.groupby("Document", sort=False):
+            if len(names) > 1:
+                st.markdown(f"**{name}**")
+            
+            # Display results
+            for n, label in [(1, "Keywords"), (2, "Two-word phrases"), (3, "Three-word phrases")]:
+                top = doc_df[doc_df["Words"] == n].set_index("Keyword")[["Count", "Density (%)"]]
+                if top.empty:
+                    continue
+                st.write(f"Top {label.lower()}")
+                st.dataframe(top)
+            
+            # Visualization
+            top_words = doc_df[doc_df["Words"] == 1]
+            plot("bar", top_words, 
+                 x="Keyword", 
+                 y='Density (%)',
+                 title="Top Keywords by Density")
+
+
+def site_index_panel(index):
+    """Site-wide keyword queries over the pages indexed by past crawls."""
+    sites = index.sites()
+    if not sites:
+        return
+    st.subheader("Site Content Index")
+    site = st.selectbox("Site", sites)
+    stats = index.metrics()
+    st.caption(f"{stats['Pages']:,} page(s) and {stats['Terms']:,} keyword(s) indexed; "
+               f"{st.session_state.get('seo_unchanged', 0):,} unchanged page(s) skipped this session")
+    
+    with span("index.top_terms"):
+        top = index.top_terms(site, k=20)
+    st.write("Top keywords across the site")
+    st.dataframe(top.set_index("Keyword"))
+    if not top.empty:
+        plot("bar", top, x="Keyword", y="Density (%)", title="Site-wide Keyword Density")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        keyword = st.text_input("Find pages over-using a keyword", top["Keyword"].iloc[0] if len(top) else "")
+    with col2:
+        threshold = st.number_input("Density threshold (%)", min_value=0.1, max_value=100.0,
+                                    value=OVERUSE_DENSITY, step=0.5)
+    if keyword:
+        with span("index.overuse"):
+            pages = index.overuse(site, keyword, threshold=threshold)
+        over = pages[pages["Over-used"]]
+        st.write(f"{len(over):,} of {len(pages):,} page(s) using \"{keyword}\" exceed {threshold:g}%")
+        st.dataframe(pages.head(200), hide_index=True)
+    
+    urls = st.multiselect("Compare keyword density across pages", index.urls(site, limit=1000))
+    if urls:
+        increment("index.compare.pages", len(urls))
+        with span("index.compare"):
+            st.dataframe(index.compare(site, urls))
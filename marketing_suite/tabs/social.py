@@ -0,0 +1,597 @@
+import pandas as pd
+import streamlit as st
+
+from marketing_suite import synthetic
+from marketing_suite.charts import data_hash, plot
+from marketing_suite.client_pool import ClientPool, session_dir, session_path
+from marketing_suite.connectors.facebook import (GraphAPIError, GraphClient, fetch_facebook_posts,
+                                                  publish_facebook_post)
+from marketing_suite.connectors.instagram import connect_instagram, fetch_instagram_posts
+from marketing_suite.connectors.linkedin import connect_linkedin, fetch_linkedin_posts
+from marketing_suite.connectors.twitter import connect_twitter, fetch_twitter_posts, publish_tweet
+from marketing_suite.connectors.youtube import (CHANNEL_LIMIT, channel_video_urls, fetch_videos,
+                                                fetch_youtube_videos, video_details)
+from marketing_suite.engagement import TIME_COLUMNS, engagement_metrics
+from marketing_suite.frame_store import FrameStore
+from marketing_suite.post_store import PostStore
+from marketing_suite.ratelimit import RateLimitExceeded
+from marketing_suite.scheduler import PENDING, PublishError, Scheduler
+from marketing_suite.social import fetch_all
+from marketing_suite.timing import increment, span
+from marketing_suite.video_cache import VideoCache
+
+# Platforms with a publisher, and those of them that can publish images
+PUBLISHING_PLATFORMS = ("Twitter", "Facebook")
+IMAGE_PLATFORMS = ("Twitter",)
+# Largest simulated TikTok profile; bigger sizes are for the benchmark suite, not a session's memory
+MAX_SIMULATED_VIDEOS = 100_000
+
+
+@st.cache_resource
+def get_post_store():
+    # One SQLite store shared by every session in the process
+    return PostStore()
+
+
+@st.cache_resource
+def get_client_pool():
+    # Logged-in clients shared by every session, so reconnecting skips the login
+    return ClientPool()
+
+
+@st.cache_resource
+def get_video_cache():
+    # Video metadata outlives sessions and restarts, so re-analysing a channel mostly hits it
+    return VideoCache()
+
+
+@st.cache_resource
+def get_scheduler():
+    # One scheduler (and dispatcher thread) shared by every session in the process
+    return Scheduler().start()
+
+
+def session_frames():
+    """This session's frames, one per (platform, account)."""
+    if "social_frames" not in st.session_state:
+        st.session_state.social_frames = FrameStore()
+    return st.session_state.social_frames
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def engagement(data_key, platform, _df):
+    """``engagement_metrics`` of a stored frame, cached per content hash."""
+    increment("social.engagement.posts", len(_df), platform=platform)
+    with span("social.engagement", platform=platform):
+        return engagement_metrics(_df, platform)
+
+
+def engagement_panel(df, platform):
+    """Engagement rate, its rolling trend and the posts flagged as anomalies."""
+    data_key = data_hash(df)
+    metrics = engagement(data_key, platform, df) if data_key else engagement_metrics(df, platform)
+    if metrics["Engagement"].isna().all():
+        st.caption("No likes, comments or shares are reported for these posts")
+        return
+    # Rolling and anomaly figures are of the rate where views are reported, else of raw engagement
+    basis = "Engagement Rate (%)" if metrics["Engagement Rate (%)"].notna().any() else "Engagement"
+    flagged = metrics["Anomaly"].to_numpy(dtype=bool)
+    col1, col2 = st.columns(2)
+    col1.metric(f"Median {basis}", f"{metrics[basis].median():,.2f}")
+    col2.metric("Anomalous posts", f"{int(flagged.sum()):,}")
+    time_column = next((column for column in TIME_COLUMNS if column in df.columns), None)
+    if time_column is not None and len(df) > 1:
+        if platform == "All platforms":
+            trend = pd.concat([df[[time_column, "platform"]], metrics[["Rolling Mean"]]], axis=1)
+            plot("line", trend, data_key=data_key and f"{data_key}-engagement", x=time_column, y="Rolling Mean",
+                 color="platform", title=f"Rolling {basis} by Platform")
+        else:
+            trend = pd.concat([df[[time_column]], metrics[[basis, "Rolling Mean", "Rolling Median"]]], axis=1)
+            plot("line", trend, data_key=data_key and f"{data_key}-engagement", x=time_column,
+                 y=[basis, "Rolling Mean", "Rolling Median"], title=f"{basis} and Rolling Trend")
+    if flagged.any():
+        st.write("Anomalous posts")
+        st.dataframe(pd.concat([df[flagged], metrics[flagged].drop(columns="Anomaly")], axis=1))
+
+
+def enable_publishing(platform, account, publish):
+    """Route scheduled posts for this account through ``publish(job)`` once connected."""
+    get_scheduler().register(platform, account, publish)
+    st.session_state.setdefault("publish_accounts", {})[platform] = account
+
+
+def publish_to_page(client, page_id, job):
+    if job.media_path:
+        raise PublishError("Image posts to Facebook pages are not supported yet", retryable=False)
+    try:
+        return publish_facebook_post(client, page_id, job.content)
+    except GraphAPIError as e:
+        # Throttling and server errors are worth retrying; bad tokens or permissions are not
+        raise PublishError(str(e), retryable=e.is_rate_limit or (e.status or 0) >= 500) from e
+
+
+def publishing_account(platform):
+    # Only an account connected in this session: publishers are shared by the
+    # whole process, so another session's account must never be used
+    return st.session_state.get("publish_accounts", {}).get(platform)
+
+
+def queue_post(platforms, post_date, post_time, content, image=None):
+    due = pd.Timestamp.combine(post_date, post_time).tz_localize("UTC")
+    for name in platforms:
+        if name not in PUBLISHING_PLATFORMS:
+            st.error(f"Publishing to {name} is not supported yet")
+            continue
+        if image is not None and name not in IMAGE_PLATFORMS:
+            st.error(f"Image posts to {name} are not supported yet")
+            continue
+        account = publishing_account(name)
+        if account is None:
+            st.warning(f"Connect to {name} in this session so the post can be published from your account")
+            continue
+        job_id = get_scheduler().schedule(name, account, content, due,
+                                          media=image.getvalue() if image else None,
+                                          media_name=image.name if image else None)
+        st.success(f"Post #{job_id} scheduled for {due:%Y-%m-%d %H:%M} UTC on {name} ({account})")
+
+
+def scheduled_posts():
+    scheduler = get_scheduler()
+    counts = scheduler.counts()
+    cols = st.columns(4)
+    for col, status in zip(cols, ["pending", "sent", "failed", "cancelled"]):
+        col.metric(status.title(), counts.get(status, 0))
+    jobs = scheduler.jobs(limit=100)
+    if jobs.empty:
+        return
+    st.dataframe(jobs, hide_index=True)
+    pending = jobs.loc[jobs["status"] == PENDING, "id"].tolist()
+    if pending:
+        job_id = st.selectbox("Pending post", pending, key="cancel_job")
+        if st.button("Cancel scheduled post"):
+            if scheduler.cancel(job_id):
+                st.success(f"Post #{job_id} cancelled")
+            else:
+                st.warning(f"Post #{job_id} is already being published")
+
+
+def load_saved_posts(platform):
+    # Synced history can be browsed without reconnecting to the platform
+    accounts = get_post_store().accounts(platform)
+    if accounts:
+        account = st.selectbox("Saved accounts", accounts, key=f"saved_{platform}")
+        if st.button("Load saved posts", key=f"load_{platform}"):
+            session_frames().put(platform, account, get_post_store().load(platform, account))
+
+
+def render():
+    st.header("Social Media Dashboard")
+    
+    platform = st.selectbox("Select Platform:", 
+                          ["Twitter", "Instagram", "Facebook", "LinkedIn", "TikTok", "YouTube", "All platforms"])
+    
+    if platform == "All platforms":
+        st.subheader("Cross-Platform Engagement")
+        st.write("Fill in the platforms to include; they are fetched in parallel.")
+        
+        with st.expander("Twitter"):
+            tw_key = st.text_input("API Key", type="password", key="all_tw_key")
+            tw_secret = st.text_input("API Secret", type="password", key="all_tw_secret")
+            tw_token = st.text_input("Access Token", type="password", key="all_tw_token")
+            tw_token_secret = st.text_input("Access Secret", type="password", key="all_tw_token_secret")
+        with st.expander("Instagram"):
+            ig_user = st.text_input("Instagram Username", key="all_ig_user")
+            ig_password = st.text_input("Password", type="password", key="all_ig_password")
+        with st.expander("Facebook"):
+            fb_token = st.text_input("Access Token", type="password", key="all_fb_token")
+            fb_page = st.text_input("Page ID", key="all_fb_page")
+        with st.expander("LinkedIn"):
+            li_user = st.text_input("LinkedIn Email", key="all_li_user")
+            li_password = st.text_input("Password", type="password", key="all_li_password")
+        with st.expander("YouTube"):
+            yt_channel = st.text_input("YouTube Channel URL", key="all_yt_channel")
+        timeout = st.number_input("Per-platform timeout (seconds)", min_value=5, max_value=600, value=60)
+        
+        if st.button("Fetch all platforms"):
+            store = get_post_store()
+            video_cache = get_video_cache()
+            clients = get_client_pool()
+            
+            # Each fetcher runs on a worker thread, so none of them may touch st.*. They share the
+            # pooled clients and stored login sessions of the single-platform views, and drop a
+            # failing client just as those views do
+            def twitter_fetch():
+                credentials = (tw_key, tw_secret, tw_token, tw_token_secret)
+                try:
+                    api, user = clients.get("Twitter", credentials, lambda: connect_twitter(*credentials))
+                    return user.screen_name, store.sync(
+                        "Twitter", user.screen_name, lambda cursor: fetch_twitter_posts(api, cursor), include_ids=True)
+                except RateLimitExceeded:
+                    raise
+                except Exception:
+                    clients.discard("Twitter", credentials)
+                    raise
+            
+            def instagram_fetch():
+                try:
+                    profile = clients.get("Instagram", (ig_user, ig_password),
+                                          lambda: connect_instagram(ig_user, ig_password,
+                                                                    session_path("Instagram", ig_user)))
+                    return profile.username, store.sync(
+                        "Instagram", profile.username, lambda cursor: fetch_instagram_posts(profile, cursor),
+                        include_ids=True)
+                except RateLimitExceeded:
+                    raise
+                except Exception:
+                    clients.discard("Instagram", (ig_user, ig_password))
+                    raise
+            
+            def facebook_fetch():
+                client = clients.get("Facebook", (fb_token,), lambda: GraphClient(fb_token))
+                try:
+                    return fb_page, store.sync(
+                        "Facebook", fb_page, lambda cursor: fetch_facebook_posts(client, fb_page, cursor),
+                        include_ids=True)
+                except GraphAPIError as e:
+                    if e.code == 190:  # invalid or expired token
+                        clients.discard("Facebook", (fb_token,))
+                    raise
+            
+            def linkedin_fetch():
+                try:
+                    linkedin, profile = clients.get("LinkedIn", (li_user, li_password),
+                                                    lambda: connect_linkedin(li_user, li_password,
+                                                                             session_dir("LinkedIn")))
+                    return profile['profile_id'], store.sync(
+                        "LinkedIn", profile['profile_id'],
+                        lambda cursor: fetch_linkedin_posts(linkedin, profile['profile_id'], cursor), include_ids=True)
+                except RateLimitExceeded:
+                    raise
+                except Exception:
+                    clients.discard("LinkedIn", (li_user, li_password))
+                    raise
+            
+            def youtube_fetch():
+                return yt_channel, fetch_youtube_videos(yt_channel, cache=video_cache)
+            
+            fetchers = {}
+            if tw_key and tw_secret and tw_token and tw_token_secret:
+                fetchers["Twitter"] = twitter_fetch
+            if ig_user and ig_password:
+                fetchers["Instagram"] = instagram_fetch
+            if fb_token and fb_page:
+                fetchers["Facebook"] = facebook_fetch
+            if li_user and li_password:
+                fetchers["LinkedIn"] = linkedin_fetch
+            if yt_channel:
+                fetchers["YouTube"] = youtube_fetch
+            
+            if not fetchers:
+                st.warning("Enter credentials for at least one platform")
+            else:
+                with st.spinner(f"Fetching {', '.join(fetchers)}..."):
+                    unified, errors = fetch_all(fetchers, default_timeout=timeout)
+                session_frames().put("All platforms", "", unified)
+                for failed_platform, message in errors.items():
+                    st.error(f"{failed_platform}: {message}")
+        
+        df = session_frames().get("All platforms")
+        if df is not None:
+            st.subheader("All Posts")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            totals = df.groupby("platform", observed=True)[["views", "likes", "comments", "shares"]].sum()
+            st.dataframe(totals)
+            
+            plot("line", df, x="timestamp", y="likes", color="platform", title="Likes Over Time by Platform")
+            
+            plot("bar", totals.reset_index(), x="platform", y=["likes", "comments", "shares"], 
+                 title="Engagement by Platform", barmode='group')
+            
+            engagement_panel(df, "All platforms")
+    
+    elif platform == "Twitter":
+        st.subheader("Twitter Analytics")
+        
+        # Twitter API connection
+        st.write("Connect to Twitter API")
+        api_key = st.text_input("API Key", type="password")
+        api_secret = st.text_input("API Secret", type="password")
+        access_token = st.text_input("Access Token", type="password")
+        access_secret = st.text_input("Access Secret", type="password")
+        
+        if st.button("Connect to Twitter"):
+            credentials = (api_key, api_secret, access_token, access_secret)
+            try:
+                api, user = get_client_pool().get("Twitter", credentials, lambda: connect_twitter(*credentials))
+                st.success(f"Connected as @{user.screen_name}")
+                enable_publishing("Twitter", user.screen_name,
+                                  lambda job: publish_tweet(api, job.content, job.media_path))
+                
+                # Fetch only tweets newer than the last sync and load the stored history
+                session_frames().put("Twitter", user.screen_name, get_post_store().sync(
+                    "Twitter", user.screen_name, lambda cursor: fetch_twitter_posts(api, cursor)))
+                
+            except RateLimitExceeded as e:
+                st.warning(str(e))
+            except Exception as e:
+                get_client_pool().discard("Twitter", credentials)
+                st.error(f"Error connecting to Twitter: {e}")
+        
+        load_saved_posts("Twitter")
+        
+        df = session_frames().get("Twitter")
+        if df is not None:
+            st.subheader("Recent Tweets Performance")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            plot("line", df, x="Date", y="Likes", title="Likes Over Time")
+            
+            plot("line", df, x="Date", y="Retweets", title="Retweets Over Time")
+            
+            engagement_panel(df, "Twitter")
+            
+            # Post scheduler (keyed so it can sit next to the cross-platform one)
+            st.subheader("Post Scheduler")
+            post_date = st.date_input("Schedule date (UTC)", key="twitter_post_date")
+            post_time = st.time_input("Schedule time (UTC)", key="twitter_post_time")
+            post_content = st.text_area("Post content", key="twitter_post_content")
+            
+            if st.button("Generate AI Caption", key="twitter_caption"):
+                st.write("AI-generated caption suggestion:")
+                st.info(f"🚀 Exciting update! {post_content[:50]}... #digitalmarketing #socialmedia")
+                
+            if st.button("Schedule Post", key="twitter_schedule"):
+                queue_post(["Twitter"], post_date, post_time, post_content)
+    
+    elif platform == "Instagram":
+        st.subheader("Instagram Analytics")
+        
+        username = st.text_input("Instagram Username")
+        password = st.text_input("Password", type="password")
+        
+        if st.button("Connect to Instagram"):
+            try:
+                profile = get_client_pool().get(
+                    "Instagram", (username, password),
+                    lambda: connect_instagram(username, password, session_path("Instagram", username)))
+                st.success(f"Connected to @{profile.username}")
+                
+                # Fetch only posts newer than the last sync and load the stored history
+                session_frames().put("Instagram", profile.username, get_post_store().sync(
+                    "Instagram", profile.username, lambda cursor: fetch_instagram_posts(profile, cursor)))
+                
+            except RateLimitExceeded as e:
+                st.warning(str(e))
+            except Exception as e:
+                get_client_pool().discard("Instagram", (username, password))
+                st.error(f"Error connecting to Instagram: {e}")
+        
+        load_saved_posts("Instagram")
+        
+        df = session_frames().get("Instagram")
+        if df is not None:
+            st.subheader("Recent Posts Performance")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            plot("bar", df, x="Date", y="Likes", title="Likes Per Post")
+            
+            plot("bar", df, x="Date", y="Comments", title="Comments Per Post")
+            
+            engagement_panel(df, "Instagram")
+    
+    elif platform == "Facebook":
+        st.subheader("Facebook Analytics")
+        
+        st.write("Connect to Facebook Graph API")
+        access_token = st.text_input("Access Token", type="password")
+        page_id = st.text_input("Page ID")
+        history_days = st.number_input("Days of history", min_value=1, max_value=3650, value=365)
+        
+        if st.button("Connect to Facebook"):
+            try:
+                client = get_client_pool().get("Facebook", (access_token,), lambda: GraphClient(access_token))
+                page_info = client.page_info(page_id)
+                st.success(f"Connected to {page_info['name']} (Likes: {page_info['fan_count']})")
+                enable_publishing("Facebook", page_id, lambda job: publish_to_page(client, page_id, job))
+                
+                # Fetch only posts newer than the last sync (or back to the history
+                # horizon on the first sync) and load the stored history
+                session_frames().put("Facebook", page_id, get_post_store().sync(
+                    "Facebook", page_id, lambda cursor: fetch_facebook_posts(client, page_id, cursor, days=history_days)))
+                
+            except RateLimitExceeded as e:
+                st.warning(str(e))
+                if e.partial:
+                    st.info(f"{len(e.partial[0]):,} posts were saved; syncing again continues after them")
+                    session_frames().put("Facebook", page_id, get_post_store().load("Facebook", page_id))
+            except GraphAPIError as e:
+                if e.code == 190:  # invalid or expired token
+                    get_client_pool().discard("Facebook", (access_token,))
+                st.error(f"Facebook API Error: {e}")
+            except Exception as e:
+                st.error(f"Error connecting to Facebook: {str(e)}")
+        
+        load_saved_posts("Facebook")
+        
+        df = session_frames().get("Facebook")
+        if df is not None:
+            st.subheader("Recent Posts Performance")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            plot("line", df, x="Date", y="Impressions", title="Impressions Over Time")
+            
+            plot("bar", df, x="Date", y=["Engaged Users", "Shares"], 
+                 title="Engaged Users & Shares Per Post", barmode='group')
+            
+            engagement_panel(df, "Facebook")
+    
+    elif platform == "LinkedIn":
+        st.subheader("LinkedIn Analytics")
+        
+        # LinkedIn API connection
+        st.write("Connect to LinkedIn API")
+        username = st.text_input("LinkedIn Email")
+        password = st.text_input("Password", type="password")
+        
+        if st.button("Connect to LinkedIn"):
+            try:
+                linkedin, profile = get_client_pool().get(
+                    "LinkedIn", (username, password),
+                    lambda: connect_linkedin(username, password, session_dir("LinkedIn")))
+                st.success(f"Connected as {profile['firstName']} {profile['lastName']}")
+                
+                # Fetch only posts newer than the last sync and load the stored history
+                session_frames().put("LinkedIn", profile['profile_id'], get_post_store().sync(
+                    "LinkedIn", profile['profile_id'],
+                    lambda cursor: fetch_linkedin_posts(linkedin, profile['profile_id'], cursor)))
+                
+            except RateLimitExceeded as e:
+                st.warning(str(e))
+            except Exception as e:
+                get_client_pool().discard("LinkedIn", (username, password))
+                st.error(f"Error connecting to LinkedIn: {e}")
+        
+        load_saved_posts("LinkedIn")
+        
+        df = session_frames().get("LinkedIn")
+        if df is not None:
+            st.subheader("Recent Posts Performance")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            plot("bar", df, x="Date", y="Likes", title="Likes Per Post")
+            
+            plot("bar", df, x="Date", y=["Comments", "Shares"], 
+                 title="Comments & Shares Per Post", barmode='group')
+            
+            engagement_panel(df, "LinkedIn")
+    
+    elif platform == "TikTok":
+        st.subheader("TikTok Analytics")
+        
+        st.write("Note: TikTok API access requires special approval. This is a simulated interface.")
+        username = st.text_input("TikTok Username")
+        videos = st.number_input("Videos to simulate", min_value=10, max_value=MAX_SIMULATED_VIDEOS, value=30, step=10)
+        
+        if st.button("Analyze TikTok Profile"):
+            # Synthetic data since TikTok API is restricted; seeded by username, so it is stable across reruns
+            with st.spinner("Generating TikTok data..."):
+                session_frames().put("TikTok", username, synthetic.posts(
+                    "TikTok", int(videos), seed=synthetic.seed_for("TikTok", username)))
+            st.success(f"Retrieved data for @{username}")
+        
+        df = session_frames().get("TikTok")
+        if df is not None:
+            st.subheader("Recent Videos Performance")
+            st.dataframe(df)
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            plot("line", df, x="Date", y="Views", title="Views Over Time")
+            
+            plot("line", df, x="Date", y=["Likes", "Comments", "Shares"], 
+                 title="Engagement Over Time")
+            
+            engagement_panel(df, "TikTok")
+    
+    elif platform == "YouTube":
+        st.subheader("YouTube Analytics")
+        
+        st.write("Connect to YouTube Channel")
+        channel_url = st.text_input("YouTube Channel URL")
+        video_url = st.text_input("Or enter specific Video URL")
+        video_list = st.text_area("Or paste video URLs, one per line")
+        video_file = st.file_uploader("Or upload a file of video URLs", type=["txt", "csv"])
+        with st.expander("Batch options"):
+            channel_limit = st.number_input("Videos per channel", min_value=1, max_value=5000, value=CHANNEL_LIMIT)
+            refresh = st.checkbox("Refresh cached metadata")
+        
+        if st.button("Analyze YouTube"):
+            batch = [line.strip() for line in video_list.splitlines() if line.strip()]
+            if video_file is not None:
+                batch += [line.strip() for line in video_file.getvalue().decode("utf-8", errors="ignore").splitlines()
+                          if line.strip()]
+            try:
+                if video_url:
+                    # Analyze single video
+                    video_data, thumbnail_url = video_details(video_url)
+                    
+                    session_frames().put("YouTube", video_url, pd.DataFrame([video_data]))
+                    st.success(f"Analyzed video: {video_data['Title']}")
+                    
+                    # Show thumbnail
+                    st.image(thumbnail_url, caption="Video Thumbnail", width=300)
+                
+                elif batch or channel_url:
+                    # Metadata comes from the on-disk cache where it is fresh; the rest is fetched concurrently
+                    with st.spinner("Analyzing videos..."):
+                        if not batch:
+                            batch = channel_video_urls(channel_url, channel_limit)
+                        videos, errors, cached = fetch_videos(batch, get_video_cache(), refresh=refresh)
+                    session_frames().put("YouTube", channel_url or "batch", videos)
+                    st.success(f"Analyzed {len(videos):,} videos ({cached:,} from cache)")
+                    if errors:
+                        st.warning(f"{len(errors):,} videos could not be analyzed")
+                        st.dataframe(pd.DataFrame(list(errors.items()), columns=["URL", "Error"]))
+            
+            except RateLimitExceeded as e:
+                st.warning(str(e))
+            except Exception as e:
+                st.error(f"Error analyzing YouTube: {e}")
+        
+        df = session_frames().get("YouTube")
+        if df is not None:
+            st.subheader("Video Performance")
+            # Thumbnails are URLs; the table only loads the images of the rows on screen
+            st.dataframe(df, column_config={"Thumbnail": st.column_config.ImageColumn("Thumbnail")})
+            
+            # Engagement metrics
+            st.subheader("Engagement Metrics")
+            
+            if 'Views' in df.columns:
+                plot("bar", df, x="Title", y="Views", title="Views Per Video")
+                
+                if 'Likes' in df.columns and 'Comments' in df.columns:
+                    plot("bar", df, x="Title", y=["Likes", "Comments"], 
+                         title="Likes & Comments Per Video", barmode='group')
+            
+            engagement_panel(df, "YouTube")
+
+    # Post scheduler for all platforms
+    st.markdown("---")
+    st.subheader("Cross-Platform Post Scheduler")
+    
+    platforms_to_schedule = st.multiselect("Select platforms to schedule:", 
+                                         ["Twitter", "Instagram", "Facebook", "LinkedIn"])
+    
+    if platforms_to_schedule:
+        post_date = st.date_input("Schedule date (UTC)")
+        post_time = st.time_input("Schedule time (UTC)")
+        post_content = st.text_area("Post content")
+        upload_image = st.file_uploader("Upload image (optional)", type=["jpg", "png"])
+        
+        if st.button("Generate AI Caption"):
+            st.write("AI-generated caption suggestions:")
+            st.info(f"🚀 Exciting update! {post_content[:50]}... #{platform.lower()} #socialmedia")
+            st.info(f"📢 New announcement: {post_content[:60]}... #marketing #digital")
+        
+        if st.button("Schedule Post"):
+            queue_post(platforms_to_schedule, post_date, post_time, post_content, upload_image)
+    
+    with st.expander("Scheduled posts"):
+        scheduled_posts()
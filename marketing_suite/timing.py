@@ -0,0 +1,263 @@
+"""Lightweight span timing for Streamlit reruns.
+
+Wrap a section in ``with span("name", label=value):`` to time it.  Spans are
+collected by the ``Recorder`` active for the current rerun (see
+``recording``) and are also added to process-wide totals, which
+``prometheus_text`` exports.  Outside a recording a span only updates the
+totals, so instrumented helpers cost a couple of clock reads when nobody is
+looking.
+
+The active recorder lives in a context variable.  Work handed to a thread
+pool has to be wrapped with ``propagate`` to be attributed to the rerun that
+submitted it.
+"""
+import contextvars
+import importlib.util
+import io
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlsplit
+
+PROFILERS = ["cProfile", "pyinstrument"]
+PROFILE_LINES = 40
+
+_recorder = contextvars.ContextVar("marketing_span_recorder", default=None)
+_depth = contextvars.ContextVar("marketing_span_depth", default=0)
+
+_totals_lock = threading.Lock()
+# (name, sorted label items) -> [count, total seconds]
+_totals = defaultdict(lambda: [0, 0.0])
+# (name, sorted label items) -> count
+_counters = defaultdict(int)
+
+
+@dataclass
+class Span:
+    name: str
+    duration_ms: float
+    offset_ms: float
+    depth: int
+    thread: str
+    labels: dict = field(default_factory=dict)
+
+
+class Recorder:
+    """Spans of one rerun, in completion order."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end = None
+        self._lock = threading.Lock()
+        self.spans = []
+
+    def add(self, name, seconds, end, depth, labels):
+        span = Span(
+            name=name,
+            duration_ms=seconds * 1000,
+            offset_ms=(end - seconds - self._start) * 1000,
+            depth=depth,
+            thread=threading.current_thread().name,
+            labels=labels,
+        )
+        with self._lock:
+            self.spans.append(span)
+
+    def finish(self):
+        self._end = time.perf_counter()
+
+    @property
+    def elapsed_ms(self):
+        """Duration of the recording (so far, while it is still open)."""
+        return ((self._end or time.perf_counter()) - self._start) * 1000
+
+    def to_jsonl(self, rerun=None):
+        lines = []
+        for span in sorted(self.spans, key=lambda span: span.offset_ms):
+            record = {"rerun": rerun, "started_at": self.started_at, **asdict(span)}
+            lines.append(json.dumps(record, default=str))
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def _observe(name, seconds, labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _totals_lock:
+        entry = _totals[key]
+        entry[0] += 1
+        entry[1] += seconds
+
+
+def record_span(name, seconds, **labels):
+    """Record a span whose duration was measured elsewhere (e.g. ``Response.elapsed``)."""
+    labels = {key: str(value) for key, value in labels.items()}
+    _observe(name, seconds, labels)
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, seconds, time.perf_counter(), _depth.get(), labels)
+
+
+def increment(name, amount=1, **labels):
+    """Count an event (a retry, a rejected call) in the process-wide totals."""
+    key = (name, tuple(sorted((key, str(value)) for key, value in labels.items())))
+    with _totals_lock:
+        _counters[key] += amount
+
+
+@contextmanager
+def span(name, **labels):
+    """Time the enclosed block as ``name``; spans may nest."""
+    labels = {key: str(value) for key, value in labels.items()}
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _depth.reset(token)
+        _observe(name, end - start, labels)
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.add(name, end - start, end, depth, labels)
+
+
+@contextmanager
+def recording():
+    """Collect every span of the enclosed block into a new ``Recorder``."""
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        recorder.finish()
+        _recorder.reset(token)
+
+
+def propagate(fn):
+    """Bind ``fn`` to the current context so a worker thread records into this rerun."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+
+def instrument_session(session):
+    """Record every response of a ``requests`` session as an ``http`` span.
+
+    Uses a response hook and ``Response.elapsed`` (time until the headers
+    arrived), so the session itself is left untouched.
+    """
+    def hook(response, *args, **kwargs):
+        record_span(
+            "http",
+            response.elapsed.total_seconds(),
+            method=response.request.method,
+            host=urlsplit(response.url).netloc,
+            status=response.status_code,
+        )
+    session.hooks["response"].append(hook)
+    return session
+
+
+def summarize(spans):
+    """Per (name, labels) count, total and max time, slowest first."""
+    groups = {}
+    for span in spans:
+        key = (span.name, tuple(sorted(span.labels.items())))
+        count, total, longest = groups.get(key, (0, 0.0, 0.0))
+        groups[key] = (count + 1, total + span.duration_ms, max(longest, span.duration_ms))
+    rows = [
+        {
+            "Span": name,
+            "Labels": ", ".join(f"{key}={value}" for key, value in labels),
+            "Calls": count,
+            "Total (ms)": round(total, 1),
+            "Max (ms)": round(longest, 1),
+        }
+        for (name, labels), (count, total, longest) in groups.items()
+    ]
+    return sorted(rows, key=lambda row: -row["Total (ms)"])
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_text(prefix="marketing_span"):
+    """Process-wide span totals and event counters in the Prometheus text exposition format."""
+    with _totals_lock:
+        items = sorted((key, tuple(entry)) for key, entry in _totals.items())
+        counters = sorted(_counters.items())
+    lines = [
+        f"# HELP {prefix}_seconds Time spent in instrumented sections of the app.",
+        f"# TYPE {prefix}_seconds summary",
+    ]
+    for (name, labels), (count, total) in items:
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in (("span", name),) + labels)
+        lines.append(f"{prefix}_seconds_sum{{{label_text}}} {total:.6f}")
+        lines.append(f"{prefix}_seconds_count{{{label_text}}} {count}")
+    if counters:
+        lines += [
+            "# HELP marketing_events_total Events counted by the app (retries, rejections, ...).",
+            "# TYPE marketing_events_total counter",
+        ]
+    for (name, labels), count in counters:
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in (("event", name),) + labels)
+        lines.append(f"marketing_events_total{{{label_text}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def available_profilers():
+    return [name for name in PROFILERS
+            if name == "cProfile" or importlib.util.find_spec(name) is not None]
+
+
+class Profile:
+    """Holds the text report of a profiled rerun once it has finished."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.text = None
+
+
+@contextmanager
+def profiling(kind=None):
+    """Profile the enclosed block with ``cProfile`` or ``pyinstrument``.
+
+    Yields a ``Profile`` whose ``text`` is filled in on exit, or ``None``
+    when ``kind`` is ``None``.
+    """
+    if kind is None:
+        yield None
+        return
+    profile = Profile(kind)
+    if kind == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield profile
+        finally:
+            profiler.stop()
+            profile.text = profiler.output_text(unicode=True, color=False)
+        return
+    if kind != "cProfile":
+        raise ValueError(f"Unknown profiler: {kind}")
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        profile.text = out.getvalue()
@@ -0,0 +1,86 @@
+"""On-disk cache of YouTube video metadata, keyed by video ID.
+
+Resolving one video's metadata means fetching its watch page and player
+data, under a rate limit of about one video per second.  Resolved rows are
+kept in SQLite for ``ttl`` seconds, so analysing a channel again only
+fetches the videos that are new or whose metadata has gone stale.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from marketing_suite.timing import increment
+
+DB_PATH = os.getenv("MARKETING_VIDEO_DB", os.path.join(".cache", "videos.sqlite3"))
+VIDEO_TTL = float(os.getenv("MARKETING_VIDEO_TTL", str(24 * 3600)))
+# Video IDs per SELECT, well under SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    record TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class VideoCache:
+    """Thread-safe SQLite cache of video metadata shared by every session in the process."""
+
+    def __init__(self, path=DB_PATH, ttl=VIDEO_TTL, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, video_ids):
+        """Records of the ``video_ids`` fetched less than ``ttl`` seconds ago, by video ID."""
+        video_ids = list(video_ids)
+        oldest = self.clock() - self.ttl
+        found = {}
+        with self._lock:
+            for i in range(0, len(video_ids), LOOKUP_BATCH):
+                batch = video_ids[i:i + LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT video_id, record FROM videos WHERE fetched_at >= ? "
+                    f"AND video_id IN ({', '.join('?' * len(batch))})", (oldest, *batch)
+                ).fetchall()
+                found.update((video_id, json.loads(record)) for video_id, record in rows)
+            self.hits += len(found)
+            self.misses += len(video_ids) - len(found)
+        increment("youtube.cache", len(found), result="hit")
+        increment("youtube.cache", len(video_ids) - len(found), result="miss")
+        return found
+
+    def put_many(self, records):
+        """Store ``records`` (video ID -> JSON-serialisable dict) as fetched now."""
+        now = self.clock()
+        rows = [(video_id, now, json.dumps(record, default=str)) for video_id, record in records.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO videos (video_id, fetched_at, record) VALUES (?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET fetched_at = excluded.fetched_at, record = excluded.record",
+                rows,
+            )
+        return len(rows)
+
+    def purge(self):
+        """Delete expired records; returns how many were removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM videos WHERE fetched_at < ?", (self.clock() - self.ttl,)).rowcount
+
+    def metrics(self):
+        with self._lock:
+            videos = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        return {"Videos": videos, "Hits": self.hits, "Misses": self.misses}
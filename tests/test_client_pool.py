@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from marketing_suite.client_pool import ClientPool
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_get_reuses_a_connected_client():
+    pool = ClientPool()
+    assert pool.get("LinkedIn", ("me", "pw"), lambda: "client") == "client"
+    assert pool.get("LinkedIn", ("me", "pw"), lambda: pytest.fail("connected twice")) == "client"
+    assert pool.metrics()["Hits"] == 1
+
+
+def test_failed_connect_never_lets_two_logins_overlap():
+    pool = ClientPool()
+    key = pool.key("LinkedIn", ("me", "pw"))
+    lock = threading.Lock()
+    active, overlaps, connects = [0], [], []
+    release = {name: threading.Event() for name in ("first", "second")}
+
+    def connect(name):
+        with lock:
+            active[0] += 1
+            overlaps.append(active[0])
+            connects.append(name)
+        release[name].wait(5)
+        with lock:
+            active[0] -= 1
+        if name == "first":
+            raise RuntimeError("challenge")
+        return name
+
+    def get(name, results):
+        try:
+            results.append(pool.get("LinkedIn", ("me", "pw"), lambda: connect(name)))
+        except RuntimeError as e:
+            results.append(str(e))
+
+    results = {name: [] for name in ("first", "second", "third")}
+    threads = {name: threading.Thread(target=get, args=(name, results[name])) for name in results}
+    threads["first"].start()
+    wait_until(lambda: connects == ["first"])
+    threads["second"].start()
+    wait_until(lambda: pool._connecting[key][1] == 2)
+    release["first"].set()
+    # The waiting caller takes over the login; a caller arriving now must queue behind it
+    wait_until(lambda: connects == ["first", "second"])
+    threads["third"].start()
+    wait_until(lambda: pool._connecting[key][1] == 2)
+    release["second"].set()
+    for thread in threads.values():
+        thread.join(5)
+
+    assert max(overlaps) == 1
+    assert results == {"first": ["challenge"], "second": ["second"], "third": ["second"]}
+    assert pool._connecting == {}
@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from marketing_suite.connectors.facebook import GraphClient, fetch_facebook_posts
+from marketing_suite.post_store import PostStore
+from marketing_suite.ratelimit import RateLimitExceeded, TokenBucket
+
+BASE_URL = "https://graph.test"
+
+
+class Response:
+    def __init__(self, status, payload=None, headers=None):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = headers or {}
+        self._payload = payload
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("no body")
+        return self._payload
+
+
+class StubGraph:
+    """A ``requests.Session`` stand-in serving one page's posts, insights and ETags."""
+
+    def __init__(self, posts=120, days=30):
+        now = datetime.now(timezone.utc)
+        self.posts = [{"id": f"p{i}", "message": f"Post {i}",
+                       "created_time": (now - timedelta(days=days * i / posts)).strftime("%Y-%m-%dT%H:%M:%S%z")}
+                      for i in range(posts)]
+        self.requests = []
+        self.batches = []
+        self.failing = set()
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        self.requests.append((method, url, dict(headers or {})))
+        parts = urlsplit(url)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if method == "POST" and parts.path == "/v19.0":
+            batch = json.loads(data["batch"])
+            self.batches.append(len(batch))
+            return Response(200, [self._insights(item["relative_url"]) for item in batch])
+        if parts.path.endswith("/posts"):
+            since = int(query.get("since", 0))
+            after = int(query.get("after", 0))
+            limit = int(query["limit"])
+            posts = [post for post in self.posts
+                     if datetime.strptime(post["created_time"], "%Y-%m-%dT%H:%M:%S%z").timestamp() >= since]
+            page = posts[after:after + limit]
+            paging = {}
+            if after + limit < len(posts):
+                paging["next"] = f"{BASE_URL}/v19.0/page/posts?limit={limit}&since={since}&after={after + limit}" \
+                                 f"&access_token={query['access_token']}"
+            return Response(200, {"data": page, "paging": paging})
+        if parts.path.endswith("/page"):
+            etag = '"page-v1"'
+            if headers and headers.get("If-None-Match") == etag:
+                return Response(304, headers={"ETag": etag})
+            return Response(200, {"name": "Stub Page", "fan_count": 42}, {"ETag": etag})
+        if parts.path.startswith("/v19.0/item"):
+            return Response(200, {"id": parts.path.rsplit("/", 1)[-1]}, {"ETag": f'"{parts.path}"'})
+        return Response(404, {"error": {"message": "Unknown path", "code": 100}})
+
+    def _insights(self, relative_url):
+        post_id = relative_url.split("/", 1)[0]
+        if post_id in self.failing:
+            return {"code": 400, "body": json.dumps({"error": {"message": "No insights", "code": 100}})}
+        number = int(post_id[1:])
+        return {"code": 200, "body": json.dumps({"data": [
+            {"name": "post_impressions", "values": [{"value": 1000 + number}]},
+            {"name": "post_engaged_users", "values": [{"value": number}]},
+        ]})}
+
+
+def client(stub, token="token", **options):
+    return GraphClient(token, base_url=BASE_URL, session=stub, sleep=lambda seconds: None, **options)
+
+
+def test_posts_are_paged_and_insights_batched():
+    stub = StubGraph(posts=120)
+    stub.failing.add("p7")
+    posts, cursor = fetch_facebook_posts(client(stub), "page", days=31)
+    assert len(posts) == 120
+    # Posts come back oldest first, each with its own insights
+    assert [post_id for post_id, _, _ in posts[:2]] == ["p119", "p118"]
+    records = {post_id: record for post_id, _, record in posts}
+    assert records["p3"]["Impressions"] == 1003
+    assert records["p3"]["Engaged Users"] == 3
+    assert records["p7"]["Impressions"] == 0
+    assert stub.batches == [50, 50, 20]
+    assert cursor == datetime.fromisoformat(stub.posts[0]["created_time"]).isoformat()
+
+
+def test_delta_sync_fetches_only_newer_posts():
+    stub = StubGraph(posts=120)
+    _, cursor = fetch_facebook_posts(client(stub), "page", days=31)
+    stub.batches.clear()
+    posts, new_cursor = fetch_facebook_posts(client(stub), "page", cursor)
+    assert posts == []
+    assert new_cursor == cursor
+    assert stub.batches == []
+
+
+def test_get_revalidates_with_etag_keyed_without_token():
+    stub = StubGraph()
+    graph = client(stub, token="secret-token")
+    first = graph.page_info("page")
+    second = graph.page_info("page")
+    assert first == second == {"name": "Stub Page", "fan_count": 42}
+    (_, _, headers1), (_, _, headers2) = stub.requests
+    assert "If-None-Match" not in headers1
+    assert headers2["If-None-Match"] == '"page-v1"'
+    assert not any("secret-token" in key for key in graph._etags)
+
+
+def test_etag_cache_is_bounded_lru():
+    stub = StubGraph()
+    graph = client(stub, max_etags=2)
+    graph.get("item/1")
+    graph.get("item/2")
+    graph.get("item/1")
+    graph.get("item/3")
+    assert len(graph._etags) == 2
+    assert [key.split("?")[0].rsplit("/", 1)[-1] for key in graph._etags] == ["1", "3"]
+
+
+def test_partial_sync_is_kept_and_resumed(tmp_path):
+    stub = StubGraph(posts=120)
+    store = PostStore(str(tmp_path / "posts.sqlite3"))
+    graph = client(stub, token="partial")
+    # Enough quota for both post pages and the first two insight batches only
+    graph.bucket = TokenBucket(1e-6, 102, platform="Facebook")
+    with pytest.raises(RateLimitExceeded) as raised:
+        store.sync("Facebook", "page", lambda cursor: fetch_facebook_posts(graph, "page", cursor, days=31))
+    saved, cursor = raised.value.partial
+    assert len(saved) == 100
+    assert len(store.load("Facebook", "page")) == 100
+    assert store.get_cursor("Facebook", "page") == cursor
+
+    resumed = client(stub, token="resumed")
+    df = store.sync("Facebook", "page", lambda cursor: fetch_facebook_posts(resumed, "page", cursor))
+    assert len(df) == 120
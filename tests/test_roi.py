@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+from marketing_suite.cli import roi_task
+from marketing_suite.ingestion import load_ad_csv
+from marketing_suite.roi import NO_CAMPAIGN, PERIODS, rollup, roi_summary
+from marketing_suite.spend_model import current_budget, rollup_budget
+
+CSV = b"""Date,Campaign,Spend,Revenue,Conversions
+2024-01-01,Search,10,30,3
+2024-01-08,,100,50,1
+,Search,5,5,
+"""
+
+
+@pytest.fixture
+def ads(tmp_path):
+    _, df = load_ad_csv(io.BytesIO(CSV), cache_dir=str(tmp_path))
+    return df
+
+
+def test_rollups_count_rows_with_blank_campaign_or_date(ads):
+    raw = roi_summary(ads)
+    assert raw["Total Spend"] == 115
+    assert raw["Total Revenue"] == 85
+    for campaign, period in [(True, None), (False, PERIODS["Week"]), (True, PERIODS["Week"]), (False, None)]:
+        frame = rollup(ads, campaign=campaign, period=period)
+        assert frame["Rows"].sum() == 3
+        assert roi_summary(frame) == pytest.approx(raw)
+
+
+def test_blank_campaigns_are_labelled(ads):
+    by_campaign = rollup(ads).set_index("Campaign")
+    assert by_campaign.loc[NO_CAMPAIGN, "Spend"] == 100
+    assert by_campaign.loc["Search", "Spend"] == 15
+    by_week = rollup(ads, campaign=False, period=PERIODS["Week"])
+    assert by_week["Period"].isna().sum() == 1
+
+
+def test_budget_from_rollup(ads):
+    assert rollup_budget(rollup(ads)) == pytest.approx(107.5)
+    assert rollup_budget(rollup(ads, campaign=False)) == pytest.approx(current_budget(ads.drop(columns="Campaign")))
+
+
+def test_cli_campaign_table_matches_summary(tmp_path):
+    path = tmp_path / "ads.csv"
+    path.write_bytes(CSV)
+    summary, campaigns = roi_task(str(path), None, 0, 0)
+    assert summary["Total Spend"].iloc[0] == 115
+    assert campaigns["Spend"].sum() == 115
@@ -0,0 +1,170 @@
+import pathlib
+import threading
+
+import pytest
+
+from marketing_suite.scheduler import CANCELLED, FAILED, PENDING, SENT, PublishError, Scheduler
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakePublisher:
+    def __init__(self, failures=()):
+        self.published = []
+        self.failures = list(failures)
+
+    def __call__(self, job):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.published.append(job.content)
+        return f"remote-{job.id}"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "scheduler.sqlite3")
+
+
+def status(scheduler, job_id):
+    jobs = scheduler.jobs()
+    return jobs.loc[jobs["id"] == job_id].iloc[0]
+
+
+def test_publishes_only_when_due(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    publisher = FakePublisher()
+    scheduler.register("Twitter", "acme", publisher)
+    job_id = scheduler.schedule("Twitter", "acme", "hello", clock() + 60)
+
+    assert scheduler.run_pending() == 0
+    clock.advance(60)
+    assert scheduler.run_pending() == 1
+    assert publisher.published == ["hello"]
+    job = status(scheduler, job_id)
+    assert job["status"] == SENT
+    assert job["remote_id"] == f"remote-{job_id}"
+
+
+def test_job_waits_for_a_publisher(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    job_id = scheduler.schedule("Twitter", "acme", "hello", clock())
+    assert scheduler.run_pending() == 0
+
+    publisher = FakePublisher()
+    scheduler.register("Twitter", "acme", publisher)
+    assert scheduler.run_pending() == 1
+    assert status(scheduler, job_id)["status"] == SENT
+
+
+def test_retries_with_backoff_then_fails(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock, max_attempts=2, retry_base=10, retry_max=10)
+    publisher = FakePublisher([PublishError("timeout"), PublishError("timeout")])
+    scheduler.register("Twitter", "acme", publisher)
+    job_id = scheduler.schedule("Twitter", "acme", "hello", clock())
+
+    assert scheduler.run_pending() == 1
+    job = status(scheduler, job_id)
+    assert job["status"] == PENDING
+    assert job["attempts"] == 1
+    assert scheduler.run_pending() == 0
+
+    clock.advance(10)
+    assert scheduler.run_pending() == 1
+    job = status(scheduler, job_id)
+    assert job["status"] == FAILED
+    assert job["last_error"] == "timeout"
+
+
+def test_non_retryable_error_fails_at_once(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    scheduler.register("Facebook", "page", FakePublisher([PublishError("bad token", retryable=False)]))
+    job_id = scheduler.schedule("Facebook", "page", "hello", clock())
+
+    scheduler.run_pending()
+    assert status(scheduler, job_id)["status"] == FAILED
+
+
+def test_cancelled_job_is_not_published(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    publisher = FakePublisher()
+    scheduler.register("Twitter", "acme", publisher)
+    job_id = scheduler.schedule("Twitter", "acme", "hello", clock() + 60)
+
+    assert scheduler.cancel(job_id)
+    clock.advance(60)
+    assert scheduler.run_pending() == 0
+    assert publisher.published == []
+    assert status(scheduler, job_id)["status"] == CANCELLED
+
+
+def test_job_cancelled_after_being_taken_is_not_published(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    publisher = FakePublisher()
+    scheduler.register("Twitter", "acme", publisher)
+    job_id = scheduler.schedule("Twitter", "acme", "hello", clock())
+
+    (taken, platform, publish), = scheduler._take_due()[0]
+    assert taken == job_id
+    # The user cancels while the dispatcher is handing the job to a worker
+    assert scheduler.cancel(job_id)
+    scheduler._run(taken, platform, publish)
+    assert publisher.published == []
+    assert status(scheduler, job_id)["status"] == CANCELLED
+    assert scheduler._running["Twitter"] == 0
+
+
+def test_pending_and_interrupted_jobs_survive_a_restart(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    due = scheduler.schedule("Twitter", "acme", "due", clock())
+    later = scheduler.schedule("Twitter", "acme", "later", clock() + 3600)
+    # A publish interrupted by the process dying leaves its job running
+    scheduler._execute_sql("UPDATE jobs SET status = 'running' WHERE id = ?", (due,))
+
+    restarted = Scheduler(db_path, clock=clock)
+    publisher = FakePublisher()
+    restarted.register("Twitter", "acme", publisher)
+    assert restarted.run_pending() == 1
+    clock.advance(3600)
+    assert restarted.run_pending() == 1
+    assert publisher.published == ["due", "later"]
+    assert status(restarted, due)["status"] == SENT
+    assert status(restarted, later)["status"] == SENT
+
+
+def test_media_is_kept_for_the_publisher(clock, db_path):
+    scheduler = Scheduler(db_path, clock=clock)
+    media = []
+    scheduler.register("Twitter", "acme", lambda job: media.append(pathlib.Path(job.media_path).read_bytes()))
+    scheduler.schedule("Twitter", "acme", "hello", clock(), media=b"\x89PNG", media_name="a.png")
+
+    scheduler.run_pending()
+    assert media == [b"\x89PNG"]
+
+
+def test_background_dispatch_and_stop(db_path):
+    scheduler = Scheduler(db_path, max_workers=2).start()
+    published = threading.Event()
+    scheduler.register("Twitter", "acme", lambda job: published.set())
+    scheduler.schedule("Twitter", "acme", "hello", 0)
+    try:
+        assert published.wait(5)
+    finally:
+        scheduler.stop()
+    assert scheduler._pool is None
+    # Stopping twice, or a stopped scheduler, is harmless
+    scheduler.stop()
+    scheduler.start().stop()
@@ -0,0 +1,161 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from marketing_suite.seo_crawler import SiteCrawler, analyze_site, page_table, page_text, summarize
+from marketing_suite.site_index import SiteIndex
+
+PAGES = {
+    "/": '<html><head><title>Home</title><meta name="description" content="Welcome"></head>'
+         '<body><h1>Home</h1><a href="/about">About</a><a href="/empty">Empty</a>'
+         '<a href="/comment">Comment</a><a href="/private/x">Private</a>'
+         '<a href="https://other.example/">Elsewhere</a></body></html>',
+    "/about": "<html><head><title>About</title></head><body><h1>About us</h1><a href='/'>Home</a>"
+              "<a href='/team'>Team</a><a href='/missing'>Gone</a></body></html>",
+    "/team": "<html><head><title>Team</title></head><body><h1>Team</h1></body></html>",
+    "/empty": "   \n  ",
+    "/comment": "<!-- nothing here -->",
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        host = self.headers["Host"]
+        if self.path == "/robots.txt":
+            self._send(200, "User-agent: *\nDisallow: /private\n", "text/plain")
+        elif host.startswith("127.0.0.1") and self.path == "/start":
+            # The canonical host is "localhost", like a bare domain redirecting to www
+            self.send_response(301)
+            self.send_header("Location", f"http://localhost:{self.server.server_port}/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path in PAGES:
+            self._send(200, PAGES[self.path], "text/html; charset=utf-8")
+        else:
+            self._send(404, "not found", "text/plain")
+
+    def _send(self, status, body, content_type):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def port():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_port
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(url, **options):
+    pages = SiteCrawler(max_workers=4, timeout=5, **options).crawl(url)
+    return {page.url.split("/", 3)[-1]: page for page in pages}
+
+
+def test_crawls_the_site_and_parses_pages(port):
+    pages = crawl(f"http://localhost:{port}/")
+    assert set(pages) == {"", "about", "team", "missing", "empty", "comment"}
+    assert pages["missing"].status == 404
+    home = pages[""]
+    assert home.status == 200
+    assert home.title == "Home"
+    assert home.meta_description == "Welcome"
+    assert home.headings["h1"] == ["Home"]
+    assert home.external_links == ["https://other.example/"]
+    assert pages["team"].depth == 2
+
+
+def test_robots_txt_is_respected(port):
+    assert "private/x" not in crawl(f"http://localhost:{port}/")
+    assert "private/x" in crawl(f"http://localhost:{port}/", respect_robots=False)
+
+
+def test_depth_and_page_budget(port):
+    assert set(crawl(f"http://localhost:{port}/", max_depth=0)) == {""}
+    assert len(crawl(f"http://localhost:{port}/", max_pages=2)) == 2
+
+
+def test_empty_documents_are_recorded_not_raised(port):
+    pages = crawl(f"http://localhost:{port}/")
+    for path in ("empty", "comment"):
+        assert pages[path].status == 200
+        assert pages[path].error.startswith("Unparseable HTML")
+    assert not pages["about"].error
+
+
+def test_redirected_start_url_crawls_the_final_host(port):
+    pages = SiteCrawler(max_workers=4, timeout=5).crawl(f"http://127.0.0.1:{port}/start")
+    urls = {page.url for page in pages}
+    assert f"http://localhost:{port}/about" in urls
+    assert f"http://localhost:{port}/team" in urls
+    # The page the start URL redirected to is not fetched a second time
+    assert f"http://localhost:{port}/" not in urls
+
+
+def test_analyze_site_summary(port):
+    summary, table = analyze_site(f"http://localhost:{port}/about", max_depth=1)
+    assert summary["Pages Crawled"] == len(table)
+    assert "1 broken or unreachable page(s)" in summary["Issues"]
+    assert list(table.columns) == list(page_table([]).columns)
+    assert summarize([])["SEO Score"] == 0
+
+
+def test_index_skips_unchanged_pages_per_crawl(port, tmp_path):
+    index = SiteIndex(str(tmp_path / "index.sqlite3"))
+    first, _ = analyze_site(f"http://localhost:{port}/", index=index)
+    second, _ = analyze_site(f"http://localhost:{port}/", index=index)
+    assert first["Pages Unchanged"] == 0
+    assert second["Pages Unchanged"] == 3
+    assert sorted(index.urls(f"localhost:{port}")) == sorted(
+        f"http://localhost:{port}/{path}" for path in ("", "about", "team"))
+
+
+def test_full_crawl_prunes_pages_that_disappeared(port, tmp_path):
+    index = SiteIndex(str(tmp_path / "index.sqlite3"))
+    site = f"localhost:{port}"
+    index.add_page(site, f"http://{site}/old", b"<p>retired product page</p>")
+    index.add_page(site, f"http://{site}/missing", b"<p>deleted page</p>")
+    # A partial crawl can't tell which pages are gone, except the ones answering 404
+    SiteCrawler(max_workers=4, timeout=5, max_depth=1, index=index).crawl(f"http://{site}/about")
+    assert f"http://{site}/old" in index.urls(site)
+    assert f"http://{site}/missing" not in index.urls(site)
+    SiteCrawler(max_workers=4, timeout=5, index=index).crawl(f"http://{site}/")
+    assert f"http://{site}/old" not in index.urls(site)
+    assert "retired" not in index.top_terms(site)["Keyword"].tolist()
+
+
+def test_concurrent_crawls_index_each_page_once(port, tmp_path):
+    index = SiteIndex(str(tmp_path / "index.sqlite3"))
+    html = b"<html><body><p>Concurrent crawls index the same page</p></body></html>"
+    errors = []
+
+    def add(i):
+        try:
+            index.add_page("example.com", "https://example.com/", html, etag=f'"{i}"')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert index.metrics()["Pages"] == 1
+    assert index.top_terms("example.com").set_index("Keyword").loc["concurrent", "Pages"] == 1
+
+
+def test_page_text_of_empty_documents():
+    assert page_text(b"  ") == ""
+    assert page_text(b"<!-- nothing here -->") == ""
+    assert page_text(b"<p>Hello <script>x()</script>world</p>") == "Hello world"